@@ -1,13 +1,107 @@
+"""Partida: encadeia rodadas até uma dupla atingir a pontuação alvo."""
+
+import random
+from typing import Any, Dict, List, Optional
+
 from core.dupla import Dupla
+from core.jogador import Jogador
+from Jogo.rodada import REGISTROS, Rodada
+from utilidades.distribuicao import distribuir_jogadores
+
+
+def duplas_padrao() -> List[Dupla]:
+    return [Dupla("Dupla_1", ["J1", "J3"]), Dupla("Dupla_2", ["J2", "J4"])]
+
 
 class Partida:
-    def __init__(self, duplas: list[Dupla], pontos_para_vencer: int = 6):
-        self.duplas = {d.nome: d for d in duplas}
+    """Sequência de rodadas de uma partida.
+
+    ``nova_rodada()`` distribui as peças e cria a próxima :class:`Rodada`
+    (aberta pelo vencedor da anterior); ``encerrar_rodada()`` contabiliza o
+    resultado e avisa as estratégias aprendizes. ``jogar_rodada()`` faz as
+    duas coisas com a rodada jogada até o fim.
+
+    Com ``rng`` a distribuição e as estratégias aleatórias usam esse gerador
+    (ver ``distribuir_jogadores``), tornando a partida reproduzível.
+    """
+
+    def __init__(
+        self,
+        duplas: Optional[List[Dupla]] = None,
+        pontos_para_vencer: int = 6,
+        *,
+        estrategias: Optional[Dict[str, Any]] = None,
+        registro: str = "jogadas",
+        rng: Optional[random.Random] = None,
+    ):
+        if registro not in REGISTROS:
+            raise ValueError(f"Registro inválido: {registro!r}")
+        self.duplas = {d.nome: d for d in (duplas or duplas_padrao())}
         self.pontos_para_vencer = pontos_para_vencer
+        self.estrategias = estrategias
+        self.registro = registro
+        self.rng = rng
         self.rodadas = []
+        self.pontuacao_por_jogador = {
+            nome: 0 for dupla in self.duplas.values() for nome in dupla.jogadores
+        }
+        self.jogador_inicial: Optional[str] = None
+        self._dupla_de = {
+            nome: dupla for dupla in self.duplas.values() for nome in dupla.jogadores
+        }
 
     def venceu(self) -> bool:
         return any(dupla.pontuacao >= self.pontos_para_vencer for dupla in self.duplas.values())
 
     def dupla_vencedora(self) -> str:
         return max(self.duplas.items(), key=lambda x: x[1].pontuacao)[0]
+
+    def nova_rodada(self, jogadores: Optional[List[Jogador]] = None) -> Rodada:
+        """Cria a próxima rodada; sem ``jogadores`` distribui novas mãos.
+
+        Distribuições sem nenhum duplo (só possíveis na primeira rodada) são
+        refeitas.
+        """
+        while True:
+            distribuidos = jogadores if jogadores is not None else distribuir_jogadores(self.estrategias, self.rng)
+            try:
+                return Rodada(
+                    distribuidos,
+                    self.jogador_inicial,
+                    duplas=self.duplas,
+                    pontos_para_vencer=self.pontos_para_vencer,
+                    registro=self.registro,
+                )
+            except ValueError:
+                if jogadores is not None:
+                    raise
+
+    def encerrar_rodada(self, rodada: Rodada) -> dict:
+        """Contabiliza ``rodada`` (já terminada) e retorna seu resultado."""
+        if not rodada.terminada:
+            raise ValueError("Rodada em andamento")
+        resultado = rodada.resultado()
+        self.rodadas.append(resultado)
+        vencedor = rodada.vencedor
+        if vencedor:
+            # O vencedor abre a próxima rodada
+            self.jogador_inicial = vencedor
+            self._dupla_de[vencedor].adicionar_pontos(rodada.pontuacao)
+            self.pontuacao_por_jogador[vencedor] += rodada.pontuacao
+
+        # Permite que estratégias aprendizes atualizem seus parâmetros
+        for j in rodada.ordem:
+            estrategia = getattr(j, "estrategia", None)
+            if hasattr(estrategia, "notificar_resultado"):
+                estrategia.notificar_resultado(j.nome, vencedor)
+        return resultado
+
+    def jogar_rodada(self) -> dict:
+        rodada = self.nova_rodada()
+        rodada.jogar_ate_o_fim()
+        return self.encerrar_rodada(rodada)
+
+    def jogar_ate_o_fim(self) -> str:
+        while not self.venceu():
+            self.jogar_rodada()
+        return self.dupla_vencedora()
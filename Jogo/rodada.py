@@ -1,14 +1,257 @@
+"""Rodada incremental: o jogo avança uma jogada de cada vez.
+
+``passo()`` pede a peça à estratégia do jogador da vez; ``aplicar(peca)`` e
+``passar()`` permitem conduzir a rodada de fora (busca, interface web,
+treinamento). ``motor_de_jogo.simular_rodada`` é apenas um laço sobre
+``passo()``.
+"""
+
+from typing import List, Optional
+
+from core.dupla import Dupla
 from core.jogador import Jogador
+from core.peca import Peca
 from core.tabuleiro import Tabuleiro
+from regras.game_logic import (
+    determinar_tipo_batida,
+    determinar_vencedor_travamento,
+    pontuacao_por_tipo,
+)
+
+# Níveis de registro aceitos por ``Rodada`` e ``motor_de_jogo``:
+#   "nenhum"   → apenas o resultado final da rodada
+#   "jogadas"  → resultado final + log compacto das jogadas
+#   "completo" → além do log, um retrato completo do jogo a cada jogada
+REGISTROS = ("nenhum", "jogadas", "completo")
+
 
 class Rodada:
-    def __init__(self, jogadores: list[Jogador], jogador_inicial: str):
+    """Estado de uma rodada em andamento.
+
+    Sem ``jogador_inicial`` a rodada começa pelo dono do maior duplo, que é
+    obrigado a jogá-lo; se nenhum duplo foi distribuído levanta
+    ``ValueError``. A ordem dos turnos é fixada na criação (anel de índices),
+    e o fim da rodada é verificado apenas pela mão de quem jogou e pelo
+    contador de passes do tabuleiro.
+    """
+
+    def __init__(
+        self,
+        jogadores: List[Jogador],
+        jogador_inicial: Optional[str] = None,
+        *,
+        duplas: Optional[dict[str, Dupla]] = None,
+        pontos_para_vencer: int = 6,
+        registro: str = "completo",
+    ):
+        if registro not in REGISTROS:
+            raise ValueError(f"Registro inválido: {registro!r}")
+        self._registrar_jogadas = registro != "nenhum"
+        self._registrar_estados = registro == "completo"
+
+        self.ordem = list(jogadores)
         self.jogadores = {j.nome: j for j in jogadores}
-        self.jogador_atual = jogador_inicial
+        self.duplas = duplas or {}
+        self.pontos_para_vencer = pontos_para_vencer
         self.tabuleiro = Tabuleiro()
         self.historico = []
         self.estados = []
         self.ordem_jogada = 1
+        self.passes_por_jogador = {j.nome: 0 for j in jogadores}
         self.vencedor = None
         self.tipo_batida = None
         self.motivo_fim = None
+        self.pontuacao = 0
+        self._ultimas_jogadas: List[Peca] = []
+
+        n = len(self.ordem)
+        self._seguinte = [(i + 1) % n for i in range(n)]
+
+        # Peça obrigatória da primeira jogada (maior duplo), se houver
+        self.abertura: Optional[Peca] = None
+        if jogador_inicial is None:
+            inicial = -1
+            for i, j in enumerate(self.ordem):
+                for p in j.mao:
+                    if p.duplo and (self.abertura is None or p.lado1 > self.abertura.lado1):
+                        self.abertura = p
+                        inicial = i
+            if self.abertura is None:
+                raise ValueError("Nenhum duplo encontrado")
+        else:
+            inicial = next(i for i, j in enumerate(self.ordem) if j.nome == jogador_inicial)
+        self._atual = inicial
+        self.inicio = self.ordem[inicial].nome
+
+    # ------------------------------------------------------------------
+    # Consulta
+    # ------------------------------------------------------------------
+    @property
+    def jogador_atual(self) -> Jogador:
+        return self.ordem[self._atual]
+
+    @property
+    def terminada(self) -> bool:
+        return self.motivo_fim is not None
+
+    def jogadas_validas(self) -> List[Peca]:
+        """Peças que o jogador da vez pode jogar agora."""
+        if self.abertura is not None:
+            return [self.abertura]
+        return self.jogador_atual.jogadas_validas(self.tabuleiro.obter_pontas())
+
+    def retrato(self, com_jogadas: bool = True) -> dict:
+        """Estado do jogo logo após a última jogada, no formato de ``estados``.
+
+        Disponível com registro ``"jogadas"`` ou ``"completo"``; permite
+        acompanhar a rodada sem acumular a lista ``estados``. Levanta
+        ``ValueError`` com registro ``"nenhum"`` ou antes da primeira jogada.
+        Com ``com_jogadas=False`` o log da rodada (``"jogadas"``) fica de
+        fora: quem serializa um retrato por jogada não precisa reenviar o
+        log inteiro a cada vez, já que a última jogada está nos demais campos.
+        """
+        if not self._registrar_jogadas:
+            raise ValueError("retrato exige registro 'jogadas' ou 'completo'")
+        if not self.historico:
+            raise ValueError("Nenhuma jogada feita nesta rodada")
+        ultima = self.historico[-1]
+        retrato = {
+            "ordem_jogada": ultima["ordem"],
+            "jogador": ultima["jogador"],
+            "tipo": ultima["tipo"],
+            "peca": ultima.get("peca"),
+            "lado": ultima.get("lado"),
+            "tabuleiro": [(p.lado1, p.lado2) for p in self.tabuleiro.pecas],
+            "maos": {j.nome: [(p.lado1, p.lado2) for p in j.mao] for j in self.ordem},
+            "tipo_batida": self.tipo_batida,
+            "motivo_fim": self.motivo_fim,
+            "vencedor_rodada": self.vencedor,
+            "jogadas_disponiveis": [(p.lado1, p.lado2) for p in self._ultimas_jogadas],
+        }
+        if com_jogadas:
+            retrato["jogadas"] = self.historico
+        return retrato
+
+    def resultado(self) -> dict:
+        """Resultado no formato de ``motor_de_jogo.simular_rodada``."""
+        resultado = {
+            "inicio_rodada": self.inicio,
+            "final": {
+                "tipo_batida": self.tipo_batida,
+                "motivo_fim": self.motivo_fim,
+                "vencedor_rodada": self.vencedor,
+                "pontuacao_rodada": self.pontuacao,
+            },
+        }
+        if self._registrar_jogadas:
+            resultado["jogadas"] = self.historico
+        if self._registrar_estados:
+            resultado["estados"] = self.estados
+        return resultado
+
+    # ------------------------------------------------------------------
+    # Avanço
+    # ------------------------------------------------------------------
+    def passo(self) -> Optional[Peca]:
+        """Executa a vez do jogador atual pela sua estratégia.
+
+        Retorna a peça jogada, ou ``None`` se o jogador passou.
+        """
+        if self.motivo_fim is not None:
+            raise ValueError("Rodada encerrada")
+        jogador = self.ordem[self._atual]
+        # ``jogadas`` vai para ``jogadas_disponiveis`` dos retratos; na
+        # abertura é a mão inteira, embora só o maior duplo possa sair
+        jogadas = jogador.jogadas_validas(self.tabuleiro.obter_pontas())
+        if self.abertura is not None:
+            peca = self.abertura
+        elif not jogadas:
+            self._passar(jogador, jogadas)
+            return None
+        else:
+            peca = jogador.escolher_peca(
+                self.tabuleiro,
+                self.ordem,
+                duplas=self.duplas,
+                passes_jog=self.passes_por_jogador,
+                pontos_para_vencer=self.pontos_para_vencer,
+            )
+        self._jogar(jogador, peca, jogadas)
+        return peca
+
+    def aplicar(self, peca: Peca) -> None:
+        """Joga ``peca`` pelo jogador da vez, validando a jogada."""
+        if self.terminada:
+            raise ValueError("Rodada encerrada")
+        if peca not in self.jogadas_validas():
+            raise ValueError("Jogada inválida")
+        jogador = self.jogador_atual
+        self._jogar(jogador, peca, jogador.jogadas_validas(self.tabuleiro.obter_pontas()))
+
+    def passar(self) -> None:
+        """Registra o passe do jogador da vez (apenas sem jogadas válidas)."""
+        if self.terminada:
+            raise ValueError("Rodada encerrada")
+        jogadas = self.jogadas_validas()
+        if jogadas:
+            raise ValueError("Jogador possui jogadas válidas")
+        self._passar(self.jogador_atual, jogadas)
+
+    def jogar_ate_o_fim(self) -> dict:
+        passo = self.passo
+        while self.motivo_fim is None:
+            passo()
+        return self.resultado()
+
+    # ------------------------------------------------------------------
+    # Internos
+    # ------------------------------------------------------------------
+    def _jogar(self, jogador: Jogador, peca: Peca, jogadas: List[Peca]) -> None:
+        jogador.remover_peca(peca)
+        lado = self.tabuleiro.jogar(peca)
+        self.abertura = None
+
+        if self._registrar_jogadas:
+            self.historico.append({
+                "ordem": self.ordem_jogada,
+                "jogador": jogador.nome,
+                "tipo": "batida" if not jogador.mao else "jogada",
+                "peca": (peca.lado1, peca.lado2),
+                "lado": lado,
+            })
+
+        self.tabuleiro.resetar_passes()
+
+        if not jogador.mao:
+            self.tipo_batida = determinar_tipo_batida(peca, self.tabuleiro.obter_pontas())
+            self.pontuacao = pontuacao_por_tipo(self.tipo_batida)
+            self.vencedor = jogador.nome
+            self.motivo_fim = "batida"
+
+        self._avancar(jogadas)
+
+    def _passar(self, jogador: Jogador, jogadas: List[Peca]) -> None:
+        if self._registrar_jogadas:
+            self.historico.append({
+                "ordem": self.ordem_jogada,
+                "jogador": jogador.nome,
+                "tipo": "passe",
+            })
+        self.passes_por_jogador[jogador.nome] += 1
+        jogador.registrar_passe(self.tabuleiro.obter_pontas())
+        self.tabuleiro.registrar_passe()
+
+        if self.tabuleiro.passes_consecutivos == len(self.ordem):
+            self.vencedor, self.pontuacao = determinar_vencedor_travamento(self.ordem)
+            self.motivo_fim = "travamento"
+            self.tipo_batida = "travamento"
+
+        self._avancar(jogadas)
+
+    def _avancar(self, jogadas: List[Peca]) -> None:
+        self._ultimas_jogadas = jogadas
+        if self._registrar_estados:
+            self.estados.append(self.retrato())
+        if self.motivo_fim is None:
+            self.ordem_jogada += 1
+            self._atual = self._seguinte[self._atual]
@@ -1,45 +1,159 @@
-from flask import Flask, request, jsonify, render_template
+import functools
+import json
+import math
+import os
+from typing import Optional
+
+from flask import Flask, Response, request, jsonify, render_template, stream_with_context
 from core.jogador import Jogador, RLJogador, GAJogador, MCTSJogador, CLIJogador
-from motor_de_jogo import simular_partida
+from motor_de_jogo import simular_partida, simular_partida_em_fluxo
+from utilidades.cache_resultados import CacheResultados, chave_simulacao
+from utilidades.historico import HistoricoSink, sink_padrao
+from utilidades.tarefas import CONCLUIDA, ERRO, CANCELADA, FilaCheia, GerenciadorTarefas
 
 app = Flask(__name__)
+tarefas = GerenciadorTarefas()
+cache = CacheResultados(
+    int(os.environ.get("DOMINO_CACHE_CAPACIDADE", "64")),
+    os.environ.get("DOMINO_CACHE_PASTA") or None,
+)
+
+JOGADORES = ["J1", "J2", "J3", "J4"]
+PESOS_GA = [1.8, 15.3, 15.7, 9.4, -9.6, -1.5, -20.4, 6.4]
+# Estratégias cujo resultado não depende só da semente (aprendem ou são
+# controladas por uma pessoa) e por isso não entram no cache.
+NAO_REPRODUZIVEIS = {"RL", "Controlar jogador"}
+
+
+class GAVisualizador(GAJogador):
+    """``GAJogador`` com os pesos fixos usados pelo visualizador."""
+
+    def __init__(self, nome, mao):
+        super().__init__(nome, mao, PESOS_GA)
+
+
+def construir_estrategia(tipo: str, orcamento_ms: Optional[float] = None):
+    """Converte o nome vindo do frontend em uma subclasse de ``Jogador``.
+
+    ``orcamento_ms`` limita o tempo de cada decisão dos jogadores MCTS.
+    """
+    if tipo == "RL":
+        return RLJogador
+    elif tipo == "GA":
+        return GAVisualizador
+    elif tipo == "MCTS":
+        if orcamento_ms is not None:
+            return functools.partial(MCTSJogador, orcamento_ms=orcamento_ms)
+        return MCTSJogador
+    elif tipo == "Aleatório":
+        return Jogador
+    elif tipo == "Controlar jogador":
+        return CLIJogador
+    # fallback seguro
+    return Jogador
+
+
+def _tipos(data: dict) -> dict:
+    # Garante as quatro entradas J1–J4, usando exatamente o que veio do frontend
+    return {j: data.get(j, "Aleatório") for j in JOGADORES}
+
+
+def _orcamento(valor) -> float:
+    if isinstance(valor, bool) or not isinstance(valor, (int, float)):
+        raise ValueError(f"orcamento_ms deve ser um número: {valor!r}")
+    if not math.isfinite(valor) or valor <= 0:
+        raise ValueError(f"orcamento_ms deve ser positivo e finito: {valor!r}")
+    return float(valor)
+
+
+def _orcamentos(data: dict) -> dict:
+    """``orcamento_ms`` por jogador: um número vale para todos, um objeto é por jogador.
+
+    Levanta ``ValueError`` se algum orçamento não for um número positivo e
+    finito.
+    """
+    orcamento = data.get("orcamento_ms")
+    if orcamento is None:
+        return {}
+    if isinstance(orcamento, dict):
+        return {
+            j: _orcamento(v) for j, v in orcamento.items() if j in JOGADORES and v is not None
+        }
+    return {j: _orcamento(orcamento) for j in JOGADORES}
+
+
+def _pedido_invalido(data: dict):
+    """Resposta 400 para um pedido que falharia durante a partida, ou ``None``."""
+    try:
+        _orcamentos(data)
+    except ValueError as erro:
+        return jsonify({"erro": str(erro)}), 400
+    return None
+
+
+def _estrategias(tipos: dict, orcamentos: dict) -> dict:
+    return {j: construir_estrategia(tipo, orcamentos.get(j)) for j, tipo in tipos.items()}
+
+
+def _semente(data: dict) -> Optional[int]:
+    semente = data.get("semente")
+    return None if semente is None else int(semente)
+
+
+def _dupla(jogador: str) -> str:
+    return "Dupla_1" if jogador in ["J1", "J3"] else "Dupla_2"
+
 
 @app.route('/')
 def index():
     return render_template('frontend_visualizador.html')
 
-@app.route('/simular', methods=['POST'])
-def simular():
-    # 1. Recebe exatamente {"J1": "...", "J2": "...", "J3": "...", "J4": "..."}
-    data = request.get_json()
-    
-    # 2. Constrói a fábrica de estratégia a partir da string
-    def construir_estrategia(tipo: str):
-        if tipo == "RL":
-            return RLJogador
-        elif tipo == "GA":
-            pesos = [1.8, 15.3, 15.7, 9.4, -9.6, -1.5, -20.4, 6.4]
-            return lambda nome, mao: GAJogador(nome, mao, pesos)
-        elif tipo == "MCTS":
-            return lambda nome, mao: MCTSJogador(nome, mao)
-        elif tipo == "Aleatório":
-            return Jogador
-        elif tipo == "Controlar jogador":
-            return CLIJogador
-        # fallback seguro
-        return Jogador
 
-    # 3. Garante as quatro entradas J1–J4, usando exatamente o que veio do frontend
-    jogadores = ["J1", "J2", "J3", "J4"]
-    estrategias = {
-        j: construir_estrategia(data.get(j, "Aleatório"))
-        for j in jogadores
-    }
+def _chave_cache(data: dict) -> Optional[str]:
+    """Chave de :data:`cache` da simulação pedida em ``data``, ou ``None``.
+
+    Só partidas com semente, sem orçamento de tempo nos jogadores MCTS e sem
+    estratégias :data:`NAO_REPRODUZIVEIS` são reproduzíveis.
+    """
+    semente = _semente(data)
+    tipos = _tipos(data)
+    cronometrado = any(tipos[j] == "MCTS" for j in _orcamentos(data))
+    if semente is None or cronometrado or NAO_REPRODUZIVEIS & set(tipos.values()):
+        return None
+    return chave_simulacao(tipos, semente, int(data.get("pontos_para_vencer", 6)))
+
 
-    # 4. Executa a simulação da partida
-    resultado = simular_partida(estrategias=estrategias)
+def simular_para_visualizador(data: dict, sink: Optional[HistoricoSink] = None) -> dict:
+    """Simula uma partida e monta a resposta de ``/simular``.
+
+    ``data`` é o corpo da requisição: ``{"J1": "MCTS", ...}`` e, opcionais,
+    ``"semente"``, ``"pontos_para_vencer"`` e ``"orcamento_ms"`` (número ou
+    ``{"J1": ms, ...}``). Com semente a partida é reproduzível e o resultado
+    vem de :data:`cache` quando já foi simulado (ver :func:`_chave_cache`).
+    O histórico da partida vai para ``sink`` (por padrão ``sink_padrao()``).
+    """
+    chave = _chave_cache(data)
+    if chave is not None:
+        guardado = cache.obter(chave)
+        if guardado is not None:
+            return guardado
+
+    resposta = _simular(data, sink)
+    if chave is not None:
+        cache.guardar(chave, resposta)
+    return resposta
+
+
+def _simular(data: dict, sink: Optional[HistoricoSink]) -> dict:
+    """Simula a partida pedida em ``data`` sem consultar :data:`cache`."""
+    resultado = simular_partida(
+        pontos_para_vencer=int(data.get("pontos_para_vencer", 6)),
+        estrategias=_estrategias(_tipos(data), _orcamentos(data)),
+        registro="completo",
+        sink=sink if sink is not None else sink_padrao(),
+        semente=_semente(data),
+    )
 
-    # 5. Transforma o resultado para o formato esperado pelo frontend
     estados = []
     historicoRodadas = []
     placar = {
@@ -51,20 +165,146 @@ def simular():
         estados.extend(rodada["estados"])
         final = rodada["final"]
         if final["vencedor_rodada"]:
-            dupla = "Dupla_1" if final["vencedor_rodada"] in ["J1", "J3"] else "Dupla_2"
             historicoRodadas.append({
                 "vencedor": final["vencedor_rodada"],
                 "tipoBatida": final["tipo_batida"],
                 "pontos": final["pontuacao_rodada"],
-                "dupla": dupla
+                "dupla": _dupla(final["vencedor_rodada"])
             })
 
-    return jsonify({
+    return {
         "estados": estados,
         "placar": placar,
         "historicoRodadas": historicoRodadas,
         "vencedor_partida": resultado["vencedor_partida"]
-    })
+    }
+
+
+@app.route('/simular', methods=['POST'])
+def simular():
+    # Recebe exatamente {"J1": "...", "J2": "...", "J3": "...", "J4": "..."}
+    data = request.get_json()
+    invalido = _pedido_invalido(data)
+    if invalido is not None:
+        return invalido
+    return jsonify(simular_para_visualizador(data))
+
+
+# ---------------------------------------------------------------------------
+# Tarefas em segundo plano
+# ---------------------------------------------------------------------------
+def _simular_em_tarefa(data: dict) -> tuple:
+    """Executada no pool de :data:`tarefas`.
+
+    O worker não grava histórico nem consulta :data:`cache`, que são do
+    processo do servidor: as linhas da partida voltam junto com a resposta e
+    :func:`_concluir_tarefa` as grava, nos mesmos arquivos de ``/simular``.
+    """
+    coletor = HistoricoSink(limite=math.inf)
+    resposta = _simular(data, coletor)
+    return resposta, coletor.retirar()
+
+
+def _concluir_tarefa(chave: Optional[str], saida: tuple) -> dict:
+    resposta, linhas = saida
+    sink_padrao().anexar(linhas)
+    if chave is not None:
+        cache.guardar(chave, resposta)
+    return resposta
+
+
+@app.route('/tarefas', methods=['POST'])
+def criar_tarefa():
+    """Agenda uma simulação de ``/simular`` e responde com o id da tarefa.
+
+    Simulações já presentes em :data:`cache` viram tarefas concluídas na
+    hora, sem passar pelo pool; as demais guardam o resultado no cache ao
+    terminar.
+    """
+    data = request.get_json()
+    invalido = _pedido_invalido(data)
+    if invalido is not None:
+        return invalido
+    chave = _chave_cache(data)
+    guardado = cache.obter(chave) if chave is not None else None
+    if guardado is not None:
+        id_tarefa = tarefas.concluida(guardado)
+        return jsonify(tarefas.estado(id_tarefa)), 200
+    try:
+        id_tarefa = tarefas.submeter(
+            _simular_em_tarefa, data, ao_concluir=functools.partial(_concluir_tarefa, chave)
+        )
+    except FilaCheia as erro:
+        return jsonify({"erro": str(erro)}), 429
+    return jsonify(tarefas.estado(id_tarefa)), 202
+
+
+@app.route('/tarefas/<id_tarefa>', methods=['GET'])
+def estado_tarefa(id_tarefa):
+    try:
+        return jsonify(tarefas.estado(id_tarefa))
+    except KeyError:
+        return jsonify({"erro": "Tarefa não encontrada"}), 404
+
+
+@app.route('/tarefas/<id_tarefa>/resultado', methods=['GET'])
+def resultado_tarefa(id_tarefa):
+    """200 com o resultado, 202 enquanto não termina, 409 se cancelada."""
+    try:
+        estado = tarefas.estado(id_tarefa)
+    except KeyError:
+        return jsonify({"erro": "Tarefa não encontrada"}), 404
+    if estado["status"] == CONCLUIDA:
+        return jsonify(tarefas.resultado(id_tarefa))
+    if estado["status"] == CANCELADA:
+        return jsonify(estado), 409
+    if estado["status"] == ERRO:
+        return jsonify(estado), 500
+    return jsonify(estado), 202
+
+
+@app.route('/tarefas/<id_tarefa>', methods=['DELETE'])
+def cancelar_tarefa(id_tarefa):
+    try:
+        cancelada = tarefas.cancelar(id_tarefa)
+    except KeyError:
+        return jsonify({"erro": "Tarefa não encontrada"}), 404
+    return jsonify(tarefas.estado(id_tarefa)), 200 if cancelada else 409
+
+
+@app.route('/simular/fluxo', methods=['POST'])
+def simular_fluxo():
+    """Mesma simulação de ``/simular`` transmitida em NDJSON, uma linha por evento.
+
+    Eventos ``estado`` trazem um item de ``estados`` sem o log ``jogadas``
+    (a jogada do evento já está no próprio estado); eventos ``rodada`` já
+    trazem o item de ``historicoRodadas`` e o placar; ``fim`` encerra o fluxo.
+    """
+    data = request.get_json()
+    invalido = _pedido_invalido(data)
+    if invalido is not None:
+        return invalido
+    eventos = simular_partida_em_fluxo(
+        pontos_para_vencer=int(data.get("pontos_para_vencer", 6)),
+        estrategias=_estrategias(_tipos(data), _orcamentos(data)),
+        semente=_semente(data),
+    )
+
+    def gerar():
+        for evento in eventos:
+            if evento["evento"] == "rodada":
+                final = evento.pop("final")
+                evento["historico"] = None
+                if final["vencedor_rodada"]:
+                    evento["historico"] = {
+                        "vencedor": final["vencedor_rodada"],
+                        "tipoBatida": final["tipo_batida"],
+                        "pontos": final["pontuacao_rodada"],
+                        "dupla": _dupla(final["vencedor_rodada"])
+                    }
+            yield json.dumps(evento) + "\n"
+
+    return Response(stream_with_context(gerar()), mimetype="application/x-ndjson")
 
 if __name__ == '__main__':
     app.run(debug=True)
@@ -0,0 +1,239 @@
+"""Casos de benchmark dos caminhos críticos do simulador.
+
+Cada caso recebe a semente e devolve uma função sem argumentos que executa
+uma operação; o estado necessário é montado fora da medição sempre que
+possível.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import namedtuple
+from typing import Callable, List
+
+from core.dupla import Dupla
+from core.jogador import escolher_peca_ga
+from core.tabuleiro import Tabuleiro
+from utilidades.distribuicao import distribuir_jogadores
+
+# ``numero`` → chamadas por repetição
+Caso = namedtuple("Caso", ["nome", "preparar", "numero"])
+
+PESOS_GA = [1.83, 15.30, 15.69, 9.43, -9.64, -1.47, -20.42, 6.37]
+
+
+def estrategia_aleatoria(jogador, tabuleiro, _jogadores, **_):
+    return random.choice(jogador.jogadas_validas(tabuleiro.obter_pontas()))
+
+
+def _meio_de_rodada(seed: int):
+    """Jogadores e tabuleiro após algumas jogadas, vez de ``J1``."""
+    random.seed(seed)
+    jogadores = distribuir_jogadores()
+    tabuleiro = Tabuleiro()
+    atual = jogadas = passes = 0
+    while jogadas < 6 and passes < 4:
+        j = jogadores[atual % 4]
+        opcoes = j.jogadas_validas(tabuleiro.obter_pontas())
+        if opcoes:
+            p = random.choice(opcoes)
+            j.remover_peca(p)
+            tabuleiro.jogar(p)
+            jogadas += 1
+            passes = 0
+        else:
+            passes += 1
+        atual += 1
+    # J1 precisa ter jogada disponível e a rodada não pode ter travado
+    if passes == 4 or not jogadores[0].jogadas_validas(tabuleiro.obter_pontas()):
+        return _meio_de_rodada(seed + 1)
+    return jogadores, tabuleiro
+
+
+def _duplas():
+    return {
+        "Dupla_1": Dupla("Dupla_1", ["J1", "J3"]),
+        "Dupla_2": Dupla("Dupla_2", ["J2", "J4"]),
+    }
+
+
+def _simular_rodada(seed: int) -> Callable[[], object]:
+    from motor_de_jogo import simular_rodada
+
+    random.seed(seed)
+    estrategias = {n: estrategia_aleatoria for n in ("J1", "J2", "J3", "J4")}
+    return lambda: simular_rodada(distribuir_jogadores(estrategias), registro="nenhum")
+
+
+def _simular_rodada_completo(seed: int) -> Callable[[], object]:
+    from motor_de_jogo import simular_rodada
+
+    random.seed(seed)
+    estrategias = {n: estrategia_aleatoria for n in ("J1", "J2", "J3", "J4")}
+    return lambda: simular_rodada(distribuir_jogadores(estrategias))
+
+
+def _simular_rodada_rapida(seed: int) -> Callable[[], object]:
+    import motor_bitboard as mb
+
+    rng = random.Random(seed)
+    politica = mb.politica_aleatoria(rng)
+    return lambda: mb.simular_rodada_rapida(mb.distribuir_maos(rng), None, politica)
+
+
+def _simular_partida(seed: int) -> Callable[[], object]:
+    from motor_de_jogo import simular_partida
+
+    random.seed(seed)
+    estrategias = {n: estrategia_aleatoria for n in ("J1", "J2", "J3", "J4")}
+    return lambda: simular_partida(estrategias=estrategias, sink=None)
+
+
+def _mcts(simulacoes: int, modo: str = "flat", **opcoes):
+    def preparar(seed: int) -> Callable[[], object]:
+        from mcts_engine import escolher_peca_mcts, escolher_peca_uct
+
+        escolher = escolher_peca_uct if modo == "uct" else escolher_peca_mcts
+        jogadores, tabuleiro = _meio_de_rodada(seed)
+        random.seed(seed)
+        return lambda: escolher(
+            jogadores[0], jogadores, tabuleiro, simulacoes, **opcoes
+        )
+
+    return preparar
+
+
+def _amostrar_maos(seed: int) -> Callable[[], object]:
+    from determinizacao import AmostradorMaos
+
+    jogadores, tabuleiro = _meio_de_rodada(seed)
+    jogadores[1].registrar_passe((6, 2))
+    amostrador = AmostradorMaos(jogadores[0], jogadores, tabuleiro)
+    rng = random.Random(seed)
+    return lambda: amostrador.amostrar(rng)
+
+
+def _rl(metodo: str):
+    def preparar(seed: int) -> Callable[[], object]:
+        from rl_engine import RLDominoStrategy
+
+        jogadores, tabuleiro = _meio_de_rodada(seed)
+        random.seed(seed)
+        estrategia = RLDominoStrategy(epsilon=0.0)
+        duplas = _duplas()
+        passes = {j.nome: 0 for j in jogadores}
+        if metodo == "_state":
+            return lambda: estrategia._state(
+                jogadores[0], tabuleiro, jogadores, duplas, passes, 6
+            )
+        return lambda: estrategia.escolher_peca(
+            jogadores[0],
+            tabuleiro,
+            jogadores,
+            duplas=duplas,
+            passes_jog=passes,
+            pontos_para_vencer=6,
+        )
+
+    return preparar
+
+
+def chaves_q(seed: int, n_partidas: int = 20) -> list:
+    """Chaves ``(estado, (lado1, lado2))`` reais, coletadas em partidas RL."""
+    from motor_de_jogo import simular_partida
+    from rl_engine import RLDominoStrategy
+
+    chaves = []
+
+    class _Coletora(RLDominoStrategy):
+        def escolher_peca(self, jogador, tabuleiro, jogadores, **kwargs):
+            estado = self._state(
+                jogador, tabuleiro, jogadores,
+                kwargs["duplas"], kwargs["passes_jog"], kwargs["pontos_para_vencer"],
+            )
+            for p in jogador.jogadas_validas(tabuleiro.obter_pontas()):
+                chaves.append((estado, (p.lado1, p.lado2)))
+            return super().escolher_peca(jogador, tabuleiro, jogadores, **kwargs)
+
+    estrategia = _Coletora(epsilon=0.3)
+    for k in range(n_partidas):
+        simular_partida(
+            estrategias={j: estrategia for j in ("J1", "J2", "J3", "J4")},
+            registro="nenhum",
+            sink=None,
+            semente=seed + k,
+        )
+    return chaves
+
+
+def _q(tipo: str):
+    """Consulta de ``(estado, peça)`` em uma tabela Q já populada.
+
+    ``compacta_empacotada`` mede o caminho de ``RLDominoStrategy`` com
+    ``compacta=True``: o estado já empacotado (uma vez por decisão).
+    """
+    def preparar(seed: int) -> Callable[[], object]:
+        from collections import defaultdict
+        from itertools import cycle
+
+        from rl_tabela import TabelaQCompacta, empacotar_estado
+
+        chaves = chaves_q(seed)
+        rng = random.Random(seed)
+        if tipo == "dict":
+            tabela = defaultdict(float, ((c, rng.random()) for c in chaves))
+        else:
+            tabela = TabelaQCompacta.de_itens((c, rng.random()) for c in chaves)
+            if tipo == "compacta_empacotada":
+                chaves = [(empacotar_estado(e), a) for e, a in chaves]
+        proxima = cycle(chaves).__next__
+        return lambda: tabela[proxima()]
+
+    return preparar
+
+
+def _ga(seed: int) -> Callable[[], object]:
+    jogadores, tabuleiro = _meio_de_rodada(seed)
+    return lambda: escolher_peca_ga(jogadores[0], tabuleiro, jogadores, PESOS_GA)
+
+
+def _run_match_v2(seed: int) -> Callable[[], object]:
+    from motor_ga_patch import run_match_v2
+
+    random.seed(seed)
+    return lambda: run_match_v2(PESOS_GA, n_games=5)
+
+
+def _tem_numpy() -> bool:
+    try:
+        import numpy  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def casos_padrao() -> List[Caso]:
+    casos = [
+        Caso("simular_rodada/aleatorio", _simular_rodada, 200),
+        Caso("simular_rodada/aleatorio_completo", _simular_rodada_completo, 200),
+        Caso("simular_rodada_rapida/aleatorio", _simular_rodada_rapida, 2000),
+        Caso("simular_partida/aleatorio", _simular_partida, 20),
+        Caso("escolher_peca_mcts/10", _mcts(10), 20),
+        Caso("escolher_peca_mcts/30", _mcts(30), 10),
+        Caso("escolher_peca_mcts/100", _mcts(100), 3),
+        Caso("escolher_peca_mcts/30_uct", _mcts(30, "uct"), 10),
+        Caso("escolher_peca_mcts/30_amostras", _mcts(30, amostras=30), 10),
+        Caso("determinizacao/amostrar", _amostrar_maos, 5000),
+        Caso("rl/_state", _rl("_state"), 2000),
+        Caso("rl/escolher_peca", _rl("escolher_peca"), 2000),
+        Caso("rl/q_dict", _q("dict"), 20000),
+        Caso("rl/q_compacta", _q("compacta"), 20000),
+        Caso("rl/q_compacta_empacotada", _q("compacta_empacotada"), 20000),
+        Caso("escolher_peca_ga", _ga, 5000),
+        Caso("run_match_v2/5_partidas", _run_match_v2, 2),
+    ]
+    if _tem_numpy():
+        casos += [
+            Caso("escolher_peca_mcts/100_vetorizado", _mcts(100, vetorizado=True), 10),
+        ]
+    return casos
@@ -0,0 +1,157 @@
+"""Partidas de treino até ``RLDominoStrategy`` convergir.
+
+A dupla J1/J3 (uma estratégia RL por assento, com a mesma tabela ou o
+mesmo modelo de :mod:`rl_linear`) treina
+contra a dupla J2/J4 aleatória. A cada ``--avaliar-a-cada`` partidas a
+taxa de vitória é medida sem exploração nem aprendizado em partidas de
+sementes fixas; converge a configuração que atinge ``--alvo``. Também é
+medida a cobertura: a fração das decisões da avaliação em que alguma
+jogada candidata já tem valor aprendido (o estado de ``_state`` é grande e
+a maior parte das decisões cai em estados nunca vistos)::
+
+    python -m benchmarks.convergencia_rl --partidas 3000 --alvo 0.6
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict, List, Optional
+
+from motor_de_jogo import simular_partida
+from rl_engine import RLDominoStrategy
+
+# nome → (representação de Q, opções da estratégia); "linear" requer numpy
+CONFIGURACOES: Dict[str, tuple[str, dict]] = {
+    "ultima": ("tabela", {"trajetoria": False}),
+    "mc": ("tabela", {}),
+    "td_0.8": ("tabela", {"lambda_td": 0.8}),
+    "mc_replay": ("tabela", {"replay": 256, "amostras_replay": 2}),
+    "linear": ("linear", {"modelo": "linear"}),
+    "mlp": ("linear", {"modelo": "mlp"}),
+}
+
+SEMENTE_AVALIACAO = 1_000_000
+
+
+class _Avaliadora:
+    """Joga de forma gulosa com a Q de treino, sem atualizá-la."""
+
+    decisoes = 0
+    informadas = 0
+
+    def escolher_peca(self, jogador, tabuleiro, jogadores, **kwargs):
+        escolha = super().escolher_peca(jogador, tabuleiro, jogadores, **kwargs)
+        self.decisoes += 1
+        # um modelo de pesos sempre tem opinião; a tabela só nos estados vistos
+        self.informadas += hasattr(self, "modelo") or any(
+            self.q.get((self.prev_state, (p.lado1, p.lado2)), 0.0) != 0.0
+            for p in jogador.jogadas_validas(tabuleiro.obter_pontas())
+        )
+        return escolha
+
+    def notificar_resultado(self, jogador_nome, vencedor):
+        self._trajetorias.pop(jogador_nome, None)
+
+
+def _classe(representacao: str):
+    if representacao == "linear":
+        from rl_linear import RLLinearStrategy
+
+        return RLLinearStrategy
+    return RLDominoStrategy
+
+
+def _dupla_rl(classe, compartilhado: dict, **opcoes) -> dict:
+    """Estratégias de J1 e J3 com os atributos de ``compartilhado`` (``q`` ou ``modelo``)."""
+    estrategias = {}
+    for nome in ("J1", "J3"):
+        estrategia = classe(**opcoes)
+        estrategia.__dict__.update(compartilhado)
+        estrategias[nome] = estrategia
+    return estrategias
+
+
+def avaliar(classe, compartilhado: dict, partidas: int, pontos_para_vencer: int) -> tuple[float, float]:
+    """``(taxa de vitória, cobertura)`` da dupla RL jogando de forma gulosa."""
+    avaliadora = type("Avaliadora", (_Avaliadora, classe), {})
+    estrategias = _dupla_rl(avaliadora, compartilhado, epsilon=0.0)
+    vitorias = 0
+    for k in range(partidas):
+        resultado = simular_partida(
+            pontos_para_vencer=pontos_para_vencer,
+            estrategias=estrategias,
+            registro="nenhum",
+            sink=None,
+            semente=SEMENTE_AVALIACAO + k,
+        )
+        vitorias += resultado["vencedor_partida"] == "Dupla_1"
+    decisoes = sum(e.decisoes for e in estrategias.values())
+    informadas = sum(e.informadas for e in estrategias.values())
+    return vitorias / partidas, informadas / decisoes if decisoes else 0.0
+
+
+def curva(
+    representacao: str,
+    opcoes: dict,
+    partidas: int,
+    avaliar_a_cada: int,
+    partidas_avaliacao: int,
+    pontos_para_vencer: int = 2,
+    semente: int = 0,
+) -> List[tuple[int, float, float]]:
+    """``[(partidas de treino, taxa de vitória, cobertura), ...]``."""
+    classe = _classe(representacao)
+    modelo = classe(**opcoes)
+    compartilhado = {"modelo": modelo.modelo} if hasattr(modelo, "modelo") else {"q": modelo.q}
+    estrategias = _dupla_rl(classe, compartilhado, **opcoes)
+    pontos = [(0, *avaliar(classe, compartilhado, partidas_avaliacao, pontos_para_vencer))]
+    for k in range(1, partidas + 1):
+        simular_partida(
+            pontos_para_vencer=pontos_para_vencer,
+            estrategias=estrategias,
+            registro="nenhum",
+            sink=None,
+            semente=semente + k,
+        )
+        if k % avaliar_a_cada == 0:
+            pontos.append((k, *avaliar(classe, compartilhado, partidas_avaliacao, pontos_para_vencer)))
+    return pontos
+
+
+def partidas_ate_convergir(pontos: List[tuple[int, float, float]], alvo: float) -> Optional[int]:
+    for k, taxa, _ in pontos:
+        if taxa >= alvo:
+            return k
+    return None
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--partidas", type=int, default=2000)
+    parser.add_argument("--avaliar-a-cada", type=int, default=250)
+    parser.add_argument("--avaliacao", type=int, default=200)
+    parser.add_argument("--pontos", type=int, default=2)
+    parser.add_argument("--alvo", type=float, default=0.6)
+    parser.add_argument("--semente", type=int, default=0)
+    parser.add_argument("--config", nargs="*", choices=list(CONFIGURACOES))
+    args = parser.parse_args(argv)
+
+    for nome in args.config or CONFIGURACOES:
+        pontos = curva(
+            *CONFIGURACOES[nome],
+            args.partidas,
+            args.avaliar_a_cada,
+            args.avaliacao,
+            args.pontos,
+            args.semente,
+        )
+        convergiu = partidas_ate_convergir(pontos, args.alvo)
+        taxas = " ".join(f"{taxa:.2f}" for _, taxa, _ in pontos)
+        coberturas = " ".join(f"{cobertura:.3f}" for *_, cobertura in pontos)
+        print(f"{nome:<12} convergência: {convergiu if convergiu is not None else '-':>6}")
+        print(f"{'':<12} vitórias:  {taxas}")
+        print(f"{'':<12} cobertura: {coberturas}")
+
+
+if __name__ == "__main__":
+    main()
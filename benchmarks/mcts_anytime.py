@@ -0,0 +1,68 @@
+"""Latência e simulações por decisão do MCTS com orçamento de tempo.
+
+Joga ``--partidas`` partidas com as quatro cadeiras em ``MCTSJogador`` com
+``orcamento_ms`` e resume os ``relatorios`` das decisões com mais de uma
+jogada: latência (mediana, p95 e máxima), simulações por decisão e o
+motivo da parada::
+
+    python -m benchmarks.mcts_anytime --orcamentos 5 20 50 --modo uct
+"""
+
+from __future__ import annotations
+
+import argparse
+import statistics
+from collections import Counter
+
+from core.jogador import MCTSJogador
+from motor_de_jogo import simular_partida
+
+
+def medir(orcamento_ms: float, partidas: int, modo: str = "flat", amostras: int = 0) -> dict:
+    relatorios = []
+
+    class Cronometrado(MCTSJogador):
+        def __init__(self, nome, mao):
+            super().__init__(nome, mao, modo=modo, amostras=amostras, orcamento_ms=orcamento_ms)
+            self.relatorios = relatorios
+
+    for k in range(partidas):
+        simular_partida(
+            pontos_para_vencer=3,
+            estrategias=dict.fromkeys(("J1", "J2", "J3", "J4"), Cronometrado),
+            registro="nenhum",
+            sink=None,
+            semente=k,
+        )
+    decisoes = [r for r in relatorios if r["motivo"] != "unica"]
+    latencias = sorted(r["segundos"] * 1e3 for r in decisoes)
+    return {
+        "decisoes": len(decisoes),
+        "latencia_mediana_ms": statistics.median(latencias),
+        "latencia_p95_ms": latencias[int(0.95 * (len(latencias) - 1))],
+        "latencia_max_ms": latencias[-1],
+        "simulacoes_media": statistics.mean(r["simulacoes"] for r in decisoes),
+        "motivos": dict(Counter(r["motivo"] for r in decisoes)),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--orcamentos", type=float, nargs="+", default=[5.0, 20.0, 50.0])
+    parser.add_argument("--partidas", type=int, default=3)
+    parser.add_argument("--modo", choices=["flat", "uct"], default="flat")
+    parser.add_argument("--amostras", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    for orcamento in args.orcamentos:
+        r = medir(orcamento, args.partidas, args.modo, args.amostras)
+        print(
+            f"{orcamento:6.1f} ms  decisões={r['decisoes']:<4} "
+            f"latência p50={r['latencia_mediana_ms']:.1f} p95={r['latencia_p95_ms']:.1f} "
+            f"máx={r['latencia_max_ms']:.1f} ms  simulações/decisão={r['simulacoes_media']:.0f}  "
+            f"{r['motivos']}"
+        )
+
+
+if __name__ == "__main__":
+    main()
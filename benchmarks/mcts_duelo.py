@@ -0,0 +1,100 @@
+"""Duelo entre configurações de ``MCTSJogador`` com o mesmo orçamento.
+
+Cada semente é jogada duas vezes, trocando as duplas de lado, para que a
+distribuição das peças não favoreça nenhuma configuração. Mede a taxa de
+vitória de ``--a`` contra ``--b`` (qualidade da decisão) e as simulações
+por segundo de cada uma, contadas nas decisões com mais de uma jogada::
+
+    python -m benchmarks.mcts_duelo --a uct --b flat --partidas 20
+"""
+
+from __future__ import annotations
+
+import argparse
+from typing import Dict
+
+from core.jogador import MCTSJogador
+from motor_de_jogo import simular_partida
+
+CONFIGURACOES: Dict[str, dict] = {
+    "flat": {},
+    "uct": {"modo": "uct"},
+    # mãos ocultas sorteadas em vez de vistas, 30 distribuições por decisão
+    "flat_amostras": {"amostras": 30},
+    "uct_amostras": {"modo": "uct", "amostras": 30},
+    # estatísticas por posição (transposições compartilhadas) em vez da árvore
+    "uct_tt": {"modo": "uct", "transposicao": 1 << 14},
+    # tempo fixo por decisão em vez de simulações fixas (sem teto)
+    "flat_20ms": {"orcamento_ms": 20, "simulations": None},
+    "uct_20ms": {"modo": "uct", "orcamento_ms": 20, "simulations": None},
+}
+
+
+def _classe(opcoes: dict, simulacoes: int, medidas: dict) -> type:
+    class Configurado(MCTSJogador):
+        def __init__(self, nome, mao):
+            super().__init__(nome, mao, **{"simulations": simulacoes, **opcoes})
+
+        def escolher_peca(self, tabuleiro, jogadores, **kwargs):
+            n = len(self.jogadas_validas(tabuleiro.obter_pontas()))
+            peca = super().escolher_peca(tabuleiro, jogadores, **kwargs)
+            if n > 1:
+                medidas["segundos"] += self.relatorios[-1]["segundos"]
+                medidas["simulacoes"] += self.relatorios[-1]["simulacoes"]
+            return peca
+
+    return Configurado
+
+
+def duelo(a: dict, b: dict, partidas: int, simulacoes: int, pontos_para_vencer: int = 3, semente: int = 0) -> dict:
+    """Vitórias de ``a`` e simulações/s de cada lado em ``2 × partidas`` partidas."""
+    medidas = {lado: {"segundos": 0.0, "simulacoes": 0} for lado in "ab"}
+    classe_a = _classe(a, simulacoes, medidas["a"])
+    classe_b = _classe(b, simulacoes, medidas["b"])
+    vitorias_a = 0
+    for k in range(partidas):
+        for a_na_dupla_1 in (True, False):
+            um, dois = (classe_a, classe_b) if a_na_dupla_1 else (classe_b, classe_a)
+            resultado = simular_partida(
+                pontos_para_vencer=pontos_para_vencer,
+                estrategias={"J1": um, "J3": um, "J2": dois, "J4": dois},
+                registro="nenhum",
+                sink=None,
+                semente=semente + k,
+            )
+            vitorias_a += (resultado["vencedor_partida"] == "Dupla_1") == a_na_dupla_1
+    return {
+        "partidas": 2 * partidas,
+        "vitorias_a": vitorias_a,
+        "taxa_a": vitorias_a / (2 * partidas),
+        **{
+            f"simulacoes_por_segundo_{lado}": m["simulacoes"] / m["segundos"] if m["segundos"] else 0.0
+            for lado, m in medidas.items()
+        },
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--a", choices=list(CONFIGURACOES), default="uct")
+    parser.add_argument("--b", choices=list(CONFIGURACOES), default="flat")
+    parser.add_argument("--partidas", type=int, default=20)
+    parser.add_argument("--simulacoes", type=int, default=30)
+    parser.add_argument("--pontos", type=int, default=3)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    r = duelo(
+        CONFIGURACOES[args.a],
+        CONFIGURACOES[args.b],
+        args.partidas,
+        args.simulacoes,
+        args.pontos,
+        args.semente,
+    )
+    print(f"{args.a} x {args.b}: {r['vitorias_a']}/{r['partidas']} vitórias ({r['taxa_a']:.0%})")
+    print(f"simulações/s  {args.a}: {r['simulacoes_por_segundo_a']:.0f}  {args.b}: {r['simulacoes_por_segundo_b']:.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Latência de uma decisão MCTS em função do número de processos.
+
+Mede ``escolher_peca_mcts`` nos mesmos estados de meio de rodada com
+``processos`` = 1, 2, 4, … até ``os.cpu_count()``. O pool é aquecido antes
+da medição, como acontece numa partida em que ele é reaproveitado::
+
+    python -m benchmarks.mcts_paralelo --simulacoes 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import time
+
+from benchmarks.casos import _meio_de_rodada
+from mcts_engine import encerrar_pool, escolher_peca_mcts
+
+
+def _niveis(maximo: int) -> list[int]:
+    niveis = [1]
+    while niveis[-1] * 2 <= maximo:
+        niveis.append(niveis[-1] * 2)
+    if niveis[-1] != maximo:
+        niveis.append(maximo)
+    return niveis
+
+
+def medir(processos: int, simulacoes: int, estados: int, amostras: int = 0) -> float:
+    """Mediana, em segundos, de uma decisão em ``estados`` posições."""
+    posicoes = [_meio_de_rodada(seed) for seed in range(estados)]
+    jogadores, tabuleiro = posicoes[0]
+    escolher_peca_mcts(jogadores[0], jogadores, tabuleiro, 1, processos=processos)
+    tempos = []
+    for k, (jogadores, tabuleiro) in enumerate(posicoes):
+        inicio = time.perf_counter()
+        escolher_peca_mcts(
+            jogadores[0],
+            jogadores,
+            tabuleiro,
+            simulacoes,
+            amostras=amostras,
+            processos=processos,
+            rng=random.Random(k),
+        )
+        tempos.append(time.perf_counter() - inicio)
+    return statistics.median(tempos)
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--simulacoes", type=int, default=200)
+    parser.add_argument("--estados", type=int, default=10)
+    parser.add_argument("--amostras", type=int, default=0)
+    parser.add_argument("--max-processos", type=int, default=os.cpu_count() or 1)
+    args = parser.parse_args(argv)
+
+    base = None
+    try:
+        for processos in _niveis(args.max_processos):
+            t = medir(processos, args.simulacoes, args.estados, args.amostras)
+            base = base or t
+            print(f"processos={processos:<3} {t * 1e3:8.1f} ms/decisão  speedup {base / t:4.2f}x")
+    finally:
+        encerrar_pool()
+
+
+if __name__ == "__main__":
+    main()
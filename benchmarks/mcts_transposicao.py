@@ -0,0 +1,63 @@
+"""Tabela de transposição da busca UCT: acertos, substituições e memória.
+
+Para cada política e capacidade, decide ``--estados`` posições de meio de
+rodada com ``escolher_peca_uct(..., tabela=...)``, uma tabela nova por
+posição, e mostra a taxa de acerto, as entradas ocupadas, as substituições,
+a memória da tabela e o tempo por decisão (comparado à árvore comum)::
+
+    python -m benchmarks.mcts_transposicao --simulacoes 200 --capacidades 1024 65536
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import statistics
+import time
+
+from benchmarks.casos import _meio_de_rodada
+from mcts_engine import escolher_peca_uct
+from transposicao import POLITICAS, TabelaTransposicao
+
+
+def medir(simulacoes: int, estados: int, capacidade: int = 0, politica: str = "visitas") -> dict:
+    """Médias por decisão; ``capacidade=0`` usa a árvore sem tabela."""
+    tempos, medidas = [], []
+    for seed in range(estados):
+        jogadores, tabuleiro = _meio_de_rodada(seed)
+        tabela = TabelaTransposicao(capacidade, politica) if capacidade else None
+        inicio = time.perf_counter()
+        escolher_peca_uct(
+            jogadores[0], jogadores, tabuleiro, simulacoes, tabela=tabela, rng=random.Random(seed)
+        )
+        tempos.append(time.perf_counter() - inicio)
+        if tabela is not None:
+            medidas.append(tabela.estatisticas())
+    resultado = {"ms_por_decisao": statistics.mean(tempos) * 1e3}
+    if medidas:
+        for campo in ("taxa_acerto", "entradas", "substituicoes", "memoria"):
+            resultado[campo] = statistics.mean(m[campo] for m in medidas)
+    return resultado
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--simulacoes", type=int, default=200)
+    parser.add_argument("--estados", type=int, default=10)
+    parser.add_argument("--capacidades", type=int, nargs="+", default=[1024, 1 << 16])
+    args = parser.parse_args(argv)
+
+    base = medir(args.simulacoes, args.estados)
+    print(f"árvore                      {base['ms_por_decisao']:7.1f} ms/decisão")
+    for capacidade in args.capacidades:
+        for politica in POLITICAS:
+            r = medir(args.simulacoes, args.estados, capacidade, politica)
+            print(
+                f"{politica:<8} {capacidade:>8} entradas {r['ms_por_decisao']:7.1f} ms/decisão  "
+                f"acerto={r['taxa_acerto']:.1%}  ocupadas={r['entradas']:.0f}  "
+                f"substituições={r['substituicoes']:.0f}  memória={r['memoria'] / 1024:.0f} KiB"
+            )
+
+
+if __name__ == "__main__":
+    main()
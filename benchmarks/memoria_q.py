@@ -0,0 +1,85 @@
+"""Memória por entrada e velocidade de consulta das tabelas Q.
+
+Compara o ``defaultdict`` original de ``RLDominoStrategy`` com
+:class:`rl_tabela.TabelaQCompacta` usando estados reais coletados em
+partidas::
+
+    python -m benchmarks.memoria_q --partidas 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+from collections import defaultdict
+
+from benchmarks.casos import chaves_q
+from rl_tabela import TabelaQCompacta, empacotar_estado
+
+
+def _popular_dict(chaves, valores) -> defaultdict:
+    # Recria os objetos como em ``RLDominoStrategy``: uma tupla por estado
+    # distinto e uma tupla nova para cada chave e ação.
+    estados = {}
+    tabela = defaultdict(float)
+    for (estado, (a, b)), v in zip(chaves, valores):
+        estado = estados.setdefault(estado, tuple(list(estado)))
+        tabela[(estado, (a, b))] = v
+    return tabela
+
+
+def _popular_compacta(chaves, valores) -> TabelaQCompacta:
+    tabela = TabelaQCompacta()
+    for chave, v in zip(chaves, valores):
+        tabela[chave] = v
+    return tabela
+
+
+def _memoria(popular, chaves, valores) -> tuple[object, int]:
+    tracemalloc.start()
+    tabela = popular(chaves, valores)
+    usados, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return tabela, usados
+
+
+def _consultas_por_segundo(tabela, chaves, repeticoes: int = 3) -> float:
+    melhor = float("inf")
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for chave in chaves:
+            tabela[chave]
+        melhor = min(melhor, time.perf_counter() - inicio)
+    return len(chaves) / melhor
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--partidas", type=int, default=100)
+    parser.add_argument("--semente", type=int, default=0)
+    args = parser.parse_args(argv)
+
+    chaves = list(dict.fromkeys(chaves_q(args.semente, args.partidas)))
+    rng = random.Random(args.semente)
+    valores = [rng.random() for _ in chaves]
+    n = len(chaves)
+
+    tabela_dict, mem_dict = _memoria(_popular_dict, chaves, valores)
+    tabela_comp, mem_comp = _memoria(_popular_compacta, chaves, valores)
+    empacotadas = [(empacotar_estado(e), a) for e, a in chaves]
+
+    linhas = [
+        ("defaultdict", mem_dict, _consultas_por_segundo(tabela_dict, chaves)),
+        ("compacta (estado em tupla)", mem_comp, _consultas_por_segundo(tabela_comp, chaves)),
+        ("compacta (estado empacotado)", mem_comp, _consultas_por_segundo(tabela_comp, empacotadas)),
+    ]
+    print(f"{n} entradas")
+    print(f"{'':<30} {'bytes/entrada':>14} {'consultas/s':>14}")
+    for nome, memoria, cps in linhas:
+        print(f"{nome:<30} {memoria / n:>14.1f} {cps:>14.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,144 @@
+"""Executor dos benchmarks do simulador.
+
+Uso::
+
+    python -m benchmarks.runner --saida base.json
+    python -m benchmarks.runner --saida novo.json --filtro mcts
+    python -m benchmarks.runner --comparar base.json novo.json --limiar 0.10
+
+Cada caso roda com semente fixa, ``--aquecimento`` execuções descartadas e
+``--repeticoes`` medições de ``numero`` chamadas. A comparação aponta como
+regressão todo caso cuja mediana por chamada piorou mais que ``--limiar``
+(fração) e termina com código ``1`` se houver alguma.
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+from typing import Dict, Iterable, List, Optional
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from benchmarks.casos import Caso, casos_padrao
+
+SEMENTE_PADRAO = 1234
+
+
+def medir(
+    caso: Caso,
+    *,
+    semente: int = SEMENTE_PADRAO,
+    aquecimento: int = 1,
+    repeticoes: int = 5,
+) -> Dict[str, float]:
+    """Mede ``caso`` e retorna estatísticas em segundos por chamada."""
+    fn = caso.preparar(semente)
+    for _ in range(aquecimento):
+        fn()
+
+    tempos = []
+    for _ in range(repeticoes):
+        inicio = time.perf_counter()
+        for _ in range(caso.numero):
+            fn()
+        tempos.append((time.perf_counter() - inicio) / caso.numero)
+
+    mediana = statistics.median(tempos)
+    return {
+        "numero": caso.numero,
+        "repeticoes": repeticoes,
+        "min": min(tempos),
+        "mediana": mediana,
+        "media": statistics.fmean(tempos),
+        "desvio": statistics.stdev(tempos) if len(tempos) > 1 else 0.0,
+        "ops_por_s": 1.0 / mediana if mediana > 0 else float("inf"),
+    }
+
+
+def executar(
+    casos: Iterable[Caso],
+    *,
+    semente: int = SEMENTE_PADRAO,
+    aquecimento: int = 1,
+    repeticoes: int = 5,
+    filtro: Optional[str] = None,
+) -> dict:
+    resultados = {}
+    for caso in casos:
+        if filtro and filtro not in caso.nome:
+            continue
+        stats = medir(caso, semente=semente, aquecimento=aquecimento, repeticoes=repeticoes)
+        resultados[caso.nome] = stats
+        print(
+            f"{caso.nome:<40} {stats['mediana'] * 1e3:10.3f} ms/op"
+            f"  ±{stats['desvio'] * 1e3:8.3f}  {stats['ops_por_s']:12.1f} op/s"
+        )
+    return {
+        "meta": {
+            "semente": semente,
+            "aquecimento": aquecimento,
+            "repeticoes": repeticoes,
+            "python": platform.python_version(),
+            "plataforma": platform.platform(),
+            "data": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        },
+        "resultados": resultados,
+    }
+
+
+def comparar(base: dict, novo: dict, limiar: float = 0.10) -> List[str]:
+    """Imprime a variação caso a caso e retorna os nomes com regressão."""
+    regressoes = []
+    for nome, atual in novo["resultados"].items():
+        anterior = base["resultados"].get(nome)
+        if anterior is None:
+            print(f"{nome:<40} {'(novo)':>10}")
+            continue
+        variacao = atual["mediana"] / anterior["mediana"] - 1.0
+        marca = ""
+        if variacao > limiar:
+            marca = "  REGRESSÃO"
+            regressoes.append(nome)
+        print(f"{nome:<40} {variacao * 100:+9.1f}%{marca}")
+    return regressoes
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--saida", help="arquivo JSON para gravar os resultados")
+    parser.add_argument("--semente", type=int, default=SEMENTE_PADRAO)
+    parser.add_argument("--aquecimento", type=int, default=1)
+    parser.add_argument("--repeticoes", type=int, default=5)
+    parser.add_argument("--filtro", help="roda apenas casos cujo nome contém o texto")
+    parser.add_argument("--comparar", nargs=2, metavar=("BASE", "NOVO"))
+    parser.add_argument("--limiar", type=float, default=0.10)
+    args = parser.parse_args(argv)
+
+    if args.comparar:
+        with open(args.comparar[0]) as f:
+            base = json.load(f)
+        with open(args.comparar[1]) as f:
+            novo = json.load(f)
+        return 1 if comparar(base, novo, args.limiar) else 0
+
+    resultado = executar(
+        casos_padrao(),
+        semente=args.semente,
+        aquecimento=args.aquecimento,
+        repeticoes=args.repeticoes,
+        filtro=args.filtro,
+    )
+    if args.saida:
+        with open(args.saida, "w") as f:
+            json.dump(resultado, f, indent=2)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,4 +1,5 @@
-from core.peca import Peca
+from core.peca import Peca, mascara_pontas
+from utilidades.instrumentacao import instrumentar
 from typing import Callable, Any, List, Optional, Sequence, TYPE_CHECKING
 
 if TYPE_CHECKING:  # pragma: no cover - used for type hints only
@@ -13,34 +14,52 @@ class Jogador:
         self.nome = nome
         self.mao: List[Peca] = list(mao)
         self.estrategia = estrategia
+        # Gerador usado pelas estratégias aleatórias (``None`` = módulo random)
+        self.rng = None
         self._ausentes: set[int] = set()
 
-    def remover_peca(self, peca: Peca):
-        self.mao.remove(peca)
+    def remover_peca(self, peca: Peca) -> int:
+        """Remove ``peca`` da mão e retorna a posição que ela ocupava."""
+        posicao = self.mao.index(peca)
+        del self.mao[posicao]
+        return posicao
+
+    def devolver_peca(self, peca: Peca, posicao: Optional[int] = None) -> None:
+        """Desfaz ``remover_peca`` recolocando ``peca`` em ``posicao``."""
+        if posicao is None:
+            self.mao.append(peca)
+        else:
+            self.mao.insert(posicao, peca)
 
     def possui_jogada(self, pontas: tuple[int, int]) -> bool:
-        return any(
-            peca.encaixa(pontas[0]) or peca.encaixa(pontas[1]) for peca in self.mao
-        )
+        m = mascara_pontas(pontas)
+        return any(peca.mascara & m for peca in self.mao)
 
     def jogadas_validas(self, pontas: tuple[int, int]) -> list[Peca]:
         if pontas[0] is None and pontas[1] is None:
             return self.mao.copy()
 
-        return [
-            peca
-            for peca in self.mao
-            if peca.encaixa(pontas[0]) or peca.encaixa(pontas[1])
-        ]
+        m = mascara_pontas(pontas)
+        return [peca for peca in self.mao if peca.mascara & m]
+
+
+    def registrar_passe(self, pontas: tuple[int, int]) -> set[int]:
+        """Guarda valores que comprovadamente não estão na mão.
 
+        Retorna os valores que passaram a ser conhecidos com este passe, para
+        uso em :meth:`desfazer_passe`.
+        """
+        novos = {pontas[0], pontas[1]} - self._ausentes
+        self._ausentes.update(novos)
+        return novos
 
-    def registrar_passe(self, pontas: tuple[int, int]) -> None:
-        """Guarda valores que comprovadamente não estão na mão."""
-        self._ausentes.update({pontas[0], pontas[1]})
+    def desfazer_passe(self, novos: set[int]) -> None:
+        self._ausentes.difference_update(novos)
 
     def valores_comprovadamente_ausentes(self) -> set[int]:
         return set(self._ausentes)
 
+    @instrumentar
     def escolher_peca(
         self,
         tabuleiro,
@@ -79,22 +98,109 @@ class Jogador:
 
 
 class MCTSJogador(Jogador):
-    """Jogador que utiliza a estratégia Monte Carlo para decidir a jogada."""
+    """Jogador que utiliza a estratégia Monte Carlo para decidir a jogada.
+
+    ``modo="flat"`` (padrão) dá o mesmo número de simulações a cada peça;
+    ``modo="uct"`` usa a busca em árvore de ``mcts_engine.escolher_peca_uct``,
+    reaproveitando a subárvore entre as vezes do jogador na rodada.
+
+    Com ``amostras=0`` (padrão) as simulações veem as mãos verdadeiras dos
+    adversários; ``amostras=k`` sorteia ``k`` distribuições das mãos ocultas
+    consistentes com a mesa e os passes e agrega a busca sobre elas.
+    ``processos > 1`` reparte as simulações do modo flat no pool de
+    processos compartilhado de ``mcts_engine``.
+
+    Com ``orcamento_ms`` cada decisão simula até esgotar esse tempo (ou até
+    uma jogada dominar), e ``simulations`` passa a ser só um teto opcional.
+    ``relatorios`` guarda, por decisão, as simulações feitas, o tempo e o
+    motivo da parada. Para orçamentos diferentes por cadeira use
+    ``functools.partial(MCTSJogador, orcamento_ms=...)`` em ``estrategias``.
+
+    ``transposicao=N`` (só com ``modo="uct"`` e informação perfeita) guarda
+    as estatísticas numa ``transposicao.TabelaTransposicao`` de ``N``
+    entradas, mantida entre as decisões da rodada, no lugar da árvore.
+    """
 
-    def __init__(self, nome: str, mao: Sequence[Peca], simulations: int = None):
+    def __init__(
+        self,
+        nome: str,
+        mao: Sequence[Peca],
+        simulations: int = None,
+        *,
+        vetorizado: bool = False,
+        modo: str = "flat",
+        amostras: int = 0,
+        processos: int = 0,
+        orcamento_ms: Optional[float] = None,
+        transposicao: int = 0,
+        politica_transposicao: str = "visitas",
+    ):
+        from mcts_engine import MODOS, ArvoreUCT
+        from transposicao import TabelaTransposicao
+
+        if modo not in MODOS:
+            raise ValueError(f"Modo MCTS inválido: {modo!r}")
+        if amostras < 0:
+            raise ValueError("amostras deve ser >= 0")
+        if orcamento_ms is not None and orcamento_ms <= 0:
+            raise ValueError("orcamento_ms deve ser positivo")
+        if transposicao and (modo != "uct" or amostras):
+            raise ValueError("transposicao requer modo='uct' sem amostras")
         super().__init__(nome, mao)
         self.simulations = simulations
+        self.vetorizado = vetorizado
+        self.modo = modo
+        self.amostras = amostras
+        self.processos = processos
+        self.orcamento_ms = orcamento_ms
+        self.tabela = (
+            TabelaTransposicao(transposicao, politica_transposicao) if transposicao else None
+        )
+        self.arvore = ArvoreUCT() if modo == "uct" and self.tabela is None else None
+        self.relatorios: List[dict] = []
 
+    @instrumentar
     def escolher_peca(self, tabuleiro, jogadores, **_):
-        from mcts_engine import escolher_peca_mcts, SIMULACOES_PADRAO
-
-        sims = self.simulations if self.simulations is not None else SIMULACOES_PADRAO
-        return escolher_peca_mcts(self, jogadores, tabuleiro, sims)
+        from mcts_engine import escolher_peca_mcts, escolher_peca_uct, SIMULACOES_PADRAO
+
+        sims = self.simulations
+        if sims is None and self.orcamento_ms is None:
+            sims = SIMULACOES_PADRAO
+        relatorio: dict = {}
+        if self.modo == "uct":
+            peca = escolher_peca_uct(
+                self,
+                jogadores,
+                tabuleiro,
+                sims,
+                arvore=self.arvore,
+                amostras=self.amostras,
+                orcamento_ms=self.orcamento_ms,
+                relatorio=relatorio,
+                tabela=self.tabela,
+                rng=self.rng,
+            )
+        else:
+            peca = escolher_peca_mcts(
+                self,
+                jogadores,
+                tabuleiro,
+                sims,
+                vetorizado=self.vetorizado,
+                amostras=self.amostras,
+                processos=self.processos,
+                orcamento_ms=self.orcamento_ms,
+                relatorio=relatorio,
+                rng=self.rng,
+            )
+        self.relatorios.append(relatorio)
+        return peca
 
 
 class CLIJogador(Jogador):
     """Jogador interativo via linha de comando."""
 
+    @instrumentar
     def escolher_peca(self, tabuleiro, jogadores, **_):
         jogadas = self.jogadas_validas(tabuleiro.obter_pontas())
         if not jogadas:
@@ -135,9 +241,9 @@ def escolher_peca_ga(jogador: "Jogador", tabuleiro, jogadores, pesos: Sequence[f
     def _avaliar(peca: Peca) -> float:
         score = 0.0
         if len(pesos) > 0:
-            score += pesos[0] * peca.valor_total()
+            score += pesos[0] * peca.soma
         if len(pesos) > 1:
-            score += pesos[1] * (1 if peca.is_duplo() else 0)
+            score += pesos[1] * (1 if peca.duplo else 0)
         if len(pesos) > 2:
             encaixa_ambas = peca.encaixa(pontas[0]) and peca.encaixa(pontas[1])
             score += pesos[2] * (1 if encaixa_ambas else 0)
@@ -175,6 +281,7 @@ class GAJogador(Jogador):
             self.w7,
         ) = self.pesos
 
+    @instrumentar
     def escolher_peca(self, tabuleiro, jogadores, **_):
         return escolher_peca_ga(self, tabuleiro, jogadores, self.pesos)
 
@@ -190,6 +297,7 @@ class RLJogador(Jogador):
         arquivo: str = "rl_qvalues.pkl",
         alpha: float = 0.1,
         epsilon: float = 0.1,
+        compacta: bool = False,
     ):
         from rl_engine import RLDominoStrategy
 
@@ -197,6 +305,7 @@ class RLJogador(Jogador):
             alpha=alpha,
             epsilon=epsilon,
             persistence_file=arquivo,
+            compacta=compacta,
         )
         super().__init__(nome, mao, estrategia=strategy)
 
@@ -205,3 +314,31 @@ class RLJogador(Jogador):
         estrategia = getattr(self, "estrategia", None)
         if hasattr(estrategia, "save"):
             estrategia.save()
+
+
+class RLLinearJogador(Jogador):
+    """Jogador com a função Q aproximada de ``rl_linear`` (requer ``numpy``)."""
+
+    def __init__(
+        self,
+        nome: str,
+        mao: Sequence[Peca],
+        *,
+        arquivo: str = "rl_linear.npz",
+        alpha: Optional[float] = None,
+        epsilon: float = 0.1,
+        modelo: str = "linear",
+    ):
+        from rl_linear import RLLinearStrategy
+
+        strategy = RLLinearStrategy(
+            alpha=alpha,
+            epsilon=epsilon,
+            persistence_file=arquivo,
+            modelo=modelo,
+        )
+        super().__init__(nome, mao, estrategia=strategy)
+
+    def salvar(self) -> None:
+        """Persiste os pesos em disco."""
+        self.estrategia.save()
@@ -1,18 +1,94 @@
-from dataclasses import dataclass
-
-@dataclass(frozen=True)
 class Peca:
-    lado1: int
-    lado2: int
+    """Peça de dominó imutável.
+
+    Existe uma única instância por orientação: ``Peca(a, b)`` devolve sempre
+    o mesmo objeto do registro, e ``inverter`` devolve a instância já criada
+    para ``(b, a)``. Soma, duplo e máscara de valores são calculados uma única
+    vez na criação. Apenas valores de 0 a 6 são aceitos (``ValueError``).
+    """
+
+    __slots__ = ("lado1", "lado2", "soma", "duplo", "mascara", "indice", "_invertida", "_hash")
+
+    _registro: dict = {}
+
+    def __new__(cls, lado1: int, lado2: int) -> "Peca":
+        peca = cls._registro.get((lado1, lado2))
+        if peca is None:
+            if not (0 <= lado1 <= 6 and 0 <= lado2 <= 6):
+                raise ValueError(f"Valores de peça devem estar entre 0 e 6: ({lado1}, {lado2})")
+            peca = cls._criar(lado1, lado2)
+        return peca
+
+    @classmethod
+    def _criar(cls, lado1: int, lado2: int) -> "Peca":
+        peca = object.__new__(cls)
+        definir = object.__setattr__
+        definir(peca, "lado1", lado1)
+        definir(peca, "lado2", lado2)
+        definir(peca, "soma", lado1 + lado2)
+        definir(peca, "duplo", lado1 == lado2)
+        definir(peca, "mascara", (1 << lado1) | (1 << lado2))
+        definir(peca, "indice", INDICE[min(lado1, lado2), max(lado1, lado2)])
+        definir(peca, "_hash", hash((lado1, lado2)))
+        cls._registro[(lado1, lado2)] = peca
+        invertida = cls._registro.get((lado2, lado1)) or cls._criar(lado2, lado1)
+        definir(peca, "_invertida", invertida)
+        return peca
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError(f"Peca é imutável: não é possível alterar {nome!r}")
+
+    def __delattr__(self, nome):
+        raise AttributeError(f"Peca é imutável: não é possível remover {nome!r}")
+
+    def __reduce__(self):
+        return (Peca, (self.lado1, self.lado2))
+
+    def __eq__(self, outra):
+        if self is outra:
+            return True
+        if isinstance(outra, Peca):
+            return self.lado1 == outra.lado1 and self.lado2 == outra.lado2
+        return NotImplemented
+
+    def __hash__(self) -> int:
+        return self._hash
+
+    def __repr__(self) -> str:
+        return f"Peca(lado1={self.lado1}, lado2={self.lado2})"
 
     def is_duplo(self) -> bool:
-        return self.lado1 == self.lado2
+        return self.duplo
 
     def valor_total(self) -> int:
-        return self.lado1 + self.lado2
+        return self.soma
 
     def inverter(self) -> "Peca":
-        return Peca(self.lado2, self.lado1)
+        return self._invertida
 
     def encaixa(self, valor: int) -> bool:
         return self.lado1 == valor or self.lado2 == valor
+
+
+# Registro das 28 peças ------------------------------------------------------
+# Índices 0‥27 na mesma ordem de ``motor_bitboard.PECAS``.
+INDICE: dict[tuple[int, int], int] = {
+    (i, j): k for k, (i, j) in enumerate((i, j) for i in range(7) for j in range(i, 7))
+}
+
+PECAS: tuple[Peca, ...] = tuple(Peca(i, j) for (i, j) in INDICE)
+"""As 28 peças canônicas (``lado1 <= lado2``) na ordem de distribuição."""
+
+PECAS_POR_VALOR: tuple[tuple[Peca, ...], ...] = tuple(
+    tuple(p for p in PECAS if p.encaixa(v)) for v in range(7)
+)
+"""Peças canônicas que contêm cada valor (0‑6)."""
+
+
+def mascara_pontas(pontas: tuple) -> int:
+    """Máscara dos valores das pontas, para testar ``peca.mascara & m``.
+
+    Pontas ``None`` (mesa vazia) não contribuem com nenhum bit.
+    """
+    esquerda, direita = pontas
+    return (0 if esquerda is None else 1 << esquerda) | (0 if direita is None else 1 << direita)
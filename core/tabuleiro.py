@@ -8,11 +8,82 @@ class Tabuleiro:
         self.pecas = deque()
         self.pontas = [None, None]
         self._passes_consecutivos = 0
+        # Contadores mantidos por ``jogar`` (um duplo conta uma vez por valor)
+        self._jogados = [0] * 7
+        self._restantes = [7] * 7
+        self.soma_pips = 0
+        self.mascara_fechados = 0
 
     def esta_vazio(self) -> bool:
         return not self.pecas
 
+    def copiar(self) -> "Tabuleiro":
+        """Cópia independente do tabuleiro, incluindo contadores e passes."""
+        copia = Tabuleiro.__new__(Tabuleiro)
+        copia.pecas = deque(self.pecas)
+        copia.pontas = self.pontas.copy()
+        copia._passes_consecutivos = self._passes_consecutivos
+        copia._jogados = self._jogados.copy()
+        copia._restantes = self._restantes.copy()
+        copia.soma_pips = self.soma_pips
+        copia.mascara_fechados = self.mascara_fechados
+        return copia
+
+    def _contabilizar(self, peca: Peca) -> None:
+        a, b = peca.lado1, peca.lado2
+        self._jogados[a] += 1
+        self._restantes[a] -= 1
+        if not self._restantes[a]:
+            self.mascara_fechados |= 1 << a
+        if b != a:
+            self._jogados[b] += 1
+            self._restantes[b] -= 1
+            if not self._restantes[b]:
+                self.mascara_fechados |= 1 << b
+        self.soma_pips += peca.soma
+
+    def _descontabilizar(self, peca: Peca) -> None:
+        a, b = peca.lado1, peca.lado2
+        self._jogados[a] -= 1
+        self._restantes[a] += 1
+        self.mascara_fechados &= ~(1 << a)
+        if b != a:
+            self._jogados[b] -= 1
+            self._restantes[b] += 1
+            self.mascara_fechados &= ~(1 << b)
+        self.soma_pips -= peca.soma
+
     def jogar(self, peca: Peca) -> str:
+        """Coloca ``peca`` e retorna o lado usado.
+
+        O lado retornado (``"inicial"``, ``"esquerda"`` ou ``"direita"``)
+        também serve de token para :meth:`desfazer`.
+        """
+        lado = self._colocar(peca)
+        self._contabilizar(peca)
+        return lado
+
+    def desfazer(self, lado: str) -> Peca:
+        """Retira a última peça colocada em ``lado`` e restaura as pontas.
+
+        Deve ser chamado na ordem inversa das jogadas (pilha). Retorna a peça
+        como estava orientada no tabuleiro.
+        """
+        if lado == "esquerda":
+            peca = self.pecas.popleft()
+            self.pontas[0] = peca.lado2
+        elif lado == "direita":
+            peca = self.pecas.pop()
+            self.pontas[1] = peca.lado1
+        elif lado == "inicial":
+            peca = self.pecas.pop()
+            self.pontas[0] = self.pontas[1] = None
+        else:
+            raise ValueError("Lado inválido")
+        self._descontabilizar(peca)
+        return peca
+
+    def _colocar(self, peca: Peca) -> str:
         if self.esta_vazio():
             self.pecas.append(peca)
             self.pontas[0], self.pontas[1] = peca.lado1, peca.lado2
@@ -61,11 +132,21 @@ class Tabuleiro:
     # ------------------------------------------------------------------
     # Novos utilitários
     # ------------------------------------------------------------------
-    def resetar_passes(self) -> None:
+    def resetar_passes(self) -> int:
+        """Zera os passes consecutivos e retorna o valor anterior."""
+        anterior = self._passes_consecutivos
         self._passes_consecutivos = 0
+        return anterior
 
-    def registrar_passe(self) -> None:
+    def registrar_passe(self) -> int:
+        """Conta um passe e retorna o valor anterior."""
+        anterior = self._passes_consecutivos
         self._passes_consecutivos += 1
+        return anterior
+
+    def restaurar_passes(self, anterior: int) -> None:
+        """Desfaz ``resetar_passes``/``registrar_passe`` com o valor retornado."""
+        self._passes_consecutivos = anterior
 
     @property
     def passes_consecutivos(self) -> int:
@@ -73,18 +154,8 @@ class Tabuleiro:
 
     def restantes_por_valor(self) -> list[int]:
         """Quantidade de peças restantes para cada valor (0‑6)."""
-        restantes = [7] * 7
-        for p in self.pecas:
-            restantes[p.lado1] -= 1
-            if p.lado2 != p.lado1:
-                restantes[p.lado2] -= 1
-        return restantes
+        return self._restantes.copy()
 
     def contagem_por_valor(self) -> list[int]:
         """Contagem já jogada para cada valor (0‑6)."""
-        usados = [0] * 7
-        for p in self.pecas:
-            usados[p.lado1] += 1
-            if p.lado2 != p.lado1:
-                usados[p.lado2] += 1
-        return usados
+        return self._jogados.copy()
@@ -0,0 +1,128 @@
+"""determinizacao.py - Amostragem das mãos ocultas
+
+Para quem decide, as mãos dos outros jogadores são desconhecidas: ele vê a
+mesa, o tamanho de cada mão e os valores que cada um comprovadamente não tem
+(``Jogador.valores_comprovadamente_ausentes``, registrados nos passes).
+``AmostradorMaos`` sorteia distribuições das peças ocultas consistentes com
+essa informação, todas com a mesma probabilidade e sem rejeição.
+
+As peças ocultas são agrupadas pelo conjunto de jogadores que podem tê-las.
+Uma programação dinâmica conta, para cada grupo e cada número de vagas
+restantes nas mãos, quantas distribuições completam a divisão; o sorteio
+escolhe quantas peças de cada grupo vão para cada mão proporcionalmente a
+essa contagem e embaralha o grupo para decidir quais.
+"""
+
+from __future__ import annotations
+
+import random
+from bisect import bisect_right
+from itertools import accumulate
+from math import factorial
+from typing import Dict, Iterator, List, Sequence, Tuple
+
+from core.jogador import Jogador
+from core.peca import PECAS, Peca
+from core.tabuleiro import Tabuleiro
+
+
+def _divisoes(m: int, vagas: Sequence[int]) -> Iterator[Tuple[int, ...]]:
+    """Tuplas ``x`` com ``sum(x) == m`` e ``0 <= x[i] <= vagas[i]``."""
+    if len(vagas) == 1:
+        if m <= vagas[0]:
+            yield (m,)
+        return
+    for x in range(min(m, vagas[0]) + 1):
+        for resto in _divisoes(m - x, vagas[1:]):
+            yield (x, *resto)
+
+
+def _multinomial(m: int, x: Sequence[int]) -> int:
+    n = factorial(m)
+    for xi in x:
+        n //= factorial(xi)
+    return n
+
+
+class AmostradorMaos:
+    """Sorteia as mãos dos outros jogadores do ponto de vista de ``observador``.
+
+    A contagem é feita uma vez na construção; cada :meth:`amostrar` custa
+    apenas uma busca binária e um embaralhamento por grupo de peças.
+    ``consistentes`` é o número de distribuições possíveis.
+    """
+
+    def __init__(self, observador: Jogador, jogadores: Sequence[Jogador], tabuleiro: Tabuleiro):
+        conhecidas = {p.indice for p in observador.mao}
+        conhecidas.update(p.indice for p in tabuleiro.pecas)
+        ocultas = [p for p in PECAS if p.indice not in conhecidas]
+
+        self._mao_observador = list(observador.mao)
+        self._posicoes = [k for k, j in enumerate(jogadores) if j.nome != observador.nome]
+        tamanhos = [len(jogadores[k].mao) for k in self._posicoes]
+        ausentes = [
+            sum(1 << v for v in jogadores[k].valores_comprovadamente_ausentes())
+            for k in self._posicoes
+        ]
+        sobra = len(ocultas) - sum(tamanhos)
+        if sobra < 0:
+            raise ValueError("As mãos têm mais peças do que as peças ocultas")
+        if sobra:
+            # peças fora do jogo: um monte sem restrições que não é devolvido
+            tamanhos.append(sobra)
+            ausentes.append(0)
+
+        grupos: Dict[int, List[Peca]] = {}
+        for p in ocultas:
+            permitidos = sum(1 << k for k, a in enumerate(ausentes) if not p.mascara & a)
+            grupos.setdefault(permitidos, []).append(p)
+        self._grupos = sorted(grupos.items())
+        self._n = len(jogadores)
+        self._tamanhos = tuple(tamanhos)
+        self._tabelas: Dict[tuple, tuple] = {}
+        self.consistentes = self._contar(0, self._tamanhos)
+        if not self.consistentes:
+            raise ValueError("Nenhuma distribuição é consistente com os passes registrados")
+
+    def _contar(self, k: int, restantes: Tuple[int, ...]) -> int:
+        if k == len(self._grupos):
+            return 0 if any(restantes) else 1
+        tabela = self._tabelas.get((k, restantes))
+        if tabela is None:
+            permitidos, pecas = self._grupos[k]
+            m = len(pecas)
+            vagas = [r if permitidos >> i & 1 else 0 for i, r in enumerate(restantes)]
+            opcoes, pesos = [], []
+            for x in _divisoes(m, vagas):
+                peso = _multinomial(m, x) * self._contar(
+                    k + 1, tuple(r - xi for r, xi in zip(restantes, x))
+                )
+                if peso:
+                    opcoes.append(x)
+                    pesos.append(peso)
+            tabela = self._tabelas[(k, restantes)] = (opcoes, list(accumulate(pesos)))
+        return tabela[1][-1] if tabela[1] else 0
+
+    def amostrar(self, rng=None) -> List[List[Peca]]:
+        """Uma distribuição: as mãos na ordem de ``jogadores``.
+
+        A mão do observador é a verdadeira; as demais são sorteadas.
+        """
+        rng = rng or random
+        sorteadas: List[List[Peca]] = [[] for _ in self._tamanhos]
+        restantes = self._tamanhos
+        for k, (_, pecas) in enumerate(self._grupos):
+            opcoes, acumulados = self._tabelas[(k, restantes)]
+            x = opcoes[bisect_right(acumulados, rng.randrange(acumulados[-1]))]
+            pecas = pecas.copy()
+            rng.shuffle(pecas)
+            inicio = 0
+            for mao, xi in zip(sorteadas, x):
+                mao.extend(pecas[inicio:inicio + xi])
+                inicio += xi
+            restantes = tuple(r - xi for r, xi in zip(restantes, x))
+
+        maos = [self._mao_observador.copy() for _ in range(self._n)]
+        for k, mao in zip(self._posicoes, sorteadas):
+            maos[k] = mao
+        return maos
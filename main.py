@@ -5,7 +5,10 @@
 from concurrent.futures import ProcessPoolExecutor
 
 from motor_de_jogo import simular_partida, salvar_resultado_em_csv
+from utilidades.historico import mesclar_shards
+from utilidades import instrumentacao
 from core.jogador import escolher_peca_ga, MCTSJogador, RLJogador
+from rl_engine import precarregar
 
 class SavingRLJogador(RLJogador):
     """Versão que guarda instâncias para posterior salvamento."""
@@ -46,18 +49,29 @@ n_games = 10
 
 
 def _run(_):
-    return simular_partida(estrategias=estrategias)["vencedor_partida"]
+    # "jogadas" é o mínimo para que o histórico tenha também o log de jogadas
+    return simular_partida(estrategias=estrategias, registro="jogadas")["vencedor_partida"]
 
 
 def main() -> None:
 
+    # Lê a tabela Q uma única vez; os workers a herdam no fork
+    if any(isinstance(e, type) and issubclass(e, RLJogador) for e in estrategias.values()):
+        precarregar()
+
     with ProcessPoolExecutor() as executor:
         resultados = list(executor.map(_run, range(n_games)))
+    # cada worker grava o próprio shard do histórico; une tudo ao final
+    mesclar_shards()
 
     vitoriasD1 = sum(r == "Dupla_1" for r in resultados)
     vitoriasD2 = sum(r == "Dupla_2" for r in resultados)
     print("Pontuação final das duplas:", vitoriasD1, vitoriasD2)
 
+    # Ative com DOMINO_INSTRUMENTAR=1 para medir a latência das decisões
+    if instrumentacao.ativo():
+        print(instrumentacao.resumo(instrumentacao.coletar()))
+
 
 if __name__ == "__main__":
     main()
@@ -6,77 +6,891 @@ Este módulo oferece a função ``escolher_peca_mcts`` utilizada pelo
 
 from __future__ import annotations
 
+import heapq
+import math
 import random
-from collections import deque
-from typing import List
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
 
 from core.jogador import Jogador
 from core.peca import Peca
 from core.tabuleiro import Tabuleiro
 from regras.game_logic import proximo_jogador_obj, determinar_vencedor_travamento
+from transposicao import TabelaTransposicao, hash_jogada, hash_posicao
 
 SIMULACOES_PADRAO = 30
+MODOS = ("flat", "uct")
+C_UCT = math.sqrt(2)
 
 
 def _copiar_estado(jogadores: List[Jogador], tabuleiro: Tabuleiro) -> tuple[List[Jogador], Tabuleiro]:
     """Cria cópias superficiais do estado atual do jogo."""
     jogadores_copia = [Jogador(j.nome, j.mao.copy()) for j in jogadores]
-    tab_copia = Tabuleiro()
-    tab_copia.pecas = deque(tabuleiro.pecas)
-    tab_copia.pontas = tabuleiro.pontas.copy()
-    return jogadores_copia, tab_copia
+    return jogadores_copia, tabuleiro.copiar()
 
 
-def _simular_jogo_random(jogadores: List[Jogador], jogador_atual: Jogador, tabuleiro: Tabuleiro) -> str:
-    """Executa jogadas aleatórias até o término da rodada e retorna o vencedor."""
+def _simular_jogo_random(
+    jogadores: List[Jogador],
+    jogador_atual: Jogador,
+    tabuleiro: Tabuleiro,
+    rng: Optional[random.Random] = None,
+) -> str:
+    """Executa jogadas aleatórias até o término da rodada e retorna o vencedor.
+
+    As jogadas são desfeitas antes de retornar (``Tabuleiro.desfazer`` e
+    ``Jogador.devolver_peca``), de modo que o mesmo estado pode ser reutilizado
+    por todas as simulações.
+    """
+    escolha = (rng or random).choice
+    desfazer = []
+    n = len(jogadores)
+    atual = jogadores.index(jogador_atual)
     passes = 0
-    while True:
-        jogadas = jogador_atual.jogadas_validas(tabuleiro.obter_pontas())
-        if jogadas:
-            p = random.choice(jogadas)
-            jogador_atual.remover_peca(p)
-            tabuleiro.jogar(p)
-            passes = 0
-            if not jogador_atual.mao:
-                return jogador_atual.nome
+    try:
+        while True:
+            jogador_atual = jogadores[atual]
+            jogadas = jogador_atual.jogadas_validas(tabuleiro.obter_pontas())
+            if jogadas:
+                p = escolha(jogadas)
+                posicao = jogador_atual.remover_peca(p)
+                desfazer.append((jogador_atual, p, posicao, tabuleiro.jogar(p)))
+                passes = 0
+                if not jogador_atual.mao:
+                    return jogador_atual.nome
+            else:
+                passes += 1
+                if passes == 4:
+                    vencedor, _ = determinar_vencedor_travamento(jogadores)
+                    return vencedor or ""
+            atual = (atual + 1) % n
+    finally:
+        for j, p, posicao, lado in reversed(desfazer):
+            tabuleiro.desfazer(lado)
+            j.devolver_peca(p, posicao)
+
+
+def _vitorias_vetorizadas(
+    jogador: Jogador,
+    jogadores: List[Jogador],
+    tabuleiro: Tabuleiro,
+    jogadas: List[Peca],
+    simulations: int,
+    rng,
+) -> list[int]:
+    """Executa em um único lote as ``simulations`` simulações de cada jogada.
+
+    Usa ``motor_vetorizado.simular_lote``; as regras são as mesmas de
+    ``_simular_jogo_random``. Retorna as vitórias de ``jogador`` por peça.
+    """
+    import numpy as np
+    from motor_vetorizado import INDICE, estado_de_objetos, simular_lote
+
+    maos, esquerda, direita = estado_de_objetos(jogadores, tabuleiro)
+    idx = jogadores.index(jogador)
+    n = len(jogadas)
+
+    lote = np.repeat(maos[None], n, axis=0)
+    pontas = np.empty((n, 2), dtype=np.int8)
+    for k, peca in enumerate(jogadas):
+        lote[k, idx, INDICE[(peca.lado1, peca.lado2)]] = False
+        a, b = peca.lado1, peca.lado2
+        if esquerda < 0:
+            pontas[k] = a, b
+        elif a == esquerda or b == esquerda:
+            pontas[k] = a + b - esquerda, direita
+        else:
+            pontas[k] = esquerda, a + b - direita
+
+    resultado = simular_lote(
+        np.repeat(lote, simulations, axis=0),
+        atual=(idx + 1) % len(jogadores),
+        esquerda=np.repeat(pontas[:, 0], simulations),
+        direita=np.repeat(pontas[:, 1], simulations),
+        rng=rng,
+    )
+    vitorias = (resultado["vencedor"] == idx).reshape(n, simulations).sum(axis=1)
+    # Quem bate com a própria jogada vence todas as simulações
+    vitorias[~lote[:, idx].any(axis=1)] = simulations
+    return vitorias.tolist()
+
+
+def _vitorias_simuladas(
+    jogador: Jogador,
+    jogadores: List[Jogador],
+    tabuleiro: Tabuleiro,
+    jogadas: List[Peca],
+    simulations: int,
+    rng,
+) -> list[int]:
+    """Vitórias de ``jogador`` em ``simulations`` simulações de cada jogada.
+
+    ``jogador``, ``jogadores`` e ``tabuleiro`` são a cópia de trabalho: cada
+    jogada e cada simulação são desfeitas sobre ela.
+    """
+    proximo = proximo_jogador_obj(jogadores, jogador)
+    resultado = []
+    for peca in jogadas:
+        posicao = jogador.remover_peca(peca)
+        lado = tabuleiro.jogar(peca)
+        if not jogador.mao:
+            vitorias = simulations
+        else:
+            vitorias = 0
+            for _ in range(simulations):
+                vencedor = _simular_jogo_random(jogadores, proximo, tabuleiro, rng)
+                if vencedor == jogador.nome:
+                    vitorias += 1
+        tabuleiro.desfazer(lado)
+        jogador.devolver_peca(peca, posicao)
+        resultado.append(vitorias)
+    return resultado
+
+
+def _partes(total: int, amostras: int) -> list[int]:
+    """Divide ``total`` em ``amostras`` partes inteiras quase iguais."""
+    return [total * (k + 1) // amostras - total * k // amostras for k in range(amostras)]
+
+
+def _vitorias_por_jogada(
+    nome: str,
+    jogadores: List[Jogador],
+    tabuleiro: Tabuleiro,
+    jogadas: List[Peca],
+    simulations: int,
+    amostrador,
+    amostras: int,
+    vetorizado: bool,
+    rng,
+) -> list[int]:
+    """Vitórias de cada jogada somadas sobre as distribuições sorteadas.
+
+    ``jogadores``/``tabuleiro`` são a cópia de trabalho. Sem ``amostrador``
+    as mãos são as que estão nela (informação perfeita).
+    """
+    j_copia = next(j for j in jogadores if j.nome == nome)
+    if amostrador is not None:
+        partes = _partes(simulations, min(amostras, simulations))
+    else:
+        partes = [simulations]
+
+    total = [0] * len(jogadas)
+    for sims in partes:
+        if amostrador is not None:
+            for j, mao in zip(jogadores, amostrador.amostrar(rng)):
+                j.mao = mao
+        if vetorizado:
+            vitorias = _vitorias_vetorizadas(
+                j_copia, jogadores, tabuleiro, jogadas, sims, (rng or random).getrandbits(64)
+            )
         else:
-            passes += 1
-            if passes == 4:
-                vencedor, _ = determinar_vencedor_travamento(jogadores)
-                return vencedor or ""
-        jogador_atual = proximo_jogador_obj(jogadores, jogador_atual)
+            vitorias = _vitorias_simuladas(j_copia, jogadores, tabuleiro, jogadas, sims, rng)
+        total = [t + v for t, v in zip(total, vitorias)]
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Paralelismo na raiz
+# ---------------------------------------------------------------------------
+BLOCOS_PARALELOS = 16
+"""Blocos de simulações por decisão paralela.
+
+É fixo, e não igual ao número de processos, para que o resultado dependa
+apenas da semente: cada bloco tem sua própria sequência aleatória.
+"""
+
+_POOL: Optional[ProcessPoolExecutor] = None
+_POOL_PROCESSOS = 0
+
+
+def pool_mcts(processos: int) -> ProcessPoolExecutor:
+    """Pool de processos compartilhado pelas decisões paralelas.
+
+    É criado na primeira chamada e reaproveitado por todas as decisões; só é
+    recriado quando alguém pede mais ``processos`` do que ele tem. Pedidos
+    menores usam o mesmo pool: cada decisão limita o próprio paralelismo
+    submetendo no máximo ``processos`` tarefas. :func:`encerrar_pool` o
+    descarta.
+    """
+    global _POOL, _POOL_PROCESSOS
+    if _POOL is None or _POOL_PROCESSOS < processos:
+        encerrar_pool()
+        _POOL = ProcessPoolExecutor(max_workers=processos)
+        _POOL_PROCESSOS = processos
+    return _POOL
+
+
+def encerrar_pool() -> None:
+    global _POOL, _POOL_PROCESSOS
+    pool, _POOL, _POOL_PROCESSOS = _POOL, None, 0
+    if pool is not None:
+        pool.shutdown(wait=True, cancel_futures=True)
+
 
+def _blocos_paralelos(blocos: list, nome: str, jogadores, tabuleiro, jogadas, amostrador, vetorizado) -> list[int]:
+    """Executa no processo de trabalho os ``(semente, simulações, amostras)`` de ``blocos``."""
+    total = [0] * len(jogadas)
+    for semente, sims, amostras in blocos:
+        vitorias = _vitorias_por_jogada(
+            nome, jogadores, tabuleiro, jogadas, sims, amostrador, amostras, vetorizado,
+            random.Random(semente),
+        )
+        total = [t + v for t, v in zip(total, vitorias)]
+    return total
 
-def escolher_peca_mcts(jogador: Jogador, jogadores: List[Jogador], tabuleiro: Tabuleiro, simulations: int = SIMULACOES_PADRAO) -> Peca:
-    """Seleciona a peça mais promissora para ``jogador`` via simulações Monte Carlo."""
+
+def _vitorias_paralelas(
+    nome: str,
+    jogadores: List[Jogador],
+    tabuleiro: Tabuleiro,
+    jogadas: List[Peca],
+    simulations: int,
+    amostrador,
+    amostras: int,
+    vetorizado: bool,
+    semente: int,
+    processos: int,
+) -> list[int]:
+    """Reparte as simulações (e as distribuições) em blocos e soma as vitórias.
+
+    Os blocos são agrupados em uma tarefa por processo, para que o estado
+    seja enviado uma única vez a cada um.
+    """
+    n = min(BLOCOS_PARALELOS, simulations, amostras or simulations)
+    blocos = [
+        (f"{semente}:{b}", sims, deals)
+        for b, (sims, deals) in enumerate(
+            zip(_partes(simulations, n), _partes(amostras, n) if amostras else [0] * n)
+        )
+    ]
+    pool = pool_mcts(processos)
+    futuros = [
+        pool.submit(
+            _blocos_paralelos,
+            blocos[k::processos],
+            nome,
+            jogadores,
+            tabuleiro,
+            jogadas,
+            amostrador,
+            vetorizado,
+        )
+        for k in range(min(processos, n))
+    ]
+    total = [0] * len(jogadas)
+    for futuro in futuros:
+        total = [t + v for t, v in zip(total, futuro.result())]
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Orçamento de tempo
+# ---------------------------------------------------------------------------
+DELTA_DOMINANCIA = 0.05
+"""Probabilidade de erro aceita ao parar cedo por uma jogada dominante."""
+
+MINIMO_DOMINANCIA = 8
+"""Simulações por jogada antes de testar a dominância."""
+
+PASSO_VETORIZADO = 16
+"""Simulações por jogada em cada lote do modo vetorizado com prazo."""
+
+BLOCO_UCT = 16
+"""Iterações UCT entre verificações do relógio."""
+
+
+def _prazo(orcamento_ms: Optional[float], prazo: Optional[float]) -> Optional[float]:
+    """Instante (``time.perf_counter``) em que a decisão deve terminar."""
+    if orcamento_ms is not None:
+        limite = time.perf_counter() + orcamento_ms / 1000
+        prazo = limite if prazo is None else min(prazo, limite)
+    return prazo
+
+
+def _dominante(vitorias: list[int], n: int) -> bool:
+    """Se a melhor taxa supera as demais mesmo com o erro de Hoeffding.
+
+    Com ``n`` simulações por jogada cada taxa está a menos de ``r`` da real
+    com probabilidade ``1 - DELTA_DOMINANCIA`` (para todas as jogadas juntas).
+    """
+    if n < MINIMO_DOMINANCIA or len(vitorias) < 2:
+        return False
+    primeiro, segundo = heapq.nlargest(2, vitorias)
+    r = math.sqrt(math.log(2 * len(vitorias) / DELTA_DOMINANCIA) / (2 * n))
+    return (primeiro - segundo) / n > 2 * r
+
+
+def _vitorias_ate_prazo(
+    nome: str,
+    jogadores: List[Jogador],
+    tabuleiro: Tabuleiro,
+    jogadas: List[Peca],
+    limite: Optional[int],
+    amostrador,
+    vetorizado: bool,
+    prazo: float,
+    rng,
+) -> tuple[list[int], int, str]:
+    """Simula rodadas de todas as jogadas até o prazo, a dominância ou ``limite``.
+
+    Cada rodada dá uma simulação a cada jogada (``PASSO_VETORIZADO`` no modo
+    vetorizado), numa distribuição nova quando há ``amostrador``. Retorna as
+    vitórias, as simulações por jogada e o motivo da parada.
+    """
+    passo = PASSO_VETORIZADO if vetorizado else 1
+    total = [0] * len(jogadas)
+    n = 0
+    while True:
+        sims = passo if limite is None else min(passo, limite - n)
+        vitorias = _vitorias_por_jogada(
+            nome, jogadores, tabuleiro, jogadas, sims, amostrador, 1, vetorizado, rng
+        )
+        total = [t + v for t, v in zip(total, vitorias)]
+        n += sims
+        if limite is not None and n >= limite:
+            return total, n, "limite"
+        if _dominante(total, n):
+            return total, n, "dominancia"
+        if time.perf_counter() >= prazo:
+            return total, n, "prazo"
+
+
+def escolher_peca_mcts(
+    jogador: Jogador,
+    jogadores: List[Jogador],
+    tabuleiro: Tabuleiro,
+    simulations: Optional[int] = SIMULACOES_PADRAO,
+    *,
+    vetorizado: bool = False,
+    amostras: int = 0,
+    processos: int = 0,
+    orcamento_ms: Optional[float] = None,
+    prazo: Optional[float] = None,
+    relatorio: Optional[dict] = None,
+    rng: Optional[random.Random] = None,
+) -> Peca:
+    """Seleciona a peça mais promissora para ``jogador`` via simulações Monte Carlo.
+
+    Com ``vetorizado=True`` as simulações de todas as peças candidatas são
+    executadas em um único lote por ``motor_vetorizado`` (requer ``numpy``).
+    ``rng`` substitui o módulo ``random`` como fonte de aleatoriedade.
+
+    Com ``amostras=0`` as simulações usam as mãos verdadeiras dos outros
+    jogadores (informação perfeita). Com ``amostras=k`` elas são sorteadas
+    ``k`` vezes por ``determinizacao.AmostradorMaos``; as ``simulations`` de
+    cada peça são repartidas entre as ``k`` distribuições e as vitórias
+    somadas.
+
+    Com ``processos > 1`` as simulações são repartidas em até
+    ``BLOCOS_PARALELOS`` blocos executados no pool de :func:`pool_mcts`.
+    Cada bloco recebe uma semente derivada de uma única extração de ``rng``,
+    então a escolha é a mesma para qualquer número de processos.
+
+    Com ``orcamento_ms`` (milissegundos para esta decisão) ou ``prazo``
+    (instante de ``time.perf_counter``) a busca é *anytime*: simula até o
+    tempo acabar, até uma jogada ser estatisticamente dominante ou até
+    ``simulations`` por jogada (``None`` = sem limite, só com orçamento de
+    tempo; sem ele levanta ``ValueError``), e devolve a melhor até ali. Com ``amostras`` cada rodada de simulações usa uma distribuição
+    nova. ``relatorio``, se informado, recebe ``simulacoes``, ``segundos`` e
+    ``motivo`` da parada.
+    """
+    inicio = time.perf_counter()
     jogadas = jogador.jogadas_validas(tabuleiro.obter_pontas())
     if not jogadas:
         raise ValueError("Jogador não possui jogadas válidas")
+    prazo = _prazo(orcamento_ms, prazo)
+    if simulations is None and prazo is None:
+        raise ValueError("simulations=None exige orcamento_ms ou prazo")
+    if prazo is not None and processos > 1:
+        raise ValueError("Orçamento de tempo não é suportado com processos > 1")
+
+    # Uma única cópia por decisão: cada simulação joga e desfaz sobre ela
+    jogadores_copia, tab_copia = _copiar_estado(jogadores, tabuleiro)
+    amostrador = None
+    if amostras:
+        from determinizacao import AmostradorMaos
+
+        amostrador = AmostradorMaos(jogador, jogadores, tabuleiro)
+
+    motivo = "limite"
+    if prazo is not None:
+        if len(jogadas) == 1:
+            total, n, motivo = [0], 0, "unica"
+        else:
+            total, n, motivo = _vitorias_ate_prazo(
+                jogador.nome,
+                jogadores_copia,
+                tab_copia,
+                jogadas,
+                simulations,
+                amostrador,
+                vetorizado,
+                prazo,
+                rng,
+            )
+    elif processos > 1 and len(jogadas) > 1:
+        n = simulations
+        total = _vitorias_paralelas(
+            jogador.nome,
+            jogadores_copia,
+            tab_copia,
+            jogadas,
+            simulations,
+            amostrador,
+            amostras,
+            vetorizado,
+            (rng or random).getrandbits(64),
+            processos,
+        )
+    else:
+        n = simulations
+        total = _vitorias_por_jogada(
+            jogador.nome,
+            jogadores_copia,
+            tab_copia,
+            jogadas,
+            simulations,
+            amostrador,
+            amostras,
+            vetorizado,
+            rng,
+        )
 
     melhor_peca = jogadas[0]
     melhor_taxa = -1.0
-
-    for peca in jogadas:
-        vitorias = 0
-        for _ in range(simulations):
-            jogadores_copia, tab_copia = _copiar_estado(jogadores, tabuleiro)
-            j_copia = next(j for j in jogadores_copia if j.nome == jogador.nome)
-            j_copia.remover_peca(peca)
-            tab_copia.jogar(peca)
-            if not j_copia.mao:
-                vitorias += 1
-            else:
-                proximo = proximo_jogador_obj(jogadores_copia, j_copia)
-                vencedor = _simular_jogo_random(jogadores_copia, proximo, tab_copia)
-                if vencedor == jogador.nome:
-                    vitorias += 1
-        taxa = vitorias / simulations
+    for peca, vitorias in zip(jogadas, total):
+        taxa = vitorias / n if n else 0.0
         if taxa > melhor_taxa:
             melhor_taxa = taxa
             melhor_peca = peca
 
+    if relatorio is not None:
+        relatorio.update(
+            simulacoes=n * len(jogadas),
+            segundos=time.perf_counter() - inicio,
+            motivo=motivo,
+        )
     return melhor_peca
 
 
+# ---------------------------------------------------------------------------
+# UCT
+# ---------------------------------------------------------------------------
+class _NoUCT:
+    """Nó da árvore: estado após ``acao`` (``None`` = passe), vez de ``jogador``.
+
+    ``vitorias`` é do ponto de vista da dupla de quem fez ``acao``, isto é,
+    do jogador anterior a ``jogador``.
+    """
+
+    __slots__ = (
+        "jogador", "pontas", "filhos", "pendentes", "visitas", "vitorias", "terminal", "disponivel"
+    )
+
+    def __init__(self, jogador: int, pontas: tuple = (None, None)):
+        self.jogador = jogador
+        self.pontas = pontas
+        self.filhos: Dict[Optional[Peca], _NoUCT] = {}
+        self.pendentes: Optional[list] = None
+        self.visitas = 0
+        self.vitorias = 0.0
+        # índice do vencedor (-1 = empate) quando a rodada acaba neste nó
+        self.terminal: Optional[int] = None
+        # iterações em que a ação do nó era legal (só na busca com amostras)
+        self.disponivel = 1
+
+
+def _recompensa(vencedor: int, jogador: int) -> float:
+    if vencedor < 0:
+        return 0.5
+    # parceiros estão a duas posições de distância na ordem da mesa
+    return 1.0 if (vencedor - jogador) % 2 == 0 else 0.0
+
+
+# Passos comuns às iterações de busca em árvore (``_iteracao_uct``,
+# ``_iteracao_ismcts`` e ``_iteracao_tt``): as jogadas são aplicadas e
+# desfeitas sobre ``jogadores``/``tabuleiro``, e o vencedor é o índice do
+# jogador em ``jogadores`` (-1 = empate).
+def _indice_vencedor(jogadores: List[Jogador], nome: Optional[str]) -> int:
+    return next((i for i, j in enumerate(jogadores) if j.nome == nome), -1)
+
+
+def _aplicar(jogador: Jogador, acao: Optional[Peca], tabuleiro: Tabuleiro, desfazer: list) -> None:
+    """Joga ``acao`` (``None`` = passe) e anota em ``desfazer`` como voltar."""
+    if acao is not None:
+        posicao = jogador.remover_peca(acao)
+        desfazer.append((jogador, acao, posicao, tabuleiro.jogar(acao)))
+
+
+def _desfazer(tabuleiro: Tabuleiro, desfazer: list) -> None:
+    for j, p, posicao, lado in reversed(desfazer):
+        tabuleiro.desfazer(lado)
+        j.devolver_peca(p, posicao)
+
+
+def _fim_da_rodada(jogadores: List[Jogador], vez: int, acao: Optional[Peca], passes: int) -> Optional[int]:
+    """Vencedor se a ação de ``jogadores[vez]`` encerrou a rodada, senão ``None``.
+
+    ``passes`` são os passes seguidos já contando esta ação.
+    """
+    if acao is not None and not jogadores[vez].mao:
+        return vez
+    if passes == len(jogadores):
+        nome, _ = determinar_vencedor_travamento(jogadores)
+        return _indice_vencedor(jogadores, nome)
+    return None
+
+
+def _simular_vencedor(jogadores: List[Jogador], vez: int, tabuleiro: Tabuleiro, rng) -> int:
+    """Simulação aleatória até o fim da rodada com ``jogadores[vez]`` para jogar."""
+    nome = _simular_jogo_random(jogadores, jogadores[vez], tabuleiro, rng)
+    return _indice_vencedor(jogadores, nome)
+
+
+def _retropropagar(caminho: List[_NoUCT], vencedor: int, n: int) -> None:
+    """Soma a visita e a recompensa aos nós de ``caminho`` (o primeiro é a raiz)."""
+    caminho[0].visitas += 1
+    for no in caminho[1:]:
+        no.visitas += 1
+        no.vitorias += _recompensa(vencedor, (no.jogador - 1) % n)
+
+
+def _iteracao_uct(raiz: _NoUCT, jogadores: List[Jogador], tabuleiro: Tabuleiro, rng, c: float) -> None:
+    """Seleção, expansão, simulação e retropropagação a partir de ``raiz``.
+
+    As jogadas são aplicadas e desfeitas sobre ``jogadores``/``tabuleiro``.
+    """
+    n = len(jogadores)
+    no = raiz
+    caminho = [raiz]
+    desfazer = []
+    passes = 0
+    try:
+        while no.terminal is None:
+            jogador = jogadores[no.jogador]
+            if no.pendentes is None:
+                no.pendentes = jogador.jogadas_validas(tabuleiro.obter_pontas()) or [None]
+            expandir = bool(no.pendentes)
+            if expandir:
+                acao = no.pendentes.pop(rng.randrange(len(no.pendentes)))
+            else:
+                log_n = math.log(no.visitas)
+                acao, melhor = None, -1.0
+                for a, filho in no.filhos.items():
+                    ucb = filho.vitorias / filho.visitas + c * math.sqrt(log_n / filho.visitas)
+                    if ucb > melhor:
+                        acao, melhor = a, ucb
+
+            _aplicar(jogador, acao, tabuleiro, desfazer)
+            passes = passes + 1 if acao is None else 0
+            if expandir:
+                filho = _NoUCT((no.jogador + 1) % n, tabuleiro.obter_pontas())
+                filho.terminal = _fim_da_rodada(jogadores, no.jogador, acao, passes)
+                no.filhos[acao] = filho
+            no = no.filhos[acao]
+            caminho.append(no)
+            if expandir:
+                break
+
+        vencedor = no.terminal
+        if vencedor is None:
+            vencedor = _simular_vencedor(jogadores, no.jogador, tabuleiro, rng)
+    finally:
+        _desfazer(tabuleiro, desfazer)
+    _retropropagar(caminho, vencedor, n)
+
+
+def _iteracao_ismcts(raiz: _NoUCT, jogadores: List[Jogador], tabuleiro: Tabuleiro, rng, c: float) -> None:
+    """Iteração de ``_iteracao_uct`` sobre uma árvore de conjuntos de informação.
+
+    As mãos de ``jogadores`` mudam entre iterações (são sorteadas), então as
+    jogadas legais de cada nó são recalculadas a cada passagem: expande-se
+    uma jogada legal ainda sem filho ou, se todas já têm, escolhe-se pelo
+    UCB1 entre os filhos legais usando quantas vezes cada um esteve
+    disponível no lugar das visitas do pai.
+    """
+    n = len(jogadores)
+    no = raiz
+    caminho = [raiz]
+    desfazer = []
+    passes = 0
+    try:
+        while True:
+            jogador = jogadores[no.jogador]
+            legais = jogador.jogadas_validas(tabuleiro.obter_pontas()) or [None]
+            # todo filho legal nesta distribuição conta como disponível,
+            # seja esta passagem de expansão ou de seleção
+            novas = []
+            for a in legais:
+                filho = no.filhos.get(a)
+                if filho is None:
+                    novas.append(a)
+                else:
+                    filho.disponivel += 1
+            if novas:
+                acao = novas[rng.randrange(len(novas))]
+                no.filhos[acao] = _NoUCT((no.jogador + 1) % n)
+            else:
+                acao, melhor = None, -1.0
+                for a in legais:
+                    filho = no.filhos[a]
+                    ucb = filho.vitorias / filho.visitas + c * math.sqrt(
+                        math.log(filho.disponivel) / filho.visitas
+                    )
+                    if ucb > melhor:
+                        acao, melhor = a, ucb
+
+            _aplicar(jogador, acao, tabuleiro, desfazer)
+            passes = passes + 1 if acao is None else 0
+            # o vencedor do travamento depende das mãos sorteadas: não é guardado
+            vencedor = _fim_da_rodada(jogadores, no.jogador, acao, passes)
+            no = no.filhos[acao]
+            no.pontas = tabuleiro.obter_pontas()
+            caminho.append(no)
+            if vencedor is not None or novas:
+                break
+
+        if vencedor is None:
+            vencedor = _simular_vencedor(jogadores, no.jogador, tabuleiro, rng)
+    finally:
+        _desfazer(tabuleiro, desfazer)
+    _retropropagar(caminho, vencedor, n)
+
+
+def _iteracao_tt(
+    tabela: TabelaTransposicao,
+    h: int,
+    vez: int,
+    jogadores: List[Jogador],
+    tabuleiro: Tabuleiro,
+    rng,
+    c: float,
+) -> None:
+    """Iteração de ``_iteracao_uct`` com as estatísticas na tabela de transposição.
+
+    Cada posição é identificada pelo hash de Zobrist (``h`` é o da raiz, com
+    ``jogadores[vez]`` para jogar), então caminhos que chegam à mesma posição
+    compartilham visitas e vitórias. Como numa tabela limitada o pai pode ter
+    sido substituído, o ``N`` do UCB1 é a soma das visitas dos filhos.
+    """
+    n = len(jogadores)
+    buscar, vitorias = tabela.buscar, tabela.vitorias
+    caminho = []
+    desfazer = []
+    passes = 0
+    try:
+        while True:
+            jogador = jogadores[vez]
+            pontas = tabuleiro.obter_pontas()
+            legais = jogador.jogadas_validas(pontas) or [None]
+            filhos = [hash_jogada(h, vez, n, a, pontas, passes) for a in legais]
+            entradas = [buscar(f) for f in filhos]
+            novas = [k for k, j in enumerate(entradas) if j < 0]
+            if novas:
+                k = novas[rng.randrange(len(novas))]
+            elif len(entradas) == 1:
+                k = 0
+            else:
+                visitas = [tabela.visitas[j] for j in entradas]
+                log_n = math.log(sum(visitas))
+                k, melhor = 0, -1.0
+                for i, j in enumerate(entradas):
+                    v = visitas[i]
+                    ucb = vitorias[j] / v + c * math.sqrt(log_n / v)
+                    if ucb > melhor:
+                        k, melhor = i, ucb
+
+            acao = legais[k]
+            _aplicar(jogador, acao, tabuleiro, desfazer)
+            passes = passes + 1 if acao is None else 0
+            vencedor = _fim_da_rodada(jogadores, vez, acao, passes)
+            h = filhos[k]
+            if novas:
+                tabela.inserir(h)
+            caminho.append((h, vez))
+            vez = (vez + 1) % n
+            if vencedor is not None or novas:
+                break
+
+        if vencedor is None:
+            vencedor = _simular_vencedor(jogadores, vez, tabuleiro, rng)
+    finally:
+        _desfazer(tabuleiro, desfazer)
+
+    for h, quem_jogou in caminho:
+        tabela.atualizar(h, _recompensa(vencedor, quem_jogou))
+
+
+class ArvoreUCT:
+    """Árvore guardada por um jogador entre suas vezes na mesma rodada.
+
+    Depois de cada decisão guarda o nó da jogada escolhida; na vez seguinte
+    desce por ele seguindo as jogadas que os outros fizeram (deduzidas das
+    peças que saíram de cada mão) e, se o nó existir, a busca continua a
+    partir dele com as estatísticas já acumuladas.
+    """
+
+    def __init__(self):
+        self._no: Optional[_NoUCT] = None
+        self._tabuleiro: Optional[Tabuleiro] = None
+        self._maos: list = []
+        self.reaproveitadas = 0
+
+    def raiz(self, indice: int, jogadores: List[Jogador], tabuleiro: Tabuleiro) -> _NoUCT:
+        no = self._no if tabuleiro is self._tabuleiro else None
+        self._no = None
+        while no is not None and no.jogador != indice:
+            jogou = self._maos[no.jogador].difference(jogadores[no.jogador].mao)
+            if len(jogou) > 1:
+                no = None
+                break
+            no = no.filhos.get(next(iter(jogou)) if jogou else None)
+        if no is None or no.pontas != tabuleiro.obter_pontas() or no.terminal is not None:
+            return _NoUCT(indice, tabuleiro.obter_pontas())
+        self.reaproveitadas += no.visitas
+        return no
+
+    def guardar(self, raiz: _NoUCT, escolha: Peca, jogadores: List[Jogador], tabuleiro: Tabuleiro) -> None:
+        self._no = raiz.filhos.get(escolha)
+        self._tabuleiro = tabuleiro
+        self._maos = [frozenset(j.mao) for j in jogadores]
+
+
+def _uct_dominante(visitas: list[int], restantes: float) -> bool:
+    """Se a jogada mais visitada não pode mais ser alcançada em ``restantes`` iterações."""
+    if len(visitas) < 2:
+        return False
+    primeiro, segundo = heapq.nlargest(2, visitas)
+    return primeiro - segundo > restantes
+
+
+def _blocos_uct(iteracoes: Optional[int]):
+    """Blocos de ``BLOCO_UCT`` iterações até ``iteracoes`` (``None`` = sem fim)."""
+    feitas = 0
+    while iteracoes is None or feitas < iteracoes:
+        bloco = BLOCO_UCT if iteracoes is None else min(BLOCO_UCT, iteracoes - feitas)
+        feitas += bloco
+        yield bloco
+
+
+def escolher_peca_uct(
+    jogador: Jogador,
+    jogadores: List[Jogador],
+    tabuleiro: Tabuleiro,
+    simulations: Optional[int] = SIMULACOES_PADRAO,
+    *,
+    arvore: Optional[ArvoreUCT] = None,
+    amostras: int = 0,
+    c: float = C_UCT,
+    orcamento_ms: Optional[float] = None,
+    prazo: Optional[float] = None,
+    relatorio: Optional[dict] = None,
+    tabela: Optional[TabelaTransposicao] = None,
+    rng: Optional[random.Random] = None,
+) -> Peca:
+    """Busca UCT (UCB1) com o mesmo orçamento de ``escolher_peca_mcts``.
+
+    São feitas ``simulations × nº de jogadas`` iterações, cada uma com uma
+    simulação aleatória, mas elas se concentram nas jogadas promissoras. A
+    recompensa é a vitória da dupla (parceiro incluso; empate vale 0,5).
+    Com ``arvore`` a subárvore da jogada anterior é reaproveitada.
+
+    Com ``amostras=k`` as mãos ocultas são sorteadas ``k`` vezes e as
+    iterações repartidas entre as distribuições, todas sobre uma única árvore
+    de conjuntos de informação (ISMCTS de observador único, ver
+    ``_iteracao_ismcts``).
+
+    Com ``orcamento_ms`` ou ``prazo`` as iterações seguem, em blocos de
+    ``BLOCO_UCT``, até o tempo acabar, até a jogada mais visitada não poder
+    mais ser alcançada no tempo restante (estimado pelo ritmo até ali) ou até
+    ``simulations × nº de jogadas`` (``None`` = sem limite, só com orçamento
+    de tempo, como em ``escolher_peca_mcts``); com ``amostras``
+    cada bloco usa uma distribuição nova. ``relatorio`` é preenchido como em
+    ``escolher_peca_mcts``.
+
+    Com ``tabela`` (``transposicao.TabelaTransposicao``) as estatísticas
+    ficam na tabela, por hash de posição, em vez de numa árvore: posições
+    transpostas são compartilhadas e, mantida entre as decisões, a tabela
+    também faz o papel de ``arvore``. Só vale com informação perfeita, pois
+    o hash inclui as mãos.
+    """
+    inicio = time.perf_counter()
+    jogadas = jogador.jogadas_validas(tabuleiro.obter_pontas())
+    if not jogadas:
+        raise ValueError("Jogador não possui jogadas válidas")
+    if tabela is not None and (amostras or arvore is not None):
+        raise ValueError("A tabela de transposição não se combina com amostras nem com arvore")
+    prazo = _prazo(orcamento_ms, prazo)
+    if simulations is None and prazo is None:
+        raise ValueError("simulations=None exige orcamento_ms ou prazo")
+    indice = jogadores.index(jogador)
+    raiz = arvore.raiz(indice, jogadores, tabuleiro) if arvore is not None else _NoUCT(indice)
+    feitas = 0
+    motivo = "limite"
+    if len(jogadas) == 1:
+        escolha = jogadas[0]
+        motivo = "unica"
+    else:
+        rng = rng or random
+        jogadores_copia, tab_copia = _copiar_estado(jogadores, tabuleiro)
+        iteracoes = None if simulations is None else simulations * len(jogadas)
+        amostrador = None
+        if amostras:
+            from determinizacao import AmostradorMaos
+
+            amostrador = AmostradorMaos(jogador, jogadores, tabuleiro)
+        if tabela is not None:
+            tabela.nova_geracao()
+            h_raiz = hash_posicao(jogadores_copia, tab_copia, indice)
+            pontas = tab_copia.obter_pontas()
+            h_filhos = [hash_jogada(h_raiz, indice, len(jogadores), p, pontas, 0) for p in jogadas]
+
+            def iterar(_raiz, js, tab, rng, c):
+                _iteracao_tt(tabela, h_raiz, indice, js, tab, rng, c)
+
+            def visitas_raiz() -> dict:
+                return {p: tabela.visitas_de(h) for p, h in zip(jogadas, h_filhos)}
+
+        else:
+            iterar = _iteracao_ismcts if amostrador is not None else _iteracao_uct
+
+            def visitas_raiz() -> dict:
+                return {p: f.visitas for p, f in raiz.filhos.items()}
+
+        if prazo is not None:
+            blocos = _blocos_uct(iteracoes)
+        elif amostrador is not None:
+            blocos = _partes(iteracoes, min(amostras, iteracoes))
+        else:
+            blocos = [iteracoes]
+
+        for bloco in blocos:
+            if amostrador is not None:
+                for j, mao in zip(jogadores_copia, amostrador.amostrar(rng)):
+                    j.mao = mao
+            for _ in range(bloco):
+                iterar(raiz, jogadores_copia, tab_copia, rng, c)
+            feitas += bloco
+            if prazo is not None:
+                agora = time.perf_counter()
+                if agora >= prazo:
+                    motivo = "prazo"
+                    break
+                restantes = feitas / (agora - inicio) * (prazo - agora)
+                if iteracoes is not None:
+                    restantes = min(restantes, iteracoes - feitas)
+                if _uct_dominante(list(visitas_raiz().values()), restantes):
+                    motivo = "dominancia"
+                    break
+        escolha = max(visitas_raiz().items(), key=lambda item: item[1])[0]
+    if arvore is not None:
+        arvore.guardar(raiz, escolha, jogadores, tabuleiro)
+    if relatorio is not None:
+        relatorio.update(
+            simulacoes=feitas, segundos=time.perf_counter() - inicio, motivo=motivo
+        )
+    return escolha
+
+
 if __name__ == "__main__":
     print("Este módulo fornece apenas a função de decisão e não deve ser executado diretamente.")
@@ -0,0 +1,276 @@
+"""motor_bitboard.py - motor de rodada compacto baseado em máscaras de bits
+
+As 28 peças são representadas pelos índices ``0``‥``27`` (na mesma ordem em
+que ``distribuir_jogadores`` as cria) e cada mão é um inteiro de 28 bits.
+Com as máscaras pré-calculadas por valor (``MASCARA_PIP``), as jogadas
+válidas de uma mão viram um único ``AND``.
+
+``simular_rodada_rapida`` segue as mesmas regras de ``regras.game_logic`` e
+de ``motor_de_jogo.simular_rodada`` (abertura com o maior duplo, tipos de
+batida e pontuação de travamento), mas sem criar objetos durante a rodada.
+"""
+
+from __future__ import annotations
+
+import random
+from collections import namedtuple
+from typing import Callable, List, Optional, Sequence
+
+from core.jogador import Jogador
+from core.peca import PECAS as PECAS_CANONICAS, Peca
+from regras.game_logic import PONTUACAO_POR_TIPO as PONTUACAO
+
+NOMES = ("J1", "J2", "J3", "J4")
+
+# Tabelas pré-calculadas ------------------------------------------------------
+PECAS: tuple[tuple[int, int], ...] = tuple(
+    (i, j) for i in range(7) for j in range(i, 7)
+)
+INDICE: dict[tuple[int, int], int] = {}
+for _idx, (_a, _b) in enumerate(PECAS):
+    INDICE[(_a, _b)] = _idx
+    INDICE[(_b, _a)] = _idx
+
+SOMA: tuple[int, ...] = tuple(a + b for a, b in PECAS)
+MASCARA_PIP: tuple[int, ...] = tuple(
+    sum(1 << i for i, (a, b) in enumerate(PECAS) if v in (a, b)) for v in range(7)
+)
+MASCARA_DUPLOS = sum(1 << i for i, (a, b) in enumerate(PECAS) if a == b)
+TODAS = (1 << len(PECAS)) - 1
+
+ResultadoRodada = namedtuple(
+    "ResultadoRodada", ["vencedor", "tipo_batida", "motivo_fim", "pontuacao"]
+)
+
+# ``politica(jogador, legais, esquerda, direita, maos) -> índice da peça``
+Politica = Callable[[int, int, int, int, List[int]], int]
+
+
+# ---------------------------------------------------------------------------
+# Conversões
+# ---------------------------------------------------------------------------
+def peca_para_indice(peca: Peca) -> int:
+    return INDICE[(peca.lado1, peca.lado2)]
+
+
+def indice_para_peca(indice: int) -> Peca:
+    return PECAS_CANONICAS[indice]
+
+
+def mao_para_mascara(mao: Sequence[Peca]) -> int:
+    mascara = 0
+    for p in mao:
+        mascara |= 1 << p.indice
+    return mascara
+
+
+def indices(mascara: int) -> list[int]:
+    """Índices dos bits ligados em ``mascara``, em ordem crescente."""
+    resultado = []
+    while mascara:
+        bit = mascara & -mascara
+        resultado.append(bit.bit_length() - 1)
+        mascara ^= bit
+    return resultado
+
+
+def mascara_para_pecas(mascara: int) -> list[Peca]:
+    """Peças de ``mascara`` na mesma ordem usada por ``distribuir_jogadores``."""
+    return [PECAS_CANONICAS[i] for i in indices(mascara)]
+
+
+def jogadores_para_maos(jogadores: Sequence[Jogador]) -> list[int]:
+    return [mao_para_mascara(j.mao) for j in jogadores]
+
+
+def maos_para_jogadores(maos: Sequence[int], nomes: Sequence[str] = NOMES) -> list[Jogador]:
+    return [Jogador(nome, mascara_para_pecas(m)) for nome, m in zip(nomes, maos)]
+
+
+def distribuir_maos(rng: random.Random | None = None) -> list[int]:
+    """Equivalente a ``distribuir_jogadores`` devolvendo apenas as máscaras.
+
+    Com o mesmo estado de ``rng`` as mãos sorteadas são idênticas às de
+    ``distribuir_jogadores``.
+    """
+    ordem = list(range(len(PECAS)))
+    (rng or random).shuffle(ordem)
+    maos = []
+    for k in range(4):
+        mascara = 0
+        for i in ordem[6 * k: 6 * k + 6]:
+            mascara |= 1 << i
+        maos.append(mascara)
+    return maos
+
+
+# ---------------------------------------------------------------------------
+# Regras
+# ---------------------------------------------------------------------------
+def jogadas_validas(mao: int, esquerda: int, direita: int) -> int:
+    """Máscara das peças de ``mao`` que encaixam nas pontas (``-1`` = vazio)."""
+    if esquerda < 0:
+        return mao
+    return mao & (MASCARA_PIP[esquerda] | MASCARA_PIP[direita])
+
+
+def tipo_batida(indice: int, esquerda: int, direita: int) -> str:
+    """Versão por índice de ``regras.game_logic.determinar_tipo_batida``."""
+    bit = 1 << indice
+    encaixa_esquerda = bool(MASCARA_PIP[esquerda] & bit)
+    encaixa_direita = bool(MASCARA_PIP[direita] & bit)
+    duplo = bool(MASCARA_DUPLOS & bit)
+    encaixa_ambas = encaixa_esquerda and encaixa_direita
+
+    if duplo and encaixa_ambas:
+        return "cruzada"
+    elif not duplo and encaixa_ambas and esquerda != direita:
+        return "la_e_lo"
+    elif duplo:
+        return "carroca"
+    elif encaixa_esquerda or encaixa_direita:
+        return "simples"
+    return "indefinido"
+
+
+def soma_mao(mao: int) -> int:
+    return sum(SOMA[i] for i in indices(mao))
+
+
+def vencedor_travamento(maos: Sequence[int]) -> tuple[int, int]:
+    """Versão por máscara de ``determinar_vencedor_travamento``.
+
+    Retorna ``(indice_vencedor, pontos)`` ou ``(-1, 0)`` em caso de empate.
+    """
+    somas = [soma_mao(m) for m in maos]
+    menor = min(somas)
+    if somas.count(menor) > 1:
+        return -1, 0
+    return somas.index(menor), PONTUACAO["travamento"]
+
+
+# ---------------------------------------------------------------------------
+# Políticas
+# ---------------------------------------------------------------------------
+def politica_primeira(_jogador, legais, _esquerda, _direita, _maos) -> int:
+    """Mesma escolha do ``Jogador`` sem estratégia: a primeira peça válida."""
+    return (legais & -legais).bit_length() - 1
+
+
+def politica_aleatoria(rng: random.Random | None = None) -> Politica:
+    escolha = (rng or random).choice
+
+    def _politica(_jogador, legais, _esquerda, _direita, _maos) -> int:
+        return escolha(indices(legais))
+
+    return _politica
+
+
+def politica_ga(pesos: Sequence[float]) -> Politica:
+    """Equivalente a ``core.jogador.escolher_peca_ga`` sobre máscaras."""
+    w0 = pesos[0] if len(pesos) > 0 else 0.0
+    w1 = pesos[1] if len(pesos) > 1 else 0.0
+    w2 = pesos[2] if len(pesos) > 2 else 0.0
+    base = [w0 * SOMA[i] + (w1 if MASCARA_DUPLOS >> i & 1 else 0.0) for i in range(len(PECAS))]
+
+    def _politica(_jogador, legais, esquerda, direita, _maos) -> int:
+        ambas = MASCARA_PIP[esquerda] & MASCARA_PIP[direita] if esquerda >= 0 else 0
+        melhor = -1
+        melhor_score = 0.0
+        for i in indices(legais):
+            score = base[i] + (w2 if ambas >> i & 1 else 0.0)
+            if melhor < 0 or score > melhor_score:
+                melhor, melhor_score = i, score
+        return melhor
+
+    return _politica
+
+
+# ---------------------------------------------------------------------------
+# Simulação
+# ---------------------------------------------------------------------------
+def simular_rodada_rapida(
+    maos: Sequence[int],
+    jogador_inicial: Optional[int] = None,
+    politicas: Politica | Sequence[Politica] = politica_primeira,
+) -> Optional[ResultadoRodada]:
+    """Simula uma rodada sobre as máscaras ``maos`` (J1‥J4).
+
+    ``politicas`` pode ser uma única política para todos os assentos ou uma
+    por assento. Sem ``jogador_inicial`` a rodada começa pelo maior duplo,
+    que é jogado obrigatoriamente; se nenhum duplo estiver nas mãos retorna
+    ``None`` (o equivalente ao ``{"erro": ...}`` de ``simular_rodada``).
+    As máscaras recebidas não são alteradas.
+    """
+    maos = list(maos)
+    if callable(politicas):
+        politicas = [politicas] * len(maos)
+
+    esquerda = direita = -1
+    passes = 0
+
+    if jogador_inicial is None:
+        abertura = -1
+        for j, m in enumerate(maos):
+            duplos = m & MASCARA_DUPLOS
+            if duplos:
+                maior = duplos.bit_length() - 1
+                if maior > abertura:
+                    abertura, jogador_inicial = maior, j
+        if abertura < 0:
+            return None
+        maos[jogador_inicial] ^= 1 << abertura
+        esquerda, direita = PECAS[abertura]
+        atual = (jogador_inicial + 1) % 4
+    else:
+        atual = jogador_inicial
+
+    while True:
+        mao = maos[atual]
+        legais = jogadas_validas(mao, esquerda, direita)
+        if legais:
+            if legais & (legais - 1):
+                escolha = politicas[atual](atual, legais, esquerda, direita, maos)
+            else:
+                escolha = legais.bit_length() - 1
+            mao ^= 1 << escolha
+            maos[atual] = mao
+            a, b = PECAS[escolha]
+            if esquerda < 0:
+                esquerda, direita = a, b
+            elif a == esquerda or b == esquerda:
+                esquerda = a + b - esquerda
+            else:
+                direita = a + b - direita
+            passes = 0
+            if not mao:
+                tipo = tipo_batida(escolha, esquerda, direita)
+                return ResultadoRodada(atual, tipo, "batida", PONTUACAO.get(tipo, 0))
+        else:
+            passes += 1
+            if passes == 4:
+                vencedor, pontos = vencedor_travamento(maos)
+                return ResultadoRodada(vencedor, "travamento", "travamento", pontos)
+        atual = (atual + 1) % 4
+
+
+def simular_partida_rapida(
+    politicas: Politica | Sequence[Politica] = politica_primeira,
+    pontos_para_vencer: int = 6,
+    rng: random.Random | None = None,
+) -> str:
+    """Simula uma partida até ``pontos_para_vencer`` e retorna a dupla vencedora.
+
+    Segue ``motor_de_jogo.simular_partida``: o vencedor de cada rodada abre a
+    seguinte e rodadas sem duplo são redistribuídas.
+    """
+    pontos = [0, 0]
+    jogador_inicial = None
+    while max(pontos) < pontos_para_vencer:
+        resultado = simular_rodada_rapida(distribuir_maos(rng), jogador_inicial, politicas)
+        if resultado is None:
+            continue
+        if resultado.vencedor >= 0:
+            jogador_inicial = resultado.vencedor
+            pontos[resultado.vencedor % 2] += resultado.pontuacao
+    return "Dupla_1" if pontos[0] >= pontos[1] else "Dupla_2"
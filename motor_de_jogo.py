@@ -1,22 +1,17 @@
 # domino_v3.py
 import random
-from collections import deque
 import csv
-import os
 import uuid
-import time
-from typing import List, Dict, Optional
-from core.peca import Peca
+from typing import List, Dict, Iterator, Optional
 from core.jogador import Jogador
-from core.tabuleiro import Tabuleiro
 from core.dupla import Dupla
-from utilidades.distribuicao import distribuir_jogadores
-from regras.game_logic import (
-    proximo_jogador_obj,
-    determinar_tipo_batida,
-    pontuacao_por_tipo,
-    determinar_vencedor_travamento,
-)
+from utilidades.distribuicao import nome_estrategia
+from utilidades.historico import HistoricoSink, sink_padrao
+from Jogo.partida import Partida
+from Jogo.rodada import REGISTROS, Rodada
+
+_SINK_PADRAO = object()
+
 
 def simular_rodada(
     jogadores: List[Jogador],
@@ -24,114 +19,29 @@ def simular_rodada(
     *,
     duplas: dict[str, Dupla] | None = None,
     pontos_para_vencer: int = 6,
+    registro: str = "completo",
 ):
-    tabuleiro = Tabuleiro()
-    historico = []
-    estados = []
-    ordem_jogada = 1
-    passes_por_jogador = {j.nome: 0 for j in jogadores}
-
-    # Identificar o jogador com o maior duplo (se não especificado)
-    if jogador_inicial_nome is None:
-        maior_duplo = -1
-        jogador_inicial = None
-        for j in jogadores:
-            for p in j.mao:
-                if p.is_duplo() and p.lado1 > maior_duplo:
-                    maior_duplo = p.lado1
-                    jogador_inicial = j
-        if not jogador_inicial:
-            return {"erro": "Nenhum duplo encontrado"}
-    else:
-        jogador_inicial = next(j for j in jogadores if j.nome == jogador_inicial_nome)
-
-    jogador_atual = jogador_inicial
-    motivo_fim = None
-    tipo_batida = None
-    vencedor_rodada = None
-    pontuacao_rodada = 0
-
-    while True:
-        jogadas = jogador_atual.jogadas_validas(tabuleiro.obter_pontas())
-
-        if jogadas:
-            if ordem_jogada == 1 and jogador_inicial_nome is None:
-                # Primeira jogada: deve ser o maior duplo
-                peca_jogada = next(p for p in jogador_atual.mao if p.is_duplo() and p.lado1 == maior_duplo)
-            else:
-                peca_jogada = jogador_atual.escolher_peca(
-                    tabuleiro,
-                    jogadores,
-                    duplas=duplas or {},
-                    passes_jog=passes_por_jogador,
-                    pontos_para_vencer=pontos_para_vencer,
-                )
-
-            jogador_atual.remover_peca(peca_jogada)
-            lado = tabuleiro.jogar(peca_jogada)
-            tipo = "batida" if not jogador_atual.mao else "jogada"
-
-            historico.append({
-                "ordem": ordem_jogada,
-                "jogador": jogador_atual.nome,
-                "tipo": tipo,
-                "peca": (peca_jogada.lado1, peca_jogada.lado2),
-                "lado": lado
-            })
-
-            tabuleiro.resetar_passes()
-
-            if not jogador_atual.mao:
-                tipo_batida = determinar_tipo_batida(peca_jogada, tabuleiro.obter_pontas())
-                pontuacao_rodada = pontuacao_por_tipo(tipo_batida)
-                vencedor_rodada = jogador_atual.nome
-                motivo_fim = "batida"
-
-        else:
-            historico.append({
-                "ordem": ordem_jogada,
-                "jogador": jogador_atual.nome,
-                "tipo": "passe"
-            })
-            passes_por_jogador[jogador_atual.nome] += 1
-            jogador_atual.registrar_passe(tabuleiro.obter_pontas())
-            tabuleiro.registrar_passe()
-
-            if tabuleiro.passes_consecutivos == 4:
-                vencedor_rodada, pontuacao_rodada = determinar_vencedor_travamento(jogadores)
-                motivo_fim = "travamento"
-                tipo_batida = "travamento"
-
-        estados.append({
-            "ordem_jogada": ordem_jogada,
-            "jogador": jogador_atual.nome,
-            "tipo": historico[-1]["tipo"],
-            "peca": historico[-1].get("peca"),
-            "lado": historico[-1].get("lado"),
-            "tabuleiro": [(p.lado1, p.lado2) for p in tabuleiro.pecas],
-            "maos": {j.nome: [(p.lado1, p.lado2) for p in j.mao] for j in jogadores},
-            "tipo_batida": tipo_batida,
-            "motivo_fim": motivo_fim,
-            "vencedor_rodada": vencedor_rodada,
-            "jogadas": historico,
-            "jogadas_disponiveis": [(p.lado1, p.lado2) for p in jogadas]
-        })
+    """Simula uma rodada completa.
 
-        if motivo_fim:
-            break
-
-        ordem_jogada += 1
-        jogador_atual = proximo_jogador_obj(jogadores, jogador_atual)
+    ``registro`` controla o quanto é guardado ao longo da rodada (ver
+    ``REGISTROS``). O dicionário retornado sempre contém ``inicio_rodada`` e
+    ``final``; ``jogadas`` é incluído a partir de ``"jogadas"`` e ``estados``
+    apenas em ``"completo"``.
+    """
+    if registro not in REGISTROS:
+        raise ValueError(f"Registro inválido: {registro!r}")
+    try:
+        rodada = Rodada(
+            jogadores,
+            jogador_inicial_nome,
+            duplas=duplas,
+            pontos_para_vencer=pontos_para_vencer,
+            registro=registro,
+        )
+    except ValueError as erro:  # nenhum duplo distribuído
+        return {"erro": str(erro)}
+    return rodada.jogar_ate_o_fim()
 
-    return {
-        "estados": estados,
-        "final": {
-            "tipo_batida": tipo_batida,
-            "motivo_fim": motivo_fim,
-            "vencedor_rodada": vencedor_rodada,
-            "pontuacao_rodada": pontuacao_rodada
-        }
-    }
 
 def salvar_resultado_em_csv(
     id_partida: str,
@@ -140,7 +50,11 @@ def salvar_resultado_em_csv(
     writer_rodadas: csv.writer,
     writer_jogadas: csv.writer,
 ) -> None:
-    """Registra o resultado de ``simular_partida`` em arquivos CSV já abertos."""
+    """Registra o resultado de ``simular_partida`` em arquivos CSV já abertos.
+
+    Rodadas simuladas com ``registro="nenhum"`` não possuem log de jogadas e
+    contribuem apenas com a linha em ``writer_rodadas``.
+    """
 
     writer_partidas.writerow(
         [
@@ -159,7 +73,7 @@ def salvar_resultado_em_csv(
             [
                 id_partida,
                 id_rodada,
-                rodada["estados"][0]["jogador"],
+                rodada["inicio_rodada"],
                 final["tipo_batida"],
                 final["motivo_fim"],
                 final["vencedor_rodada"],
@@ -171,21 +85,21 @@ def salvar_resultado_em_csv(
             ]
         )
 
-        for estado in rodada["estados"]:
-            if estado["tipo"] in ["jogada", "batida"] and estado["peca"]:
-                x, y = estado["peca"]
+        for jogada in rodada.get("jogadas", ()):
+            if jogada["tipo"] in ["jogada", "batida"] and jogada["peca"]:
+                x, y = jogada["peca"]
             else:
                 x, y = "", ""
             writer_jogadas.writerow(
                 [
                     id_partida,
                     id_rodada,
-                    estado["ordem_jogada"],
-                    estado["jogador"],
-                    estado["tipo"],
+                    jogada["ordem"],
+                    jogada["jogador"],
+                    jogada["tipo"],
                     x,
                     y,
-                    estado.get("lado", ""),
+                    jogada.get("lado", ""),
                 ]
             )
 
@@ -197,6 +111,9 @@ def simular_partida(
     pontos_para_vencer: int = 6,
     pontuacao_por_jogador: Optional[dict] = None,
     estrategias: Optional[dict] = None,
+    registro: str = "jogadas",
+    sink: Optional[HistoricoSink] = _SINK_PADRAO,
+    semente: Optional[int] = None,
 ) -> dict:
     """Simula uma partida completa.
 
@@ -211,94 +128,111 @@ def simular_partida(
         Mapeamento ``nome_jogador -> estratégia`` a ser utilizado na
         distribuição das peças. Valores podem ser callables, objetos com
         ``escolher_peca`` ou subclasses de :class:`Jogador`.
+    registro: str
+        Nível de registro repassado a ``simular_rodada``. O padrão
+        ``"jogadas"`` é o mínimo necessário para o histórico em CSV;
+        ``"completo"`` só é preciso para quem lê ``estados`` (visualizador).
+    sink: HistoricoSink | None
+        Destino do histórico (qualquer objeto com ``registrar``, como
+        :class:`HistoricoSink` ou ``HistoricoSQLite``). Por padrão usa
+        ``sink_padrao()`` do processo; ``None`` desliga a gravação. Ignorado
+        quando os três ``writer_*`` são informados.
+    semente: int | None
+        Torna a partida reproduzível: a distribuição das peças e as
+        estratégias aleatórias passam a usar ``random.Random(semente)`` em
+        vez do estado global do módulo ``random``.
     """
-    pasta_destino="historico_csv"
-    os.makedirs(pasta_destino, exist_ok=True)
-    
-    partidas_csv = open(os.path.join(pasta_destino, "partidas.csv"), mode="a", newline="")
-    rodadas_csv = open(os.path.join(pasta_destino, "rodadas.csv"), mode="a", newline="")
-    jogadas_csv = open(os.path.join(pasta_destino, "jogadas.csv"), mode="a", newline="")
-
-    writer_partidas = csv.writer(partidas_csv)
-    writer_rodadas = csv.writer(rodadas_csv)
-    writer_jogadas = csv.writer(jogadas_csv)
-
-    writer_partidas.writerow(["id_partida", "vencedor_partida", "pontuacao_J1", "pontuacao_J2", "pontuacao_J3", "pontuacao_J4"])
-    writer_rodadas.writerow(["id_partida", "id_rodada", "inicio_rodada", "tipo_batida", "motivo_fim", "vencedor_rodada", "pontuacao_rodada", "pontuacao_J1", "pontuacao_J2", "pontuacao_J3", "pontuacao_J4"])
-    writer_jogadas.writerow(["id_partida", "id_rodada", "ordem_jogada", "jogador", "tipo", "peca_x", "peca_y", "lado"])  
-
-    # Define as duplas
-    duplas = {
-        "Dupla_1": Dupla("Dupla_1", ["J1", "J3"]),
-        "Dupla_2": Dupla("Dupla_2", ["J2", "J4"])
-    }
-
-    pontuacao_por_jogador = {nome: 0 for dupla in duplas.values() for nome in dupla.jogadores}
-
-    rodadas = []
-    jogador_inicial_nome = None  # definido dinamicamente a cada rodada
-
-    # Loop principal
-    while max(dupla.pontuacao for dupla in duplas.values()) < pontos_para_vencer:
-        jogadores = distribuir_jogadores(estrategias)  # retorna List[Jogador]
-        rodada = simular_rodada(
-            jogadores,
-            jogador_inicial_nome=jogador_inicial_nome,
-            duplas=duplas,
-            pontos_para_vencer=pontos_para_vencer,
-        )
 
-        if "erro" in rodada:
-            continue  # refaz a rodada
-
-        rodadas.append(rodada)
-        final = rodada["final"]
-        jogador_vencedor = final["vencedor_rodada"]
-        pontos = final["pontuacao_rodada"]
-
-        if jogador_vencedor:
-            jogador_inicial_nome = jogador_vencedor  # define início da próxima rodada
-
-            if duplas["Dupla_1"].contem_jogador(jogador_vencedor):
-                duplas["Dupla_1"].adicionar_pontos(pontos)
-            else:
-                duplas["Dupla_2"].adicionar_pontos(pontos)
-
-            pontuacao_por_jogador[jogador_vencedor] += pontos
+    partida = Partida(
+        pontos_para_vencer=pontos_para_vencer,
+        estrategias=estrategias,
+        registro=registro,
+        rng=None if semente is None else random.Random(semente),
+    )
+    partida.jogar_ate_o_fim()
+    return _encerrar_partida(
+        partida, estrategias, sink, (writer_partidas, writer_rodadas, writer_jogadas)
+    )
 
-        # Permite que estratégias aprendizes atualizem seus parâmetros
-        for j in jogadores:
-            estrategia = getattr(j, "estrategia", None)
-            if hasattr(estrategia, "notificar_resultado"):
-                estrategia.notificar_resultado(j.nome, jogador_vencedor)
 
-    vencedor_partida = max(duplas.items(), key=lambda item: item[1].pontuacao)[0]
+def _encerrar_partida(partida: Partida, estrategias, sink, writers=(None, None, None)) -> dict:
+    """Grava a partida terminada e monta o retorno de ``simular_partida``."""
+    vencedor_partida = partida.dupla_vencedora()
+    pontuacao_por_jogador = partida.pontuacao_por_jogador
+    rodadas = partida.rodadas
 
     resultado = {
        "vencedor_partida": vencedor_partida,
        "pontuacao_por_jogador": pontuacao_por_jogador,
-       "rodadas": rodadas
+       "rodadas": rodadas,
+       "estrategias": {
+           nome: nome_estrategia((estrategias or {}).get(nome))
+           for nome in pontuacao_por_jogador
+       },
     }    
 
     id_partida = str(uuid.uuid4())
-    salvar_resultado_em_csv(
-        id_partida,
-        resultado,
-        writer_partidas,
-        writer_rodadas,
-        writer_jogadas,
-    )
-
-    partidas_csv.close()
-    rodadas_csv.close()
-    jogadas_csv.close()
-
+    if all(w is not None for w in writers):
+        salvar_resultado_em_csv(id_partida, resultado, *writers)
+    else:
+        if sink is _SINK_PADRAO:
+            sink = sink_padrao()
+        if sink is not None:
+            sink.registrar(id_partida, resultado)
 
     return {
-        "duplas": {nome: dupla.pontuacao for nome, dupla in duplas.items()},
+        "duplas": {nome: dupla.pontuacao for nome, dupla in partida.duplas.items()},
         "pontuacao_por_jogador": pontuacao_por_jogador,
         "rodadas": rodadas,
         "vencedor_partida": vencedor_partida
     }
 
+
+def simular_partida_em_fluxo(
+    pontos_para_vencer: int = 6,
+    estrategias: Optional[dict] = None,
+    sink: Optional[HistoricoSink] = _SINK_PADRAO,
+    semente: Optional[int] = None,
+) -> Iterator[dict]:
+    """Versão geradora de ``simular_partida`` para acompanhar a partida ao vivo.
+
+    Produz um evento por jogada, assim que ela é feita::
+
+        {"evento": "estado", "rodada": n, "estado": {...}}   # formato de ``estados``
+        {"evento": "rodada", "rodada": n, "final": {...}, "placar": {...}}
+        {"evento": "fim", "vencedor_partida": ..., "placar": {...}}
+
+    Os retratos não são acumulados (a partida usa registro ``"jogadas"``) e
+    não trazem o log ``jogadas`` da rodada, então nem a memória nem o tamanho
+    de cada evento crescem com o número de jogadas já transmitidas. Ao
+    final a partida é gravada em ``sink`` como em ``simular_partida``;
+    ``semente`` tem o mesmo efeito de lá.
+    """
+    partida = Partida(
+        pontos_para_vencer=pontos_para_vencer,
+        estrategias=estrategias,
+        registro="jogadas",
+        rng=None if semente is None else random.Random(semente),
+    )
+    while not partida.venceu():
+        rodada = partida.nova_rodada()
+        n = len(partida.rodadas)
+        while not rodada.terminada:
+            rodada.passo()
+            yield {"evento": "estado", "rodada": n, "estado": rodada.retrato(com_jogadas=False)}
+        final = partida.encerrar_rodada(rodada)["final"]
+        yield {
+            "evento": "rodada",
+            "rodada": n,
+            "final": final,
+            "placar": {nome: d.pontuacao for nome, d in partida.duplas.items()},
+        }
+
+    resultado = _encerrar_partida(partida, estrategias, sink)
+    yield {
+        "evento": "fim",
+        "vencedor_partida": resultado["vencedor_partida"],
+        "placar": resultado["duplas"],
+    }
+
 pontuacao_jogadores = {"J1": 0, "J2": 0, "J3": 0, "J4": 0}
@@ -22,10 +22,10 @@ def simulate_round_v2(_pesos: List[float]) -> int:
     Caso a rodada termine empatada (travamento), ``-1`` é retornado.
     Os pesos são aplicados às jogadas de ``J1`` e ``J3``.
     """
-    estrategia_ga = lambda j, t, js: escolher_peca_ga(j, t, js, _pesos)
+    estrategia_ga = lambda j, t, js, **_: escolher_peca_ga(j, t, js, _pesos)
     estrategias = {"J1": estrategia_ga, "J3": estrategia_ga}
     jogadores = distribuir_jogadores(estrategias)
-    resultado = simular_rodada(jogadores)
+    resultado = simular_rodada(jogadores, registro="nenhum")
     vencedor = resultado["final"]["vencedor_rodada"]
     nomes = ["J1", "J2", "J3", "J4"]
     return nomes.index(vencedor) if vencedor in nomes else -1
@@ -36,11 +36,13 @@ def run_match_v2(_pesos: List[float], n_games: int = 120) -> int:
 
     Os pesos são aplicados às jogadas de ``J1`` e ``J3``.
     """
-    estrategia_ga = lambda j, t, js: escolher_peca_ga(j, t, js, _pesos)
+    estrategia_ga = lambda j, t, js, **_: escolher_peca_ga(j, t, js, _pesos)
     estrategias = {"J1": estrategia_ga, "J3": estrategia_ga}
     vitorias = 0
     for _ in range(n_games):
-        resultado = simular_partida(estrategias=estrategias)
+        resultado = simular_partida(
+            estrategias=estrategias, registro="nenhum", sink=None
+        )
         if resultado["vencedor_partida"] == "Dupla_1":
             vitorias += 1
     return vitorias
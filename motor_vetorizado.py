@@ -0,0 +1,204 @@
+"""motor_vetorizado.py - simulação em lote de rodadas com política aleatória
+
+Avança milhares de rodadas independentes em paralelo usando arrays NumPy:
+
+- ``maos``: ``bool[N, 4, 28]`` (peça ``i`` na mão do jogador ``j``)
+- ``esquerda``/``direita``: ``int8[N]`` com as pontas (``-1`` = mesa vazia)
+- ``passes``: ``int8[N]`` com os passes consecutivos
+- ``atual``: ``int8[N]`` com o jogador da vez (0‥3 = J1‥J4)
+
+A cada passo todas as rodadas ainda em andamento escolhem uma peça válida
+uniformemente ao acaso (ou passam). As regras e a indexação das peças são as
+mesmas de ``motor_bitboard``.
+
+Requer ``numpy``.
+"""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+import numpy as np
+
+from core.jogador import Jogador
+from core.tabuleiro import Tabuleiro
+from motor_bitboard import PECAS, INDICE, PONTUACAO
+
+N_PECAS = len(PECAS)
+VAZIO = 7  # linha extra das tabelas usada para a mesa vazia
+
+TIPOS = ("indefinido", "simples", "carroca", "la_e_lo", "cruzada", "travamento")
+_TIPO = {nome: codigo for codigo, nome in enumerate(TIPOS)}
+PONTOS_POR_TIPO = np.array([PONTUACAO.get(t, 0) for t in TIPOS], dtype=np.int8)
+
+LADO_A = np.array([a for a, _ in PECAS], dtype=np.int8)
+LADO_B = np.array([b for _, b in PECAS], dtype=np.int8)
+SOMA = (LADO_A + LADO_B).astype(np.int16)
+DUPLO = LADO_A == LADO_B
+# Índice de cada duplo por valor: INDICE_DUPLO[v] é a peça (v, v)
+INDICE_DUPLO = np.array([INDICE[(v, v)] for v in range(7)], dtype=np.int8)
+
+# CONTEM[v, i]: peça i possui o valor v (linha VAZIO sempre False)
+CONTEM = np.zeros((8, N_PECAS), dtype=bool)
+for _i, (_a, _b) in enumerate(PECAS):
+    CONTEM[_a, _i] = CONTEM[_b, _i] = True
+
+# ENCAIXA[e, d, i]: peça i pode ser jogada com pontas (e, d)
+ENCAIXA = CONTEM[:, None, :] | CONTEM[None, :, :]
+ENCAIXA[VAZIO, VAZIO, :] = True
+
+
+def _rng(rng) -> np.random.Generator:
+    if isinstance(rng, np.random.Generator):
+        return rng
+    return np.random.default_rng(rng)
+
+
+def distribuir_lote(n: int, rng=None) -> np.ndarray:
+    """Sorteia ``n`` distribuições de 6 peças para cada um dos 4 jogadores."""
+    rng = _rng(rng)
+    ordem = rng.random((n, N_PECAS)).argsort(axis=1)[:, :24]
+    maos = np.zeros((n, 4, N_PECAS), dtype=bool)
+    linhas = np.repeat(np.arange(n), 24)
+    jogadores = np.tile(np.repeat(np.arange(4), 6), n)
+    maos[linhas, jogadores, ordem.ravel()] = True
+    return maos
+
+
+def estado_de_objetos(
+    jogadores: Sequence[Jogador], tabuleiro: Tabuleiro
+) -> tuple[np.ndarray, int, int]:
+    """Converte ``jogadores``/``tabuleiro`` em ``(maos[4, 28], esquerda, direita)``."""
+    maos = np.zeros((len(jogadores), N_PECAS), dtype=bool)
+    for j, jogador in enumerate(jogadores):
+        for p in jogador.mao:
+            maos[j, INDICE[(p.lado1, p.lado2)]] = True
+    esquerda, direita = tabuleiro.obter_pontas()
+    return (
+        maos,
+        -1 if esquerda is None else esquerda,
+        -1 if direita is None else direita,
+    )
+
+
+def simular_lote(
+    maos: np.ndarray,
+    atual: np.ndarray | int,
+    esquerda: np.ndarray | int = -1,
+    direita: np.ndarray | int = -1,
+    passes: np.ndarray | int = 0,
+    rng=None,
+) -> dict[str, np.ndarray]:
+    """Joga aleatoriamente cada rodada de ``maos`` até o fim.
+
+    Escalares em ``atual``/``esquerda``/``direita``/``passes`` valem para todo
+    o lote. ``maos`` é alterado no lugar e termina com as peças que sobraram.
+
+    Retorna arrays ``vencedor`` (``-1`` em empate de travamento), ``tipo``
+    (código em ``TIPOS``) e ``pontos``, todos de tamanho ``N``.
+    """
+    rng = _rng(rng)
+    n = maos.shape[0]
+    atual = np.broadcast_to(np.asarray(atual, dtype=np.int8), (n,)).copy()
+    esq = np.broadcast_to(np.asarray(esquerda, dtype=np.int8), (n,)).copy()
+    dir_ = np.broadcast_to(np.asarray(direita, dtype=np.int8), (n,)).copy()
+    esq[esq < 0] = VAZIO
+    dir_[dir_ < 0] = VAZIO
+    passes = np.broadcast_to(np.asarray(passes, dtype=np.int8), (n,)).copy()
+
+    vencedor = np.full(n, -1, dtype=np.int8)
+    tipo = np.zeros(n, dtype=np.int8)
+    fim = np.zeros(n, dtype=bool)
+    ativos = np.arange(n)
+
+    while ativos.size:
+        jog = atual[ativos]
+        e, d = esq[ativos], dir_[ativos]
+        legais = maos[ativos, jog] & ENCAIXA[e, d]
+        pode = legais.any(axis=1)
+
+        # Jogadas ---------------------------------------------------------
+        linhas = ativos[pode]
+        if linhas.size:
+            sorteio = rng.random((linhas.size, N_PECAS))
+            sorteio[~legais[pode]] = -1.0
+            escolha = sorteio.argmax(axis=1)
+            jl = jog[pode]
+            maos[linhas, jl, escolha] = False
+
+            a, b = LADO_A[escolha], LADO_B[escolha]
+            el, dl = e[pode], d[pode]
+            vazio = el == VAZIO
+            pela_esquerda = ~vazio & ((a == el) | (b == el))
+            pela_direita = ~vazio & ~pela_esquerda
+            el = np.where(vazio, a, np.where(pela_esquerda, a + b - el, el))
+            dl = np.where(vazio, b, np.where(pela_direita, a + b - dl, dl))
+            esq[linhas], dir_[linhas] = el, dl
+            passes[linhas] = 0
+
+            bateu = ~maos[linhas, jl].any(axis=1)
+            if bateu.any():
+                lb, pb = linhas[bateu], escolha[bateu]
+                eb, db = el[bateu], dl[bateu]
+                encaixa_e = CONTEM[eb, pb]
+                encaixa_d = CONTEM[db, pb]
+                ambas = encaixa_e & encaixa_d
+                duplo = DUPLO[pb]
+                codigo = np.select(
+                    [duplo & ambas, ~duplo & ambas & (eb != db), duplo, encaixa_e | encaixa_d],
+                    [_TIPO["cruzada"], _TIPO["la_e_lo"], _TIPO["carroca"], _TIPO["simples"]],
+                    _TIPO["indefinido"],
+                )
+                tipo[lb] = codigo
+                vencedor[lb] = jl[bateu]
+                fim[lb] = True
+
+        # Passes ----------------------------------------------------------
+        linhas_passe = ativos[~pode]
+        if linhas_passe.size:
+            passes[linhas_passe] += 1
+            travou = linhas_passe[passes[linhas_passe] == 4]
+            if travou.size:
+                somas = maos[travou].astype(np.int16) @ SOMA
+                menor = somas.min(axis=1, keepdims=True)
+                unico = (somas == menor).sum(axis=1) == 1
+                vencedor[travou] = np.where(unico, somas.argmin(axis=1), -1)
+                tipo[travou] = _TIPO["travamento"]
+                fim[travou] = True
+
+        atual[ativos] = (jog + 1) % 4
+        ativos = ativos[~fim[ativos]]
+
+    pontos = PONTOS_POR_TIPO[tipo]
+    pontos[vencedor < 0] = 0
+    return {"vencedor": vencedor, "tipo": tipo, "pontos": pontos}
+
+
+def rodadas_aleatorias(n: int, rng=None) -> dict[str, np.ndarray]:
+    """Distribui e joga ``n`` rodadas aleatórias abertas pelo maior duplo.
+
+    Distribuições sem nenhum duplo são descartadas, como em
+    ``simular_partida``; ``inicio`` indica quem abriu cada rodada.
+    """
+    rng = _rng(rng)
+    maos = distribuir_lote(n, rng)
+    duplos = maos[:, :, INDICE_DUPLO]  # [N, 4, 7]
+    com_duplo = duplos.any(axis=(1, 2))
+    maos, duplos = maos[com_duplo], duplos[com_duplo]
+
+    # maior valor de duplo presente e quem o possui
+    presente = duplos.any(axis=1)  # [N, 7]
+    maior = 6 - presente[:, ::-1].argmax(axis=1)
+    linhas = np.arange(maos.shape[0])
+    inicio = duplos[linhas, :, maior].argmax(axis=1)
+    maos[linhas, inicio, INDICE_DUPLO[maior]] = False
+
+    resultado = simular_lote(
+        maos,
+        atual=(inicio + 1) % 4,
+        esquerda=maior,
+        direita=maior,
+        rng=rng,
+    )
+    resultado["inicio"] = inicio.astype(np.int8)
+    return resultado
@@ -1,15 +1,85 @@
 from __future__ import annotations
 
+import gc
 import os
-import pickle
 import random
-from collections import defaultdict
-from typing import Tuple, Sequence
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Tuple, Sequence
 
 from core.jogador import Jogador
 from core.tabuleiro import Tabuleiro
 from core.peca import Peca
 from core.dupla import Dupla
+from rl_persistencia import PersistenciaQ
+from rl_tabela import TabelaQCompacta, desempacotar_estado, empacotar_estado
+
+ARQUIVO_PADRAO = "rl_qvalues.pkl"
+
+# ---------------------------------------------------------------------------
+# Registro de tabelas Q por arquivo
+# ---------------------------------------------------------------------------
+# Cada arquivo é lido uma única vez por processo e a mesma tabela é usada por
+# todas as estratégias que apontam para ele. Processos criados por ``fork``
+# depois de ``precarregar`` herdam a tabela sem relê-la.
+_TABELAS: Dict[tuple[str, bool], defaultdict | TabelaQCompacta] = {}
+# Chaves alteradas desde o último ``save`` de cada tabela compartilhada
+_ALTERADAS: Dict[tuple[str, bool], set] = {}
+_TRAVA_TABELAS = threading.Lock()
+
+
+def _ler_tabela(path: str, compacta: bool = False) -> defaultdict | TabelaQCompacta:
+    """Lê a foto e o log de ``path`` (ver :mod:`rl_persistencia`)."""
+    destino = TabelaQCompacta() if compacta else defaultdict(float)
+    return PersistenciaQ(path).carregar(destino)
+
+
+def tabela_q(path: str, compacta: bool = False) -> defaultdict | TabelaQCompacta:
+    """Tabela Q compartilhada de ``path``, carregada na primeira chamada.
+
+    Com ``compacta=True`` os dados são lidos em uma
+    :class:`rl_tabela.TabelaQCompacta`.
+    """
+    chave = (os.path.abspath(path), compacta)
+    tabela = _TABELAS.get(chave)
+    if tabela is None:
+        with _TRAVA_TABELAS:
+            tabela = _TABELAS.get(chave)
+            if tabela is None:
+                tabela = _ler_tabela(path, compacta)
+                _TABELAS[chave] = tabela
+                _ALTERADAS[chave] = set()
+    return tabela
+
+
+def _alteradas(path: str, compacta: bool = False) -> set:
+    return _ALTERADAS.setdefault((os.path.abspath(path), compacta), set())
+
+
+def descartar_tabela(path: str | None = None) -> None:
+    """Esquece a tabela de ``path`` (ou todas), forçando nova leitura."""
+    with _TRAVA_TABELAS:
+        if path is None:
+            _TABELAS.clear()
+            _ALTERADAS.clear()
+        else:
+            for compacta in (False, True):
+                _TABELAS.pop((os.path.abspath(path), compacta), None)
+                _ALTERADAS.pop((os.path.abspath(path), compacta), None)
+
+
+def precarregar(*paths: str) -> None:
+    """Carrega as tabelas antes de criar processos filhos.
+
+    Os objetos carregados são movidos para a geração permanente do coletor
+    de lixo (``gc.freeze``), evitando que as varreduras do coletor nos
+    filhos toquem nessas páginas e desfaçam o compartilhamento
+    copy-on-write do ``fork``.
+    """
+    for path in paths or (ARQUIVO_PADRAO,):
+        tabela_q(path)
+    gc.freeze()
+
 
 class RLDominoStrategy:
     """Estrategia simples de aprendizado por reforço.
@@ -20,14 +90,54 @@ class RLDominoStrategy:
     progressivamente sem conhecimento prévio.
 
     O objeto pode opcionalmente persistir os valores aprendidos em disco.
+    Estratégias com o mesmo ``persistence_file`` compartilham a mesma tabela
+    (ver :func:`tabela_q`), lida do disco uma única vez por processo. Cada
+    ``save`` grava só as entradas alteradas desde o anterior (ver
+    :mod:`rl_persistencia`).
+
+    Com ``compacta=True`` a tabela é uma :class:`rl_tabela.TabelaQCompacta`
+    indexada pelo estado empacotado em um inteiro, com bem menos memória por
+    entrada; o arquivo salvo tem o mesmo formato nos dois casos.
+
+    As decisões de cada assento são guardadas durante a rodada e, ao final,
+    todas são atualizadas em direção ao retorno-λ: ``lambda_td=1`` é Monte
+    Carlo (o resultado da rodada) e valores menores misturam o valor ``Q``
+    da decisão seguinte do mesmo assento (TD(λ)). Com ``replay > 0`` as
+    últimas ``replay`` trajetórias ficam em um buffer e ``amostras_replay``
+    delas são reaprendidas a cada rodada. ``trajetoria=False`` mantém o
+    comportamento antigo de atualizar apenas a última decisão.
     """
 
-    def __init__(self, alpha: float = 0.1, epsilon: float = 0.1, persistence_file: str | None = None):
+    def __init__(
+        self,
+        alpha: float = 0.1,
+        epsilon: float = 0.1,
+        persistence_file: str | None = None,
+        *,
+        compacta: bool = False,
+        trajetoria: bool = True,
+        lambda_td: float = 1.0,
+        replay: int = 0,
+        amostras_replay: int = 1,
+    ):
+        if not 0.0 <= lambda_td <= 1.0:
+            raise ValueError("lambda_td deve estar entre 0 e 1")
         self.alpha = alpha
         self.epsilon = epsilon
-        self.q: defaultdict[Tuple, float] = defaultdict(float)
+        self.compacta = compacta
+        self.trajetoria = trajetoria
+        self.lambda_td = lambda_td
+        self.amostras_replay = amostras_replay
+        # assento → (tabuleiro da rodada, [(estado, ação), ...])
+        self._trajetorias: Dict[str, tuple[Tabuleiro, list]] = {}
+        self._replay: deque | None = deque(maxlen=replay) if replay else None
+        self._rng = random
+        self.q: defaultdict[Tuple, float] | TabelaQCompacta = (
+            TabelaQCompacta() if compacta else defaultdict(float)
+        )
         self.prev_state: Tuple | None = None
         self.prev_action: Tuple[int, int] | None = None
+        self._alteradas: set = set()
         self._file = persistence_file
         if self._file:
             self._load(self._file)
@@ -101,7 +211,7 @@ class RLDominoStrategy:
 
         restantes = tabuleiro.restantes_por_valor()
         remaining_bucket = [self._bucket(r, [0, 1, 3]) for r in restantes]
-        closed_mask = self._encode_mask([i for i, r in enumerate(restantes) if r == 0])
+        closed_mask = tabuleiro.mascara_fechados
 
         idx = jogadores.index(jogador)
         ordem = [
@@ -199,8 +309,11 @@ class RLDominoStrategy:
             passes_jog,
             pontos_para_vencer,
         )
-        if random.random() < self.epsilon:
-            escolha = random.choice(jogadas)
+        if self.compacta:
+            estado = empacotar_estado(estado)
+        rng = jogador.rng or random
+        if rng.random() < self.epsilon:
+            escolha = rng.choice(jogadas)
         else:
             melhores = []
             max_v = float("-inf")
@@ -211,50 +324,100 @@ class RLDominoStrategy:
                     melhores = [p]
                 elif v == max_v:
                     melhores.append(p)
-            escolha = random.choice(melhores)
+            escolha = rng.choice(melhores)
 
         self.prev_state = estado
         self.prev_action = (escolha.lado1, escolha.lado2)
+        if self.trajetoria:
+            self._registrar(jogador, tabuleiro, (estado, self.prev_action), rng)
         return escolha
 
+    def _registrar(self, jogador: Jogador, tabuleiro: Tabuleiro, passo, rng) -> None:
+        """Acrescenta ``passo`` à trajetória da rodada de ``jogador``."""
+        # Um tabuleiro novo indica outra rodada, mesmo sem notificação da
+        # anterior (ex.: ``simular_rodada``).
+        rodada = self._trajetorias.get(jogador.nome)
+        if rodada is None or rodada[0] is not tabuleiro:
+            rodada = self._trajetorias[jogador.nome] = (tabuleiro, [])
+        rodada[1].append(passo)
+        self._rng = rng
+
     def notificar_resultado(self, jogador_nome: str, vencedor: str | None):
-        if self.prev_state is None:
-            return
         recompensa = 1.0 if vencedor == jogador_nome else -1.0 if vencedor else 0.0
-        chave = (self.prev_state, self.prev_action)
-        self.q[chave] += self.alpha * (recompensa - self.q[chave])
+        if not self.trajetoria:
+            if self.prev_state is None:
+                return
+            self._atualizar((self.prev_state, self.prev_action), recompensa)
+        else:
+            _, passos = self._trajetorias.pop(jogador_nome, (None, None))
+            if passos:
+                self._aprender(passos, recompensa)
+                if self._replay is not None:
+                    for _ in range(min(self.amostras_replay, len(self._replay))):
+                        self._aprender(*self._rng.choice(self._replay))
+                    self._replay.append((passos, recompensa))
         self.prev_state = None
         self.prev_action = None
 
+    def _aprender(self, passos: list, recompensa: float) -> None:
+        """Atualiza cada ``(estado, ação)`` de ``passos`` pelo retorno-λ.
+
+        O retorno de cada passo é ``(1 - λ)·Q(passo seguinte) + λ·retorno
+        seguinte``, terminando na recompensa da rodada; os alvos são
+        calculados antes de qualquer atualização.
+        """
+        q = self.q
+        lam = self.lambda_td
+        alvos = [0.0] * len(passos)
+        retorno = recompensa
+        for t in range(len(passos) - 1, -1, -1):
+            alvos[t] = retorno
+            if lam < 1.0:
+                retorno = (1.0 - lam) * q.get(passos[t], 0.0) + lam * retorno
+        for chave, alvo in zip(passos, alvos):
+            self._atualizar(chave, alvo)
+
+    def _atualizar(self, chave: Tuple, alvo: float) -> None:
+        self.q[chave] += self.alpha * (alvo - self.q[chave])
+        self._alteradas.add(chave)
+
     # ------------------------------------------------------------------
     # Persistência
     # ------------------------------------------------------------------
-    def save(self, path: str | None = None) -> None:
+    def save(self, path: str | None = None, *, compactar: bool = False) -> None:
         """Salva os valores aprendidos em ``path``.
 
         Se ``path`` for ``None`` utiliza o caminho definido na inicialização.
+        No mesmo arquivo só as entradas alteradas são acrescentadas ao log,
+        que é compactado quando cresce demais ou com ``compactar=True``; em
+        outro arquivo a tabela inteira é gravada.
         """
-        
         target = path or self._file
         if target is None:
             raise ValueError("Um caminho para salvar deve ser fornecido")
-        with open(target, "wb") as f:
-            pickle.dump(dict(self.q), f)
+        persistencia = PersistenciaQ(target)
+        if compactar or self._file is None or os.path.abspath(target) != os.path.abspath(self._file):
+            persistencia.compactar(self.q.items())
+        else:
+            persistencia.checkpoint(self._itens_alterados(), self.q)
+        self._alteradas.clear()
         self._file = target
 
-    def _load(self, path: str) -> None:
-        """Carrega valores previamente salvos, se disponíveis."""
+    def _itens_alterados(self):
+        for chave in self._alteradas:
+            valor = self.q[chave]
+            if self.compacta:
+                estado, acao = chave
+                chave = (desempacotar_estado(estado), acao)
+            yield chave, valor
 
-        path = r"C:\Users\ArlindoLins\Documents\Otimizando Dominó\rl_qvalues.pkl"
-        if os.path.exists(path):
-            with open(path, "rb") as f:
-                data = pickle.load(f)
-            self.q = defaultdict(float, data)
-        else:
-            self.q = defaultdict(float)
+    def _load(self, path: str) -> None:
+        """Associa a tabela compartilhada de ``path`` a esta estratégia."""
+        self.q = tabela_q(path, self.compacta)
+        self._alteradas = _alteradas(path, self.compacta)
 
     def load(self, path: str) -> None:
-        """Sobrescreve o arquivo de persistência e carrega seus dados."""
-        path = r"C:\Users\ArlindoLins\Documents\Otimizando Dominó\rl_qvalues.pkl"
+        """Sobrescreve o arquivo de persistência e relê seus dados do disco."""
+        descartar_tabela(path)
         self._load(path)
         self._file = path
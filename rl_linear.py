@@ -0,0 +1,358 @@
+"""rl_linear.py - função Q aproximada (linear ou MLP) em NumPy
+
+Alternativa à tabela de ``RLDominoStrategy``: em vez de uma entrada por
+``(estado, peça)`` a estratégia aprende pesos sobre características.
+
+* Estado: cada campo de ``RLDominoStrategy._state`` vira um one-hot (campos
+  de até 4 bits em :data:`rl_tabela._CAMPOS`), os bits da máscara (campos de
+  7 bits, valores fechados/ausentes) ou um escalar normalizado (passes).
+* Ação: valores da peça, duplo, soma, pontas em que encaixa, valores que
+  ficariam expostos e quantas peças da mão ainda os têm.
+
+``modelo="linear"`` é bilinear, ``Q = aᵀ·W·s + u·a + v·s + b``; ``"mlp"``
+usa uma camada oculta ReLU sobre ``[s, a]``. Todas as jogadas válidas são
+avaliadas em um único produto de matrizes e a trajetória da rodada é
+ajustada com um passo de SGD em lote. A memória é só a dos pesos, qualquer
+que seja o número de partidas.
+
+Requer ``numpy``.
+"""
+
+from __future__ import annotations
+
+import os
+import random
+import threading
+from typing import Dict, Sequence
+
+import numpy as np
+
+from core.jogador import Jogador
+from core.peca import Peca
+from core.tabuleiro import Tabuleiro
+from rl_engine import RLDominoStrategy
+from rl_tabela import _CAMPOS
+
+# ---------------------------------------------------------------------------
+# Características
+# ---------------------------------------------------------------------------
+_ONE_HOT, _BITS, _ESCALAR = 0, 1, 2
+_ESCALA_PASSES = 4.0
+
+
+def _layout():
+    tipos, bases = [], []
+    n = 0
+    for largura, _ in _CAMPOS:
+        bases.append(n)
+        if largura <= 4:
+            tipos.append(_ONE_HOT)
+            n += 1 << largura
+        elif largura == 7:
+            tipos.append(_BITS)
+            n += 7
+        else:
+            tipos.append(_ESCALAR)
+            n += 1
+    return np.array(tipos), np.array(bases), n
+
+
+_TIPOS, _BASES, N_ESTADO = _layout()
+_DESLOCAMENTOS = np.array([d for _, d in _CAMPOS])
+_OH = np.flatnonzero(_TIPOS == _ONE_HOT)
+_BT = np.flatnonzero(_TIPOS == _BITS)
+_ES = np.flatnonzero(_TIPOS == _ESCALAR)
+_BITS_7 = np.arange(7)
+_POS_BITS = (_BASES[_BT][:, None] + _BITS_7).ravel()
+
+# valores (7) + duplo + soma + encaixa esq./dir. + expostos (7) + na mão + viés
+N_ACAO = 7 + 1 + 1 + 2 + 7 + 1 + 1
+
+
+def codificar_estado(estado: Sequence[int]) -> np.ndarray:
+    """Vetor ``float[N_ESTADO]`` da tupla de ``_state``."""
+    e = np.asarray(estado, dtype=np.int64)
+    x = np.zeros(N_ESTADO)
+    x[_BASES[_OH] + e[_OH] + _DESLOCAMENTOS[_OH]] = 1.0
+    x[_POS_BITS] = ((e[_BT][:, None] >> _BITS_7) & 1).ravel()
+    x[_BASES[_ES]] = e[_ES] / _ESCALA_PASSES
+    return x
+
+
+def codificar_acoes(jogadas: Sequence[Peca], mao: Sequence[Peca], pontas) -> np.ndarray:
+    """Matriz ``float[len(jogadas), N_ACAO]`` com uma linha por peça."""
+    esquerda, direita = pontas
+    vazio = esquerda is None
+    na_mao = [0] * 7
+    for p in mao:
+        na_mao[p.lado1] += 1
+        if not p.duplo:
+            na_mao[p.lado2] += 1
+    A = np.zeros((len(jogadas), N_ACAO))
+    for i, p in enumerate(jogadas):
+        a, b = p.lado1, p.lado2
+        linha = A[i]
+        linha[a] += 1.0
+        linha[b] += 1.0
+        linha[7] = p.duplo
+        linha[8] = p.soma / 12.0
+        expostos = set()
+        if vazio:
+            linha[9] = linha[10] = 1.0
+            expostos.update((a, b))
+        else:
+            if esquerda in (a, b):
+                linha[9] = 1.0
+                expostos.add(b if a == esquerda else a)
+            if direita in (a, b):
+                linha[10] = 1.0
+                expostos.add(b if a == direita else a)
+        for v in expostos:
+            linha[11 + v] = 1.0
+            linha[18] += (na_mao[v] - (v in (a, b))) / 6.0
+        linha[19] = 1.0
+    return A
+
+
+# ---------------------------------------------------------------------------
+# Modelos
+# ---------------------------------------------------------------------------
+class ModeloLinear:
+    """``Q(s, a) = aᵀ·W·s + u·a + v·s + b`` (interações estado × ação)."""
+
+    def __init__(self):
+        self.W = np.zeros((N_ACAO, N_ESTADO))
+        self.u = np.zeros(N_ACAO)
+        self.v = np.zeros(N_ESTADO)
+        self.b = np.zeros(1)
+
+    def avaliar(self, s: np.ndarray, A: np.ndarray) -> np.ndarray:
+        """Valores de todas as ações ``A`` no estado ``s``."""
+        return A @ (self.W @ s + self.u) + (self.v @ s + self.b[0])
+
+    def valores(self, S: np.ndarray, A: np.ndarray) -> np.ndarray:
+        """Valores dos pares ``(S[i], A[i])``."""
+        return ((A @ self.W) * S).sum(axis=1) + A @ self.u + S @ self.v + self.b[0]
+
+    def ajustar(self, S: np.ndarray, A: np.ndarray, alvos: np.ndarray, taxa: float) -> None:
+        """Um passo de SGD em lote normalizado (NLMS).
+
+        O erro de cada exemplo é dividido pela norma² do seu gradiente, então
+        ``taxa`` tem o papel do ``alpha`` da tabela: 1 ajusta o exemplo por
+        completo e o passo é estável para ``0 < taxa < 2``.
+        """
+        a2 = (A * A).sum(axis=1)
+        s2 = (S * S).sum(axis=1)
+        erro = (alvos - self.valores(S, A)) / (a2 * s2 + a2 + s2 + 1.0)
+        passo = taxa / len(erro)
+        self.W += passo * (A * erro[:, None]).T @ S
+        self.u += passo * A.T @ erro
+        self.v += passo * S.T @ erro
+        self.b += passo * erro.sum()
+
+    def parametros(self) -> Dict[str, np.ndarray]:
+        return {"W": self.W, "u": self.u, "v": self.v, "b": self.b}
+
+
+class ModeloMLP:
+    """Uma camada oculta ReLU sobre ``[s, a]``."""
+
+    def __init__(self, ocultas: int = 32, semente: int | None = 0):
+        rng = np.random.default_rng(semente)
+        entrada = N_ESTADO + N_ACAO
+        self.W1 = rng.normal(0.0, 1.0 / np.sqrt(entrada), (entrada, ocultas))
+        self.b1 = np.zeros(ocultas)
+        self.w2 = rng.normal(0.0, 1.0 / np.sqrt(ocultas), ocultas)
+        self.b2 = np.zeros(1)
+
+    def _ocultas(self, S, A):
+        return np.maximum(S @ self.W1[:N_ESTADO] + A @ self.W1[N_ESTADO:] + self.b1, 0.0)
+
+    def avaliar(self, s: np.ndarray, A: np.ndarray) -> np.ndarray:
+        return self._ocultas(s, A) @ self.w2 + self.b2[0]
+
+    def valores(self, S: np.ndarray, A: np.ndarray) -> np.ndarray:
+        return self._ocultas(S, A) @ self.w2 + self.b2[0]
+
+    def ajustar(self, S: np.ndarray, A: np.ndarray, alvos: np.ndarray, taxa: float) -> None:
+        H = self._ocultas(S, A)
+        erro = alvos - (H @ self.w2 + self.b2[0])
+        passo = taxa / len(erro)
+        dH = np.outer(erro, self.w2) * (H > 0)
+        self.w2 += passo * H.T @ erro
+        self.b2 += passo * erro.sum()
+        self.W1[:N_ESTADO] += passo * S.T @ dH
+        self.W1[N_ESTADO:] += passo * A.T @ dH
+        self.b1 += passo * dH.sum(axis=0)
+
+    def parametros(self) -> Dict[str, np.ndarray]:
+        return {"W1": self.W1, "b1": self.b1, "w2": self.w2, "b2": self.b2}
+
+
+MODELOS = ("linear", "mlp")
+# taxa de aprendizado padrão de cada modelo (o linear é normalizado)
+TAXAS_PADRAO = {"linear": 0.1, "mlp": 0.01}
+
+
+def criar_modelo(modelo: str = "linear", ocultas: int = 32, semente: int | None = 0):
+    if modelo == "linear":
+        return ModeloLinear()
+    if modelo == "mlp":
+        return ModeloMLP(ocultas, semente)
+    raise ValueError(f"Modelo inválido: {modelo!r}")
+
+
+def salvar_modelo(modelo, path: str) -> None:
+    """Grava os pesos em ``.npz`` de forma atômica (temporário + ``os.replace``)."""
+    temporario = f"{path}.{os.getpid()}.tmp"
+    with open(temporario, "wb") as f:
+        np.savez(f, **modelo.parametros())
+    os.replace(temporario, path)
+
+
+def carregar_modelo(modelo, path: str) -> None:
+    """Copia para ``modelo`` os pesos de ``path``, se o arquivo existir."""
+    if not os.path.exists(path):
+        return
+    with np.load(path) as dados:
+        for nome, atual in modelo.parametros().items():
+            if nome not in dados or dados[nome].shape != atual.shape:
+                raise ValueError(f"Pesos incompatíveis em {path}: {nome}")
+            atual[...] = dados[nome]
+
+
+# Um modelo por arquivo e processo, compartilhado pelos assentos (como
+# ``rl_engine.tabela_q``).
+_MODELOS: Dict[tuple, object] = {}
+_TRAVA_MODELOS = threading.Lock()
+
+
+def modelo_compartilhado(path: str, modelo: str = "linear", ocultas: int = 32, semente: int | None = 0):
+    chave = (os.path.abspath(path), modelo, ocultas)
+    with _TRAVA_MODELOS:
+        instancia = _MODELOS.get(chave)
+        if instancia is None:
+            instancia = criar_modelo(modelo, ocultas, semente)
+            carregar_modelo(instancia, path)
+            _MODELOS[chave] = instancia
+    return instancia
+
+
+def descartar_modelo(path: str | None = None) -> None:
+    with _TRAVA_MODELOS:
+        if path is None:
+            _MODELOS.clear()
+        else:
+            for chave in [c for c in _MODELOS if c[0] == os.path.abspath(path)]:
+                del _MODELOS[chave]
+
+
+# ---------------------------------------------------------------------------
+# Estratégia
+# ---------------------------------------------------------------------------
+class RLLinearStrategy(RLDominoStrategy):
+    """``RLDominoStrategy`` com a tabela Q trocada por um modelo de pesos.
+
+    Usa as mesmas características de ``_state``, a mesma exploração
+    ε-gulosa e as mesmas trajetórias por rodada (Monte Carlo/TD(λ) e
+    replay opcional); ``alpha`` é a taxa de aprendizado do SGD (padrão em
+    :data:`TAXAS_PADRAO`).
+    Estratégias com o mesmo ``persistence_file`` compartilham o modelo.
+    """
+
+    def __init__(
+        self,
+        alpha: float | None = None,
+        epsilon: float = 0.1,
+        persistence_file: str | None = None,
+        *,
+        modelo: str = "linear",
+        ocultas: int = 32,
+        lambda_td: float = 1.0,
+        replay: int = 0,
+        amostras_replay: int = 1,
+        semente: int | None = 0,
+    ):
+        if modelo not in MODELOS:
+            raise ValueError(f"Modelo inválido: {modelo!r}")
+        super().__init__(
+            TAXAS_PADRAO[modelo] if alpha is None else alpha,
+            epsilon,
+            lambda_td=lambda_td,
+            replay=replay,
+            amostras_replay=amostras_replay,
+        )
+        self.tipo_modelo = modelo
+        self.ocultas = ocultas
+        self.semente = semente
+        self._file = persistence_file
+        if persistence_file:
+            self._load(persistence_file)
+        else:
+            self.modelo = criar_modelo(modelo, ocultas, semente)
+
+    def escolher_peca(
+        self,
+        jogador: Jogador,
+        tabuleiro: Tabuleiro,
+        jogadores: Sequence[Jogador],
+        *,
+        duplas,
+        passes_jog,
+        pontos_para_vencer: int,
+    ):
+        pontas = tabuleiro.obter_pontas()
+        jogadas = jogador.jogadas_validas(pontas)
+        if not jogadas:
+            raise ValueError("Jogador não possui jogadas válidas")
+
+        estado = self._state(jogador, tabuleiro, jogadores, duplas, passes_jog, pontos_para_vencer)
+        s = codificar_estado(estado)
+        A = codificar_acoes(jogadas, jogador.mao, pontas)
+        rng = jogador.rng or random
+        if rng.random() < self.epsilon:
+            i = rng.randrange(len(jogadas))
+        else:
+            valores = self.modelo.avaliar(s, A)
+            i = int(rng.choice(np.flatnonzero(valores == valores.max())))
+        escolha = jogadas[i]
+
+        self.prev_state = estado
+        self.prev_action = (escolha.lado1, escolha.lado2)
+        self._registrar(jogador, tabuleiro, (s, A[i]), rng)
+        return escolha
+
+    def _aprender(self, passos: list, recompensa: float) -> None:
+        S = np.stack([s for s, _ in passos])
+        A = np.stack([a for _, a in passos])
+        alvos = np.empty(len(passos))
+        lam = self.lambda_td
+        atuais = self.modelo.valores(S, A) if lam < 1.0 else None
+        retorno = recompensa
+        for t in range(len(passos) - 1, -1, -1):
+            alvos[t] = retorno
+            if atuais is not None:
+                retorno = (1.0 - lam) * atuais[t] + lam * retorno
+        self.modelo.ajustar(S, A, alvos, self.alpha)
+
+    def memoria(self) -> int:
+        """Bytes ocupados pelos pesos."""
+        return sum(p.nbytes for p in self.modelo.parametros().values())
+
+    # ------------------------------------------------------------------
+    # Persistência
+    # ------------------------------------------------------------------
+    def save(self, path: str | None = None) -> None:
+        target = path or self._file
+        if target is None:
+            raise ValueError("Um caminho para salvar deve ser fornecido")
+        salvar_modelo(self.modelo, target)
+        self._file = target
+
+    def _load(self, path: str) -> None:
+        self.modelo = modelo_compartilhado(path, self.tipo_modelo, self.ocultas, self.semente)
+
+    def load(self, path: str) -> None:
+        descartar_modelo(path)
+        self._load(path)
+        self._file = path
@@ -0,0 +1,194 @@
+"""rl_persistencia.py - persistência incremental da tabela Q
+
+Cada tabela é guardada em dois arquivos:
+
+* ``path`` — a foto completa, gravada em um temporário e trocada com
+  ``os.replace``; uma queda durante a gravação mantém a foto anterior.
+* ``path + ".log"`` — registros acrescentados a cada ``save`` apenas com as
+  entradas alteradas desde o último ponto de controle.
+
+Os dois usam o mesmo formato: um cabeçalho mágico seguido de registros
+``(tamanho, crc32, pickle de [(chave, valor), ...])``. Os valores do log são
+absolutos, então reaplicá-lo é idempotente. Um registro incompleto no fim do
+log (queda no meio de um ``save``) é descartado na leitura. Arquivos antigos
+com um ``pickle`` de ``dict`` ainda são lidos como foto.
+
+A leitura é em fluxo: os registros vão direto para a tabela de destino sem
+montar um ``dict`` intermediário com tudo.
+"""
+
+from __future__ import annotations
+
+import os
+import pickle
+import struct
+import zlib
+from typing import Iterable, Iterator, MutableMapping, Tuple
+
+MAGICO = b"DOMINOQ1"
+SUFIXO_LOG = ".log"
+ITENS_POR_REGISTRO = 8192
+
+_CABECALHO = struct.Struct("<II")
+
+
+def caminho_log(path: str) -> str:
+    return path + SUFIXO_LOG
+
+
+def _registros(itens: Iterable[Tuple[tuple, float]]) -> Iterator[bytes]:
+    bloco = []
+    for item in itens:
+        bloco.append(item)
+        if len(bloco) >= ITENS_POR_REGISTRO:
+            yield _registro(bloco)
+            bloco = []
+    if bloco:
+        yield _registro(bloco)
+
+
+def _registro(bloco: list) -> bytes:
+    dados = pickle.dumps(bloco, protocol=pickle.HIGHEST_PROTOCOL)
+    return _CABECALHO.pack(len(dados), zlib.crc32(dados)) + dados
+
+
+def _ler_registros(f) -> Iterator[Tuple[list, int]]:
+    """Blocos válidos de ``f`` e a posição logo após cada um.
+
+    Para no primeiro registro incompleto ou com CRC inválido.
+    """
+    while True:
+        cabecalho = f.read(_CABECALHO.size)
+        if len(cabecalho) < _CABECALHO.size:
+            return
+        tamanho, crc = _CABECALHO.unpack(cabecalho)
+        dados = f.read(tamanho)
+        if len(dados) < tamanho or zlib.crc32(dados) != crc:
+            return
+        yield pickle.loads(dados), f.tell()
+
+
+def _sincronizar_pasta(path: str) -> None:
+    # garante que a troca de nomes sobreviva a uma queda (no-op no Windows)
+    try:
+        fd = os.open(os.path.dirname(os.path.abspath(path)), os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class PersistenciaQ:
+    """Foto + log de alterações da tabela Q guardada em ``path``.
+
+    ``fator_compactacao`` controla quando :meth:`checkpoint` reescreve a foto:
+    quando o log passa de ``fator_compactacao`` vezes o tamanho da foto (e de
+    ``log_minimo`` bytes). Pressupõe um único processo gravando o arquivo.
+    """
+
+    def __init__(self, path: str, fator_compactacao: float = 1.0, log_minimo: int = 1 << 20):
+        self.path = path
+        self.log = caminho_log(path)
+        self.fator_compactacao = fator_compactacao
+        self.log_minimo = log_minimo
+
+    # ------------------------------------------------------------------
+    # Leitura
+    # ------------------------------------------------------------------
+    def carregar(self, destino: MutableMapping) -> MutableMapping:
+        """Aplica a foto e depois o log sobre ``destino`` e o retorna.
+
+        Um final corrompido do log é truncado para que os próximos registros
+        sejam acrescentados após o último válido.
+        """
+        if os.path.exists(self.path):
+            with open(self.path, "rb") as f:
+                if f.read(len(MAGICO)) == MAGICO:
+                    for bloco, _ in _ler_registros(f):
+                        _aplicar(destino, bloco)
+                else:
+                    f.seek(0)
+                    _aplicar(destino, pickle.load(f).items())
+        if os.path.exists(self.log):
+            valido = len(MAGICO)
+            with open(self.log, "rb") as f:
+                if f.read(len(MAGICO)) == MAGICO:
+                    for bloco, valido in _ler_registros(f):
+                        _aplicar(destino, bloco)
+                else:
+                    valido = 0
+            if valido < os.path.getsize(self.log):
+                with open(self.log, "r+b") as f:
+                    f.truncate(valido)
+        return destino
+
+    # ------------------------------------------------------------------
+    # Gravação
+    # ------------------------------------------------------------------
+    def acrescentar(self, itens: Iterable[Tuple[tuple, float]]) -> int:
+        """Acrescenta ``itens`` ao log com ``fsync``; retorna os bytes gravados."""
+        dados = b"".join(_registros(itens))
+        if not dados:
+            return 0
+        novo = not os.path.exists(self.log) or os.path.getsize(self.log) == 0
+        with open(self.log, "ab") as f:
+            if novo:
+                f.write(MAGICO)
+            f.write(dados)
+            f.flush()
+            os.fsync(f.fileno())
+        if novo:
+            _sincronizar_pasta(self.log)
+        return len(dados)
+
+    def compactar(self, itens: Iterable[Tuple[tuple, float]]) -> None:
+        """Reescreve a foto com ``itens`` (a tabela inteira) e esvazia o log."""
+        temporario = f"{self.path}.{os.getpid()}.tmp"
+        with open(temporario, "wb") as f:
+            f.write(MAGICO)
+            for registro in _registros(itens):
+                f.write(registro)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporario, self.path)
+        _sincronizar_pasta(self.path)
+        # Uma queda aqui deixa um log já contido na foto; reaplicá-lo não muda nada.
+        if os.path.exists(self.log):
+            os.remove(self.log)
+
+    def deve_compactar(self) -> bool:
+        try:
+            tamanho_log = os.path.getsize(self.log)
+        except OSError:
+            return False
+        try:
+            tamanho_foto = os.path.getsize(self.path)
+        except OSError:
+            tamanho_foto = 0
+        return tamanho_log > max(self.log_minimo, self.fator_compactacao * tamanho_foto)
+
+    def checkpoint(self, alteradas: Iterable[Tuple[tuple, float]], tabela: MutableMapping) -> bool:
+        """Grava ``alteradas`` no log e compacta se o log ficou grande.
+
+        Sem foto ainda, grava ``tabela`` inteira. Retorna se compactou.
+        """
+        if not os.path.exists(self.path):
+            self.compactar(tabela.items())
+            return True
+        self.acrescentar(alteradas)
+        if self.deve_compactar():
+            self.compactar(tabela.items())
+            return True
+        return False
+
+
+def _aplicar(destino: MutableMapping, itens: Iterable[Tuple[tuple, float]]) -> None:
+    if isinstance(destino, dict):
+        destino.update(itens)
+        return
+    for chave, valor in itens:
+        destino[chave] = valor
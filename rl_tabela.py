@@ -0,0 +1,200 @@
+"""rl_tabela.py - tabela Q compacta para ``RLDominoStrategy``
+
+O estado de ``RLDominoStrategy._state`` (tupla de 47 campos limitados) é
+empacotado bit a bit em um único inteiro de 149 bits; junto com o índice da
+peça (0‥27, 5 bits) forma a chave da tabela. As chaves ficam em três
+palavras de 64 bits de um ``array('Q')`` e os valores em um ``array('d')``,
+com endereçamento aberto (sondagem linear). O empacotamento é exato e
+reversível, então não há colisões e ``items()`` devolve as mesmas chaves
+``(estado, (lado1, lado2))`` usadas pelo ``defaultdict`` original.
+"""
+
+from __future__ import annotations
+
+from array import array
+from typing import Iterable, Iterator, Tuple
+
+from core.peca import INDICE, PECAS
+
+# (largura em bits, deslocamento somado ao valor) de cada campo de ``_state``
+_CAMPOS: tuple[tuple[int, int], ...] = (
+    (3, 1), (3, 1),             # pontas (-1 = vazio)
+    (4, 6),                     # diferença entre as pontas (-6‥6)
+    (1, 0),                     # encaixa nas duas pontas
+    *((3, 0),) * 7,             # histograma de valores na mão
+    (3, 0), (3, 1), (2, 0),     # nº de duplos, maior duplo, faixa da soma
+    (3, 0), (3, 0), (3, 0), (3, 0),  # tamanho da mão, jogáveis esq./dir./total
+    *((2, 0),) * 7,             # faixa de restantes por valor
+    (7, 0),                     # valores fechados
+    *((3, 0),) * 4,             # tamanhos das mãos
+    *((6, 0),) * 4,             # passes
+    *((7, 0),) * 4,             # valores ausentes
+    (2, 1), (2, 0), (2, 0),     # placar, faixa de pontos, rodadas restantes
+    *((1, 0),) * 6,             # indicadores binários
+)
+N_CAMPOS = len(_CAMPOS)
+BITS_ESTADO = sum(largura for largura, _ in _CAMPOS)
+BITS_ACAO = 5
+
+_MASCARA_64 = (1 << 64) - 1
+_FIBONACCI = 0x9E3779B97F4A7C15
+
+
+def empacotar_estado(estado: Tuple[int, ...]) -> int:
+    """Inteiro equivalente à tupla ``estado``; levanta ``ValueError`` se algum
+    campo estiver fora do intervalo previsto."""
+    if len(estado) != N_CAMPOS:
+        raise ValueError(f"Estado com {len(estado)} campos; esperados {N_CAMPOS}")
+    chave = 0
+    for v, (largura, deslocamento) in zip(estado, _CAMPOS):
+        x = v + deslocamento
+        if x < 0 or x >> largura:
+            raise ValueError(f"Campo de estado fora do intervalo: {v}")
+        chave = (chave << largura) | x
+    return chave
+
+
+def desempacotar_estado(chave: int) -> Tuple[int, ...]:
+    valores = []
+    for largura, deslocamento in reversed(_CAMPOS):
+        valores.append((chave & ((1 << largura) - 1)) - deslocamento)
+        chave >>= largura
+    return tuple(reversed(valores))
+
+
+def _indice_acao(acao) -> int:
+    if isinstance(acao, int):
+        return acao
+    a, b = acao
+    return INDICE[(a, b) if a <= b else (b, a)]
+
+
+class TabelaQCompacta:
+    """Tabela Q com a interface usada por ``RLDominoStrategy``.
+
+    Aceita chaves ``(estado, acao)`` onde ``estado`` é a tupla de ``_state``
+    ou o inteiro de :func:`empacotar_estado` (mais rápido quando o mesmo
+    estado é consultado para várias peças) e ``acao`` é ``(lado1, lado2)``
+    ou o índice da peça. Como um ``defaultdict(float)``, chaves ausentes
+    valem ``0.0``, mas a leitura não cria a entrada.
+    """
+
+    def __init__(self, capacidade: int = 1024, carga_maxima: float = 0.6):
+        bits = max(4, (capacidade - 1).bit_length())
+        self._carga_maxima = carga_maxima
+        self._alocar(bits)
+
+    def _alocar(self, bits: int) -> None:
+        self._bits = bits
+        self._capacidade = 1 << bits
+        self._mascara = self._capacidade - 1
+        self._limite = int(self._capacidade * self._carga_maxima)
+        self._chaves = array("Q", [0]) * (3 * self._capacidade)
+        self._valores = array("d", [0.0]) * self._capacidade
+        self._n = 0
+
+    @classmethod
+    def de_itens(cls, itens: Iterable) -> "TabelaQCompacta":
+        itens = list(itens)
+        tabela = cls(capacidade=int(len(itens) / 0.5) + 1)
+        for chave, valor in itens:
+            tabela[chave] = valor
+        return tabela
+
+    # ------------------------------------------------------------------
+    # Endereçamento
+    # ------------------------------------------------------------------
+    @staticmethod
+    def _codificar(chave) -> int:
+        estado, acao = chave
+        if not isinstance(estado, int):
+            estado = empacotar_estado(estado)
+        # +1 para que a chave nunca seja zero (zero marca posição livre)
+        return ((estado << BITS_ACAO) | _indice_acao(acao)) + 1
+
+    def _posicao(self, k: int) -> int:
+        """Posição de ``k`` ou, se ausente, ``-1 - posição livre``."""
+        w0 = k & _MASCARA_64
+        w1 = (k >> 64) & _MASCARA_64
+        w2 = k >> 128
+        chaves = self._chaves
+        mascara = self._mascara
+        i = ((hash(k) * _FIBONACCI) & _MASCARA_64) >> (64 - self._bits)
+        while True:
+            base = 3 * i
+            c0 = chaves[base]
+            if c0 == w0 and chaves[base + 1] == w1 and chaves[base + 2] == w2:
+                return i
+            if c0 == 0 and chaves[base + 1] == 0 and chaves[base + 2] == 0:
+                return -1 - i
+            i = (i + 1) & mascara
+
+    def _crescer(self) -> None:
+        antigas, valores = self._chaves, self._valores
+        self._alocar(self._bits + 1)
+        for i in range(len(valores)):
+            base = 3 * i
+            w0, w1, w2 = antigas[base], antigas[base + 1], antigas[base + 2]
+            if w0 or w1 or w2:
+                k = w0 | (w1 << 64) | (w2 << 128)
+                livre = -1 - self._posicao(k)
+                self._gravar(livre, w0, w1, w2, valores[i])
+
+    def _gravar(self, i: int, w0: int, w1: int, w2: int, valor: float) -> None:
+        base = 3 * i
+        self._chaves[base] = w0
+        self._chaves[base + 1] = w1
+        self._chaves[base + 2] = w2
+        self._valores[i] = valor
+        self._n += 1
+
+    # ------------------------------------------------------------------
+    # Interface de mapeamento
+    # ------------------------------------------------------------------
+    def __getitem__(self, chave) -> float:
+        i = self._posicao(self._codificar(chave))
+        return self._valores[i] if i >= 0 else 0.0
+
+    def get(self, chave, padrao: float = 0.0) -> float:
+        i = self._posicao(self._codificar(chave))
+        return self._valores[i] if i >= 0 else padrao
+
+    def __setitem__(self, chave, valor: float) -> None:
+        k = self._codificar(chave)
+        i = self._posicao(k)
+        if i >= 0:
+            self._valores[i] = valor
+            return
+        if self._n >= self._limite:
+            self._crescer()
+            i = self._posicao(k)
+        self._gravar(-1 - i, k & _MASCARA_64, (k >> 64) & _MASCARA_64, k >> 128, valor)
+
+    def __contains__(self, chave) -> bool:
+        return self._posicao(self._codificar(chave)) >= 0
+
+    def __len__(self) -> int:
+        return self._n
+
+    def items(self) -> Iterator[tuple]:
+        """Pares ``((estado, (lado1, lado2)), valor)`` com o estado em tupla."""
+        chaves = self._chaves
+        for i, valor in enumerate(self._valores):
+            base = 3 * i
+            w0, w1, w2 = chaves[base], chaves[base + 1], chaves[base + 2]
+            if w0 or w1 or w2:
+                k = (w0 | (w1 << 64) | (w2 << 128)) - 1
+                peca = PECAS[k & ((1 << BITS_ACAO) - 1)]
+                yield (desempacotar_estado(k >> BITS_ACAO), (peca.lado1, peca.lado2)), valor
+
+    def keys(self) -> Iterator[tuple]:
+        return (chave for chave, _ in self.items())
+
+    __iter__ = keys
+
+    def memoria(self) -> int:
+        """Bytes ocupados pelos arrays da tabela."""
+        return (
+            self._chaves.itemsize * len(self._chaves)
+            + self._valores.itemsize * len(self._valores)
+        )
@@ -0,0 +1,27 @@
+import os
+import sys
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from benchmarks.casos import Caso, casos_padrao
+from benchmarks.runner import comparar, medir
+
+
+def test_medir():
+    stats = medir(Caso("soma", lambda _seed: lambda: sum(range(100)), 10), repeticoes=3)
+    assert stats["repeticoes"] == 3
+    assert 0 < stats["min"] <= stats["mediana"]
+
+
+def test_comparar_aponta_regressoes():
+    base = {"resultados": {"a": {"mediana": 1.0}, "b": {"mediana": 1.0}}}
+    novo = {"resultados": {"a": {"mediana": 1.05}, "b": {"mediana": 1.5}, "c": {"mediana": 1.0}}}
+    assert comparar(base, novo, limiar=0.10) == ["b"]
+
+
+def test_casos_preparam():
+    for caso in casos_padrao():
+        if caso.nome.startswith(("run_match_v2", "simular_partida", "escolher_peca_mcts")):
+            continue
+        caso.preparar(1)()
@@ -0,0 +1,67 @@
+import os
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from utilidades.cache_resultados import CacheResultados, chave_simulacao
+
+
+def test_chave_independe_da_ordem():
+    a = chave_simulacao({"J1": "GA", "J2": "MCTS"}, 1, 6)
+    b = chave_simulacao({"J2": "MCTS", "J1": "GA"}, 1, 6)
+    assert a == b
+    assert a != chave_simulacao({"J1": "GA", "J2": "MCTS"}, 2, 6)
+    assert a != chave_simulacao({"J1": "GA", "J2": "MCTS"}, 1, 7)
+
+
+def test_lru_em_memoria():
+    cache = CacheResultados(2)
+    cache.guardar("a", 1)
+    cache.guardar("b", 2)
+    assert cache.obter("a") == 1  # "b" passa a ser o menos recente
+    cache.guardar("c", 3)
+    assert cache.obter("b") is None
+    assert cache.obter("a") == 1 and cache.obter("c") == 3
+    assert len(cache) == 2
+    assert (cache.acertos, cache.faltas) == (3, 1)
+
+
+def test_camada_em_disco(tmp_path):
+    pasta = str(tmp_path)
+    cache = CacheResultados(1, pasta, capacidade_disco=2)
+    cache.guardar("a", {"x": [1, 2]})
+    cache.guardar("b", {"x": [3]})
+    assert cache.obter("a") == {"x": [1, 2]}  # veio do disco
+
+    outro = CacheResultados(1, pasta, capacidade_disco=2)
+    assert outro.obter("b") == {"x": [3]}
+    outro.guardar("c", 0)
+    assert len([n for n in os.listdir(pasta) if n.endswith(".json")]) == 2
+
+
+def test_tarefas_usam_o_cache_do_servidor(tmp_path, monkeypatch):
+    pytest.importorskip("flask")
+    import app_visualizador
+    from utilidades.tarefas import CONCLUIDA, GerenciadorTarefas
+
+    monkeypatch.chdir(tmp_path)
+    cache = CacheResultados(4)
+    monkeypatch.setattr(app_visualizador, "cache", cache)
+    pedido = {"semente": 7, "pontos_para_vencer": 2}
+    with GerenciadorTarefas(processos=1) as tarefas:
+        monkeypatch.setattr(app_visualizador, "tarefas", tarefas)
+        cliente = app_visualizador.app.test_client()
+
+        primeira = cliente.post("/tarefas", json=pedido)
+        assert primeira.status_code == 202
+        resposta = tarefas.resultado(primeira.get_json()["id"], timeout=60)
+        assert len(cache) == 1
+
+        segunda = cliente.post("/tarefas", json=pedido)
+        assert segunda.status_code == 200
+        assert segunda.get_json()["status"] == CONCLUIDA
+        assert tarefas.resultado(segunda.get_json()["id"]) == resposta
+        assert cache.acertos == 1
@@ -0,0 +1,78 @@
+import os
+import random
+import sys
+from collections import Counter
+from itertools import combinations
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from core.jogador import Jogador
+from core.peca import PECAS, Peca
+from core.tabuleiro import Tabuleiro
+from determinizacao import AmostradorMaos
+
+
+OCULTAS = [Peca(0, 1), Peca(0, 2), Peca(1, 2), Peca(1, 3), Peca(2, 4), Peca(3, 4)]
+
+
+def _mesa():
+    """Seis peças ocultas, duas em cada mão; J2 não tem 0 e J4 não tem 4."""
+    tabuleiro = Tabuleiro()
+    for p in (Peca(6, 6), Peca(6, 5), Peca(5, 5)):
+        tabuleiro.jogar(p)
+    mesa = {p.indice for p in tabuleiro.pecas} | {p.indice for p in OCULTAS}
+    jogadores = [
+        Jogador("J1", [p for p in PECAS if p.indice not in mesa]),
+        Jogador("J2", OCULTAS[2:4]),
+        Jogador("J3", OCULTAS[:2]),
+        Jogador("J4", OCULTAS[4:]),
+    ]
+    jogadores[1].registrar_passe((0, 0))
+    jogadores[3].registrar_passe((4, 4))
+    return jogadores, tabuleiro
+
+
+def _consistentes(jogadores):
+    """Todas as distribuições possíveis, por força bruta."""
+    resultado = []
+    for j2 in combinations(OCULTAS, 2):
+        resto = [p for p in OCULTAS if p not in j2]
+        for j3 in combinations(resto, 2):
+            j4 = tuple(p for p in resto if p not in j3)
+            maos = (j2, j3, j4)
+            if all(
+                not {p.lado1, p.lado2} & j.valores_comprovadamente_ausentes()
+                for j, mao in zip(jogadores[1:], maos)
+                for p in mao
+            ):
+                resultado.append(tuple(frozenset(m) for m in maos))
+    return resultado
+
+
+def test_distribuicao_uniforme_sobre_as_consistentes():
+    jogadores, tabuleiro = _mesa()
+    esperadas = _consistentes(jogadores)
+    amostrador = AmostradorMaos(jogadores[0], jogadores, tabuleiro)
+    assert amostrador.consistentes == len(esperadas)
+
+    rng = random.Random(0)
+    n = 300 * len(esperadas)
+    contagem = Counter()
+    for _ in range(n):
+        maos = amostrador.amostrar(rng)
+        assert maos[0] == jogadores[0].mao
+        contagem[tuple(frozenset(m) for m in maos[1:])] += 1
+    assert set(contagem) == set(esperadas)
+    # 300 esperadas por distribuição: desvio padrão ≈ 17
+    assert max(abs(c - 300) for c in contagem.values()) < 80
+
+
+def test_passes_impossiveis():
+    jogadores, tabuleiro = _mesa()
+    jogadores[2].registrar_passe((1, 2))
+    jogadores[3].registrar_passe((1, 2))
+    with pytest.raises(ValueError):
+        AmostradorMaos(jogadores[0], jogadores, tabuleiro)
@@ -0,0 +1,101 @@
+import csv
+import os
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from motor_de_jogo import simular_partida
+from utilidades.historico import CABECALHOS, HistoricoSink, mesclar_shards
+
+
+def _ler(caminho):
+    with open(caminho, newline="") as f:
+        return list(csv.reader(f))
+
+
+def test_cabecalho_apenas_na_criacao(tmp_path):
+    sink = HistoricoSink(str(tmp_path), limite=3)
+    for _ in range(2):
+        simular_partida(pontos_para_vencer=2, sink=sink)
+    sink.fechar()
+    sink = HistoricoSink(str(tmp_path))
+    simular_partida(pontos_para_vencer=2, sink=sink)
+    sink.fechar()
+
+    partidas = _ler(tmp_path / "partidas.csv")
+    assert partidas[0] == CABECALHOS["partidas"]
+    assert len(partidas) == 4
+    rodadas = _ler(tmp_path / "rodadas.csv")
+    assert sum(linha == CABECALHOS["rodadas"] for linha in rodadas) == 1
+
+
+def test_buffer_so_grava_no_flush(tmp_path):
+    sink = HistoricoSink(str(tmp_path))
+    simular_partida(pontos_para_vencer=2, sink=sink)
+    assert not (tmp_path / "partidas.csv").exists()
+    sink.flush()
+    assert len(_ler(tmp_path / "partidas.csv")) == 2
+
+
+def test_shards_e_mescla(tmp_path):
+    for shard in ("w1", "w2"):
+        with HistoricoSink(str(tmp_path), shard=shard) as sink:
+            simular_partida(pontos_para_vencer=2, sink=sink)
+    mesclar_shards(str(tmp_path))
+
+    assert sorted(os.listdir(tmp_path)) == ["jogadas.csv", "partidas.csv", "rodadas.csv"]
+    partidas = _ler(tmp_path / "partidas.csv")
+    assert partidas[0] == CABECALHOS["partidas"]
+    assert len(partidas) == 3
+
+
+def test_sink_none_nao_grava(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    simular_partida(pontos_para_vencer=2, sink=None)
+    assert os.listdir(tmp_path) == []
+
+
+def test_sink_padrao_grava_cada_partida(tmp_path, monkeypatch):
+    from utilidades import historico
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(historico, "_sink_padrao", None)
+    simular_partida(pontos_para_vencer=2)
+    simular_partida(pontos_para_vencer=2)
+    assert len(_ler(tmp_path / historico.PASTA_PADRAO / "partidas.csv")) == 3
+
+
+def test_retirar_e_anexar(tmp_path):
+    coletor = HistoricoSink(str(tmp_path / "nunca"), limite=float("inf"))
+    simular_partida(pontos_para_vencer=2, sink=coletor)
+    linhas = coletor.retirar()
+    assert len(linhas["partidas"]) == 1 and coletor.retirar()["partidas"] == []
+
+    destino = HistoricoSink(str(tmp_path), por_partida=True)
+    destino.anexar(linhas)
+    assert len(_ler(tmp_path / "partidas.csv")) == 2
+    assert len(_ler(tmp_path / "jogadas.csv")) == len(linhas["jogadas"]) + 1
+    assert not (tmp_path / "nunca").exists()
+
+
+def test_tarefas_do_visualizador_gravam_no_historico_principal(tmp_path, monkeypatch):
+    pytest.importorskip("flask")
+    import app_visualizador
+    from utilidades import historico
+    from utilidades.tarefas import GerenciadorTarefas
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(historico, "_sink_padrao", None)
+    with GerenciadorTarefas(processos=1) as tarefas:
+        monkeypatch.setattr(app_visualizador, "tarefas", tarefas)
+        cliente = app_visualizador.app.test_client()
+        id_tarefa = cliente.post("/tarefas", json={"pontos_para_vencer": 2}).get_json()["id"]
+        tarefas.resultado(id_tarefa, timeout=60)
+        assert cliente.get(f"/tarefas/{id_tarefa}/resultado").status_code == 200
+
+    pasta = tmp_path / historico.PASTA_PADRAO
+    assert sorted(os.listdir(pasta)) == ["jogadas.csv", "partidas.csv", "rodadas.csv"]
+    assert len(_ler(pasta / "partidas.csv")) == 2
@@ -0,0 +1,72 @@
+import os
+import sys
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from core.jogador import Jogador
+from motor_de_jogo import simular_partida
+from utilidades.historico import HistoricoSink
+from utilidades.historico_sqlite import HistoricoSQLite, importar_csv
+
+
+class Outro(Jogador):
+    pass
+
+
+def test_consultas(tmp_path):
+    vencedores = []
+    with HistoricoSQLite(str(tmp_path / "h.sqlite3"), limite=50) as banco:
+        for i in range(6):
+            estrategias = {"J1": Outro} if i % 2 else None
+            r = simular_partida(pontos_para_vencer=2, estrategias=estrategias, sink=banco)
+            vencedores.append(r["vencedor_partida"])
+
+        vitorias, total = banco.taxa_vitoria("Dupla_1")
+        assert (vitorias, total) == (vencedores.count("Dupla_1"), 6)
+        assert banco.taxa_vitoria("Dupla_2", {"J1": "Outro"})[1] == 3
+
+        por_tipo = banco.vitorias_por_tipo_batida("Dupla_1", {"J1": "Jogador"})
+        n_rodadas = banco.consultar(
+            "SELECT COUNT(*) FROM rodadas r JOIN estrategias e"
+            " ON e.id_partida = r.id_partida WHERE e.jogador = 'J1' AND e.estrategia = 'Jogador'"
+        )[0][0]
+        assert sum(t for _, t in por_tipo.values()) == n_rodadas
+
+        desempenho = banco.desempenho_por_estrategia("J1")
+        assert set(desempenho) == {"Jogador", "Outro"}
+
+
+def test_importar_csv(tmp_path):
+    pasta = str(tmp_path / "csv")
+    with HistoricoSink(pasta) as sink:
+        for _ in range(3):
+            simular_partida(pontos_para_vencer=2, sink=sink)
+    with open(os.path.join(pasta, "partidas.csv")) as f:
+        n_partidas = len(f.readlines()) - 1
+
+    caminho = str(tmp_path / "h.sqlite3")
+    assert importar_csv(pasta, caminho) > 0
+    with HistoricoSQLite(caminho) as banco:
+        assert banco.taxa_vitoria("Dupla_1")[1] == n_partidas == 3
+        assert banco.consultar("SELECT COUNT(*) FROM jogadas")[0][0] > 0
+
+
+def _contagens(caminho):
+    with HistoricoSQLite(caminho) as banco:
+        return [
+            banco.consultar(f"SELECT COUNT(*) FROM {tabela}")[0][0]
+            for tabela in ("partidas", "rodadas", "jogadas")
+        ]
+
+
+def test_importar_csv_duas_vezes_nao_duplica(tmp_path):
+    pasta = str(tmp_path / "csv")
+    with HistoricoSink(pasta) as sink:
+        simular_partida(pontos_para_vencer=2, sink=sink)
+
+    caminho = str(tmp_path / "h.sqlite3")
+    importar_csv(pasta, caminho)
+    contagens = _contagens(caminho)
+    importar_csv(pasta, caminho)
+    assert _contagens(caminho) == contagens
@@ -0,0 +1,57 @@
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import pytest
+
+from core.jogador import GAJogador
+from motor_de_jogo import simular_partida
+from utilidades import instrumentacao
+
+
+@pytest.fixture
+def medicao(tmp_path):
+    instrumentacao.limpar()
+    instrumentacao.ativar(str(tmp_path))
+    yield tmp_path
+    instrumentacao.desativar()
+    instrumentacao.limpar()
+
+
+class GA(GAJogador):
+    def __init__(self, nome, mao):
+        super().__init__(nome, mao, [1] * 8)
+
+
+def _partida(_):
+    simular_partida(pontos_para_vencer=2, estrategias={"J1": GA}, sink=None)
+
+
+def test_desligada_nao_registra():
+    instrumentacao.limpar()
+    _partida(0)
+    assert instrumentacao.exportar() == []
+
+
+def test_registra_por_estrategia(medicao):
+    _partida(0)
+    dados = instrumentacao.coletar()
+    estrategias = {k[0] for k in dados}
+    assert estrategias == {"GA", "Jogador"}
+    for (_, tam_mao, n_jogadas), (n, total, maximo, hist) in dados.items():
+        assert 1 <= n_jogadas <= tam_mao
+        assert sum(hist.values()) == n
+        assert maximo <= total
+    assert "GA" in instrumentacao.resumo(dados)
+
+
+def test_agrega_workers(medicao):
+    with ProcessPoolExecutor(2) as executor:
+        list(executor.map(_partida, range(4)))
+    assert len(os.listdir(medicao)) >= 1
+    dados = instrumentacao.coletar()
+    assert os.listdir(medicao) == []
+    assert {k[0] for k in dados} == {"GA", "Jogador"}
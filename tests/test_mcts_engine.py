@@ -0,0 +1,181 @@
+import functools
+import os
+import random
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import mcts_engine
+from benchmarks.casos import _meio_de_rodada
+from core.jogador import Jogador, MCTSJogador
+from core.peca import Peca
+from core.tabuleiro import Tabuleiro
+from mcts_engine import ArvoreUCT, escolher_peca_mcts, escolher_peca_uct
+from motor_de_jogo import simular_partida
+
+
+def _mesa():
+    tabuleiro = Tabuleiro()
+    tabuleiro.jogar(Peca(6, 6))
+    jogadores = [
+        Jogador("J1", [Peca(6, 1), Peca(6, 2), Peca(3, 4)]),
+        Jogador("J2", [Peca(1, 1), Peca(0, 5)]),
+        Jogador("J3", [Peca(2, 2), Peca(6, 0)]),
+        Jogador("J4", [Peca(4, 5), Peca(0, 3)]),
+    ]
+    return jogadores, tabuleiro
+
+
+def test_uct_escolhe_jogada_valida_e_e_deterministico():
+    jogadores, tabuleiro = _mesa()
+    maos = [list(j.mao) for j in jogadores]
+    escolhas = {
+        escolher_peca_uct(jogadores[0], jogadores, tabuleiro, 20, rng=random.Random(3))
+        for _ in range(3)
+    }
+    assert len(escolhas) == 1
+    assert escolhas.pop() in jogadores[0].jogadas_validas(tabuleiro.obter_pontas())
+    # a busca trabalha numa cópia: mãos e mesa ficam intactas
+    assert [j.mao for j in jogadores] == maos
+    assert tabuleiro.obter_pontas() == (6, 6)
+
+
+def test_uct_reaproveita_subarvore_na_partida():
+    arvores = []
+
+    class Jogador(MCTSJogador):
+        def __init__(self, nome, mao):
+            super().__init__(nome, mao, 10, modo="uct")
+            arvores.append(self.arvore)
+
+    resultado = simular_partida(
+        pontos_para_vencer=2,
+        estrategias={"J1": Jogador, "J3": Jogador},
+        registro="nenhum",
+        sink=None,
+        semente=0,
+    )
+    assert resultado["vencedor_partida"] in ("Dupla_1", "Dupla_2")
+    assert sum(a.reaproveitadas for a in arvores) > 0
+
+
+def test_modo_invalido():
+    with pytest.raises(ValueError):
+        MCTSJogador("J1", [], modo="exaustivo")
+    assert isinstance(MCTSJogador("J1", [], modo="uct").arvore, ArvoreUCT)
+
+
+@pytest.mark.parametrize("modo", ["flat", "uct"])
+def test_amostras_nao_olham_as_maos_ocultas(modo):
+    jogadores, tabuleiro = _mesa()
+    trocados, _ = _mesa()
+    trocados[1].mao, trocados[2].mao = trocados[2].mao, trocados[1].mao
+    escolher = escolher_peca_uct if modo == "uct" else escolher_peca_mcts
+    escolhas = [
+        escolher(js[0], js, tabuleiro, 20, amostras=5, rng=random.Random(1))
+        for js in (jogadores, trocados)
+    ]
+    assert escolhas[0] == escolhas[1]
+    assert escolhas[0] in jogadores[0].jogadas_validas(tabuleiro.obter_pontas())
+
+
+
+def test_ismcts_conta_disponibilidade_em_toda_passagem():
+    jogadores, tabuleiro = _meio_de_rodada(4)
+    legais = jogadores[0].jogadas_validas(tabuleiro.obter_pontas())
+    raiz = mcts_engine._NoUCT(0)
+    rng = random.Random(0)
+    for _ in range(40):
+        mcts_engine._iteracao_ismcts(raiz, jogadores, tabuleiro, rng, mcts_engine.C_UCT)
+    # as jogadas da raiz são legais em toda iteração: o filho criado na
+    # iteração t esteve disponível em todas as iterações de t a 40
+    m = len(legais)
+    assert sorted(f.disponivel for f in raiz.filhos.values()) == [40 - t + 1 for t in range(m, 0, -1)]
+
+def test_paralelo_deterministico_e_independente_dos_processos():
+    jogadores, tabuleiro = _meio_de_rodada(1)
+    copias, tab = mcts_engine._copiar_estado(jogadores, tabuleiro)
+    jogadas = jogadores[0].jogadas_validas(tabuleiro.obter_pontas())
+    try:
+        totais = [
+            mcts_engine._vitorias_paralelas(
+                "J1", copias, tab, jogadas, 40, None, 0, False, 7, processos
+            )
+            for processos in (2, 3, 3)
+        ]
+        pool = mcts_engine.pool_mcts(3)
+        escolha = escolher_peca_mcts(
+            jogadores[0], jogadores, tabuleiro, 40, processos=3, rng=random.Random(7)
+        )
+        assert mcts_engine.pool_mcts(3) is pool
+    finally:
+        mcts_engine.encerrar_pool()
+    assert totais[0] == totais[1] == totais[2]
+    assert sum(totais[0]) > 0
+    assert escolha in jogadas
+
+
+
+def test_pool_so_cresce():
+    try:
+        pool = mcts_engine.pool_mcts(3)
+        assert mcts_engine.pool_mcts(2) is pool
+        assert mcts_engine.pool_mcts(3) is pool
+        maior = mcts_engine.pool_mcts(4)
+        assert maior is not pool and mcts_engine.pool_mcts(1) is maior
+    finally:
+        mcts_engine.encerrar_pool()
+
+@pytest.mark.parametrize("modo", ["flat", "uct"])
+def test_orcamento_de_tempo(modo):
+    jogadores, tabuleiro = _meio_de_rodada(1)
+    n = len(jogadores[0].jogadas_validas(tabuleiro.obter_pontas()))
+    escolher = escolher_peca_uct if modo == "uct" else escolher_peca_mcts
+
+    relatorio = {}
+    escolher(jogadores[0], jogadores, tabuleiro, None, orcamento_ms=20, relatorio=relatorio)
+    assert relatorio["motivo"] in ("prazo", "dominancia")
+    assert relatorio["simulacoes"] > 0 and relatorio["segundos"] < 0.2
+
+    relatorio = {}
+    escolher(jogadores[0], jogadores, tabuleiro, 3, orcamento_ms=10_000, relatorio=relatorio)
+    assert relatorio["motivo"] in ("limite", "dominancia")
+    assert relatorio["simulacoes"] <= 3 * n
+
+    with pytest.raises(ValueError):
+        escolher(jogadores[0], jogadores, tabuleiro, None)
+
+
+def test_dominancia():
+    assert mcts_engine._dominante([40, 2, 1], 40)
+    assert not mcts_engine._dominante([22, 18, 1], 40)
+    # abaixo do mínimo de simulações não há parada antecipada
+    assert not mcts_engine._dominante([5, 0], 5)
+    assert not mcts_engine._dominante([40], 40)
+
+
+def test_orcamento_por_cadeira():
+    relatorios = {}
+
+    class Jogador(MCTSJogador):
+        def __init__(self, nome, mao, **opcoes):
+            super().__init__(nome, mao, **opcoes)
+            relatorios.setdefault(nome, []).append(self.relatorios)
+
+    simular_partida(
+        pontos_para_vencer=1,
+        estrategias={
+            "J1": functools.partial(Jogador, orcamento_ms=2),
+            "J3": functools.partial(Jogador, simulations=2),
+        },
+        registro="nenhum",
+        sink=None,
+        semente=0,
+    )
+    j1 = [r for lista in relatorios["J1"] for r in lista if r["motivo"] != "unica"]
+    j3 = [r for lista in relatorios["J3"] for r in lista]
+    assert j1 and all(r["motivo"] in ("prazo", "dominancia") for r in j1)
+    assert j3 and all(r["motivo"] == "limite" for r in j3)
@@ -0,0 +1,69 @@
+import os
+import random
+import sys
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import motor_bitboard as mb
+from core.jogador import escolher_peca_ga
+from core.peca import Peca
+from motor_de_jogo import simular_rodada
+from utilidades.distribuicao import distribuir_jogadores
+
+
+def test_tabelas():
+    assert len(mb.PECAS) == 28
+    for v in range(7):
+        assert bin(mb.MASCARA_PIP[v]).count("1") == 7
+    assert bin(mb.MASCARA_DUPLOS).count("1") == 7
+    assert mb.indice_para_peca(mb.peca_para_indice(Peca(5, 2))) == Peca(2, 5)
+
+
+def test_conversao_ida_e_volta():
+    random.seed(3)
+    jogadores = distribuir_jogadores()
+    maos = mb.jogadores_para_maos(jogadores)
+    for j, copia in zip(jogadores, mb.maos_para_jogadores(maos)):
+        assert copia.nome == j.nome
+        assert copia.mao == j.mao
+
+
+def _paridade(seed, pesos=None, jogador_inicial=None):
+    random.seed(seed)
+    estrategias = None
+    if pesos is not None:
+        ga = lambda j, t, js, **_: escolher_peca_ga(j, t, js, pesos)
+        estrategias = {n: ga for n in mb.NOMES}
+    jogadores = distribuir_jogadores(estrategias)
+    maos = mb.jogadores_para_maos(jogadores)
+    nome_inicial = mb.NOMES[jogador_inicial] if jogador_inicial is not None else None
+
+    esperado = simular_rodada(jogadores, nome_inicial, registro="nenhum")
+    politica = mb.politica_ga(pesos) if pesos is not None else mb.politica_primeira
+    obtido = mb.simular_rodada_rapida(maos, jogador_inicial, politica)
+
+    if "erro" in esperado:
+        assert obtido is None
+        return
+    final = esperado["final"]
+    vencedor = final["vencedor_rodada"]
+    assert obtido.vencedor == (mb.NOMES.index(vencedor) if vencedor else -1)
+    assert obtido.tipo_batida == final["tipo_batida"]
+    assert obtido.motivo_fim == final["motivo_fim"]
+    assert obtido.pontuacao == final["pontuacao_rodada"]
+
+
+def test_paridade_com_simular_rodada():
+    pesos = [1.8, 15.3, 15.7, 9.4, -9.6, -1.5, -20.4, 6.4]
+    for seed in range(200):
+        _paridade(seed)
+        _paridade(seed, pesos)
+        _paridade(seed, jogador_inicial=seed % 4)
+
+
+def test_distribuir_maos_igual_a_distribuir_jogadores():
+    random.seed(11)
+    esperado = mb.jogadores_para_maos(distribuir_jogadores())
+    random.seed(11)
+    assert mb.distribuir_maos() == esperado
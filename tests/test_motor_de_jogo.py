@@ -0,0 +1,101 @@
+import os
+import random
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from motor_de_jogo import simular_rodada
+from utilidades.distribuicao import distribuir_jogadores
+
+
+def _rodada(registro, seed=7):
+    random.seed(seed)
+    jogadores = distribuir_jogadores()
+    return simular_rodada(jogadores, registro=registro)
+
+
+def test_registro_niveis():
+    completo = _rodada("completo")
+    jogadas = _rodada("jogadas")
+    nenhum = _rodada("nenhum")
+
+    assert completo["final"] == jogadas["final"] == nenhum["final"]
+    assert completo["inicio_rodada"] == nenhum["inicio_rodada"]
+    assert completo["estados"][0]["jogador"] == completo["inicio_rodada"]
+
+    assert "estados" not in jogadas
+    assert jogadas["jogadas"] == completo["jogadas"]
+    assert len(jogadas["jogadas"]) == len(completo["estados"])
+
+    assert "estados" not in nenhum
+    assert "jogadas" not in nenhum
+
+
+def test_registro_invalido():
+    with pytest.raises(ValueError):
+        _rodada("tudo")
+
+
+def test_partida_em_fluxo():
+    from motor_de_jogo import simular_partida_em_fluxo
+
+    random.seed(5)
+    eventos = list(simular_partida_em_fluxo(sink=None))
+    assert eventos[0]["evento"] == "estado"
+    assert eventos[-1]["evento"] == "fim"
+
+    rodadas = [e for e in eventos if e["evento"] == "rodada"]
+    estados = [e for e in eventos if e["evento"] == "estado"]
+    assert len({e["rodada"] for e in estados}) == len(rodadas)
+    assert rodadas[-1]["placar"] == eventos[-1]["placar"]
+    assert max(eventos[-1]["placar"].values()) >= 6
+    for e in estados:
+        assert e["estado"]["jogador"] in ("J1", "J2", "J3", "J4")
+        assert "jogadas" not in e["estado"]
+
+
+def test_endpoint_fluxo(tmp_path, monkeypatch):
+    pytest.importorskip("flask")
+    import json
+    from app_visualizador import app
+    from utilidades import historico
+
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(historico, "_sink_padrao", None)
+    random.seed(2)
+    resposta = app.test_client().post(
+        "/simular/fluxo", json={j: "Aleatório" for j in ("J1", "J2", "J3", "J4")}
+    )
+    assert resposta.mimetype == "application/x-ndjson"
+    eventos = [json.loads(l) for l in resposta.get_data(as_text=True).splitlines()]
+    assert eventos[0]["evento"] == "estado"
+    assert eventos[-1]["evento"] == "fim"
+
+
+def test_semente_reproduz_partida():
+    from core.jogador import MCTSJogador
+    from motor_de_jogo import simular_partida
+
+    estrategias = {"J1": MCTSJogador, "J3": MCTSJogador}
+    a = simular_partida(estrategias=estrategias, registro="completo", sink=None, semente=3)
+    random.random()
+    b = simular_partida(estrategias=estrategias, registro="completo", sink=None, semente=3)
+    assert a == b
+
+
+@pytest.mark.parametrize(
+    "orcamento", [0, -5, {"J1": -5}, "20", float("inf"), True, {"J2": "rápido"}]
+)
+def test_orcamento_invalido_recusado_antes_da_partida(orcamento):
+    pytest.importorskip("flask")
+    from app_visualizador import app
+
+    cliente = app.test_client()
+    pedido = {"J1": "MCTS", "J2": "MCTS", "orcamento_ms": orcamento}
+    for rota in ("/simular", "/tarefas", "/simular/fluxo"):
+        resposta = cliente.post(rota, json=pedido)
+        assert resposta.status_code == 400
+        assert "orcamento_ms" in resposta.get_json()["erro"]
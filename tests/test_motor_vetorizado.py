@@ -0,0 +1,77 @@
+import os
+import random
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+np = pytest.importorskip("numpy")
+
+import motor_bitboard as mb
+import motor_vetorizado as mv
+from core.jogador import Jogador
+from core.peca import Peca
+from core.tabuleiro import Tabuleiro
+from mcts_engine import escolher_peca_mcts
+
+
+def test_jogada_unica_bate():
+    # J1 tem apenas (5, 6) e a mesa mostra 6|6: batida lá-e-lô garantida.
+    maos = np.zeros((3, 4, mv.N_PECAS), dtype=bool)
+    maos[:, 0, mb.INDICE[(5, 6)]] = True
+    maos[:, 1, mb.INDICE[(0, 0)]] = True
+    maos[:, 2, mb.INDICE[(1, 1)]] = True
+    maos[:, 3, mb.INDICE[(2, 2)]] = True
+    r = mv.simular_lote(maos, atual=0, esquerda=6, direita=6, rng=0)
+    assert r["vencedor"].tolist() == [0, 0, 0]
+    assert [mv.TIPOS[t] for t in r["tipo"]] == ["la_e_lo"] * 3
+    assert r["pontos"].tolist() == [3, 3, 3]
+
+
+def test_travamento():
+    maos = np.zeros((1, 4, mv.N_PECAS), dtype=bool)
+    maos[0, 0, mb.INDICE[(0, 1)]] = True
+    maos[0, 1, mb.INDICE[(0, 2)]] = True
+    maos[0, 2, mb.INDICE[(3, 4)]] = True
+    maos[0, 3, mb.INDICE[(0, 3)]] = True
+    r = mv.simular_lote(maos, atual=0, esquerda=6, direita=5, rng=0)
+    assert r["vencedor"][0] == 0
+    assert mv.TIPOS[r["tipo"][0]] == "travamento"
+
+
+def test_distribuicao_compativel_com_motor_bitboard():
+    n = 20000
+    r = mv.rodadas_aleatorias(n, rng=1)
+    vet = np.bincount(r["tipo"], minlength=len(mv.TIPOS)) / len(r["tipo"])
+
+    rng = random.Random(1)
+    politica = mb.politica_aleatoria(rng)
+    contagem = dict.fromkeys(mv.TIPOS, 0)
+    total = 0
+    while total < n:
+        res = mb.simular_rodada_rapida(mb.distribuir_maos(rng), None, politica)
+        if res is None:
+            continue
+        contagem[res.tipo_batida] += 1
+        total += 1
+    ref = np.array([contagem[t] for t in mv.TIPOS]) / total
+    assert np.abs(vet - ref).max() < 0.02
+
+
+def test_mcts_vetorizado_reprodutivel():
+    tabuleiro = Tabuleiro()
+    tabuleiro.jogar(Peca(6, 6))
+    jogadores = [
+        Jogador("J1", [Peca(1, 6), Peca(5, 6), Peca(2, 3)]),
+        Jogador("J2", [Peca(1, 1), Peca(0, 4)]),
+        Jogador("J3", [Peca(2, 2), Peca(4, 6)]),
+        Jogador("J4", [Peca(3, 3), Peca(0, 5)]),
+    ]
+    escolhas = set()
+    for _ in range(2):
+        random.seed(5)
+        escolhas.add(escolher_peca_mcts(jogadores[0], jogadores, tabuleiro, 200, vetorizado=True))
+    assert len(escolhas) == 1
+    assert escolhas.pop() in (Peca(1, 6), Peca(5, 6))
@@ -0,0 +1,42 @@
+import copy
+import os
+import pickle
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from core.peca import PECAS, PECAS_POR_VALOR, Peca, mascara_pontas
+
+
+def test_instancias_unicas():
+    assert Peca(2, 5) is Peca(2, 5)
+    assert Peca(2, 5).inverter() is Peca(5, 2)
+    assert Peca(3, 3).inverter() is Peca(3, 3)
+    assert Peca(2, 5) != Peca(5, 2)
+    assert pickle.loads(pickle.dumps(Peca(4, 1))) is Peca(4, 1)
+    assert copy.deepcopy(Peca(4, 1)) is Peca(4, 1)
+
+
+def test_imutavel():
+    with pytest.raises(AttributeError):
+        Peca(1, 2).lado1 = 3
+
+
+def test_tabelas():
+    assert len(PECAS) == 28
+    assert [p.indice for p in PECAS] == list(range(28))
+    assert all(len(ps) == 7 for ps in PECAS_POR_VALOR)
+    assert Peca(6, 4).soma == 10 and Peca(6, 4).indice == Peca(4, 6).indice
+    assert Peca(6, 6).duplo and not Peca(6, 4).duplo
+    assert Peca(6, 4).mascara & mascara_pontas((4, None))
+    assert not Peca(6, 4).mascara & mascara_pontas((None, None))
+
+
+def test_valores_invalidos():
+    for lados in ((7, 9), (-1, 3), (2, 7)):
+        with pytest.raises(ValueError):
+            Peca(*lados)
+    assert (7, 9) not in Peca._registro and (2, 7) not in Peca._registro
@@ -0,0 +1,82 @@
+import os
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+np = pytest.importorskip("numpy")
+
+from core.jogador import RLLinearJogador
+from core.peca import Peca
+from motor_de_jogo import simular_partida
+from rl_linear import (
+    N_ACAO,
+    N_ESTADO,
+    RLLinearStrategy,
+    codificar_acoes,
+    codificar_estado,
+    criar_modelo,
+    descartar_modelo,
+)
+
+
+def _partidas(estrategias, n=3):
+    for k in range(n):
+        simular_partida(
+            pontos_para_vencer=2,
+            estrategias=estrategias,
+            registro="nenhum",
+            sink=None,
+            semente=k,
+        )
+
+
+def test_caracteristicas_e_avaliacao_em_lote():
+    estado = (-1, -1, -1, 0, *[0] * 7, 0, -1, 0, 6, 6, 6, 6, *[3] * 7, 0,
+              *[6] * 4, 0, 1, 0, 0, *[0] * 4, 0, 0, 3, 0, 0, 0, 0, 0, 0)
+    s = codificar_estado(estado)
+    assert s.shape == (N_ESTADO,)
+    jogadas = [Peca(6, 6), Peca(5, 4)]
+    A = codificar_acoes(jogadas, jogadas, (6, 3))
+    assert A.shape == (2, N_ACAO)
+    assert A[0, 9] == 1 and A[1, 9] == 0
+
+    rng = np.random.default_rng(0)
+    for tipo in ("linear", "mlp"):
+        modelo = criar_modelo(tipo)
+        for p in modelo.parametros().values():
+            p[...] = rng.normal(size=p.shape)
+        lote = modelo.valores(np.stack([s, s]), A)
+        assert np.allclose(modelo.avaliar(s, A), lote)
+
+
+def test_aprende_com_memoria_fixa():
+    estrategia = RLLinearStrategy(modelo="mlp", epsilon=0.2)
+    memoria = estrategia.memoria()
+    antes = {k: v.copy() for k, v in estrategia.modelo.parametros().items()}
+    _partidas({j: estrategia for j in ("J1", "J2", "J3", "J4")})
+    assert estrategia.memoria() == memoria
+    assert not estrategia._trajetorias
+    assert any(not np.array_equal(antes[k], v) for k, v in estrategia.modelo.parametros().items())
+
+
+def test_jogador_e_persistencia(tmp_path):
+    arquivo = str(tmp_path / "pesos.npz")
+    descartar_modelo()
+
+    class Jogador(RLLinearJogador):
+        def __init__(self, nome, mao):
+            super().__init__(nome, mao, arquivo=arquivo)
+
+    _partidas({"J1": Jogador, "J3": Jogador})
+    modelo = RLLinearStrategy(persistence_file=arquivo).modelo
+    modelo.W[0, 0] = 1.5
+    RLLinearStrategy(persistence_file=arquivo).save()
+
+    descartar_modelo()
+    assert RLLinearStrategy(persistence_file=arquivo).modelo.W[0, 0] == 1.5
+    with pytest.raises(ValueError):
+        RLLinearStrategy(persistence_file=arquivo, modelo="mlp")
+    descartar_modelo()
@@ -0,0 +1,77 @@
+import os
+import pickle
+import sys
+from collections import defaultdict
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import rl_engine
+from motor_de_jogo import simular_partida
+from rl_engine import RLDominoStrategy
+from rl_persistencia import PersistenciaQ, caminho_log
+
+
+def _treinar(estrategia, semente):
+    simular_partida(
+        pontos_para_vencer=2,
+        estrategias={j: estrategia for j in ("J1", "J2", "J3", "J4")},
+        registro="nenhum",
+        sink=None,
+        semente=semente,
+    )
+
+
+def _aprendidos(tabela):
+    return {k: v for k, v in tabela.items() if v != 0.0}
+
+
+def test_save_incremental_honra_caminho(tmp_path):
+    arquivo = str(tmp_path / "q.pkl")
+    rl_engine.descartar_tabela(arquivo)
+    estrategia = RLDominoStrategy(epsilon=0.3, persistence_file=arquivo)
+    _treinar(estrategia, 1)
+    estrategia.save()
+    tamanho_foto = os.path.getsize(arquivo)
+    assert not os.path.exists(caminho_log(arquivo))
+
+    _treinar(estrategia, 2)
+    estrategia.save()
+    assert os.path.getsize(arquivo) == tamanho_foto
+    assert 0 < os.path.getsize(caminho_log(arquivo))
+
+    esperado = _aprendidos(estrategia.q)
+    rl_engine.descartar_tabela(arquivo)
+    assert _aprendidos(RLDominoStrategy(persistence_file=arquivo).q) == esperado
+    compacta = RLDominoStrategy(persistence_file=arquivo, compacta=True)
+    assert _aprendidos(compacta.q) == esperado
+
+    estrategia.save(compactar=True)
+    assert not os.path.exists(caminho_log(arquivo))
+    assert _aprendidos(PersistenciaQ(arquivo).carregar(defaultdict(float))) == esperado
+    rl_engine.descartar_tabela(arquivo)
+
+
+def test_log_truncado_por_queda(tmp_path):
+    arquivo = str(tmp_path / "q.pkl")
+    persistencia = PersistenciaQ(arquivo)
+    persistencia.compactar([(("a",), 1.0)])
+    persistencia.acrescentar([(("a",), 2.0), (("b",), 3.0)])
+    intacto = os.path.getsize(caminho_log(arquivo))
+    persistencia.acrescentar([(("c",), 4.0)])
+    with open(caminho_log(arquivo), "r+b") as f:
+        f.truncate(intacto + 5)  # registro gravado pela metade
+
+    assert PersistenciaQ(arquivo).carregar({}) == {("a",): 2.0, ("b",): 3.0}
+    assert os.path.getsize(caminho_log(arquivo)) == intacto
+    persistencia.acrescentar([(("c",), 5.0)])
+    assert PersistenciaQ(arquivo).carregar({})[("c",)] == 5.0
+
+
+def test_le_pickle_antigo(tmp_path):
+    arquivo = str(tmp_path / "q.pkl")
+    with open(arquivo, "wb") as f:
+        pickle.dump({("x",): 0.5}, f)
+    persistencia = PersistenciaQ(arquivo)
+    persistencia.acrescentar([(("y",), 1.5)])
+    assert persistencia.carregar({}) == {("x",): 0.5, ("y",): 1.5}
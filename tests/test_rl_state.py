@@ -48,3 +48,57 @@ def test_simulation_runs():
         simular_partida(pontos_para_vencer=2, estrategias={'J1': s1, 'J3': s2})
     assert len(s1.q) > 0
 
+
+
+def test_tabela_q_compartilhada(monkeypatch, tmp_path):
+    import rl_engine
+
+    leituras = []
+    original = rl_engine._ler_tabela
+    monkeypatch.setattr(rl_engine, "_ler_tabela", lambda *a: leituras.append(a) or original(*a))
+    arquivo = str(tmp_path / "q.pkl")
+    rl_engine.descartar_tabela(arquivo)
+
+    s1 = RLDominoStrategy(persistence_file=arquivo)
+    s2 = RLDominoStrategy(persistence_file=arquivo)
+    assert s1.q is s2.q
+    assert len(leituras) == 1
+
+    s1.q[("x",)] = 1.0
+    assert s2.q[("x",)] == 1.0
+    rl_engine.descartar_tabela(arquivo)
+
+
+def test_retorno_lambda():
+    mc = RLDominoStrategy(alpha=1.0)
+    passos = [("a",), ("b",), ("c",)]
+    mc._aprender(passos, 1.0)
+    assert [mc.q[p] for p in passos] == [1.0, 1.0, 1.0]
+
+    td = RLDominoStrategy(alpha=1.0, lambda_td=0.5)
+    td.q.update({("b",): 0.2, ("c",): -0.4})
+    td._aprender(passos, 1.0)
+    # retorno(c) = 1; retorno(b) = 0.5·(-0.4) + 0.5·1; retorno(a) = 0.5·0.2 + 0.5·0.3
+    assert abs(td.q[("c",)] - 1.0) < 1e-12
+    assert abs(td.q[("b",)] - 0.3) < 1e-12
+    assert abs(td.q[("a",)] - 0.25) < 1e-12
+
+
+def test_trajetoria_atualiza_todas_as_decisoes():
+    from motor_de_jogo import simular_partida
+
+    def aprendidas(**opcoes):
+        s = RLDominoStrategy(epsilon=0.2, replay=opcoes.pop("replay", 0), **opcoes)
+        simular_partida(
+            pontos_para_vencer=1,
+            estrategias={j: s for j in ('J1', 'J2', 'J3', 'J4')},
+            registro="nenhum",
+            sink=None,
+            semente=3,
+        )
+        assert not s._trajetorias
+        return sum(1 for v in s.q.values() if v != 0.0)
+
+    assert aprendidas(trajetoria=False) == 1
+    assert aprendidas() > 4
+    assert aprendidas(replay=8) > 4
@@ -0,0 +1,73 @@
+import os
+import random
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from motor_de_jogo import simular_partida
+from rl_engine import RLDominoStrategy
+from rl_tabela import TabelaQCompacta, desempacotar_estado, empacotar_estado
+
+
+class _Coletora(RLDominoStrategy):
+    """Guarda os estados vistos para os testes."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.estados = []
+
+    def _state(self, *args):
+        estado = super()._state(*args)
+        self.estados.append(estado)
+        return estado
+
+
+def _partidas(estrategia, semente):
+    for k in range(3):
+        simular_partida(
+            estrategias={j: estrategia for j in ("J1", "J2", "J3", "J4")},
+            registro="nenhum",
+            sink=None,
+            semente=semente + k,
+        )
+
+
+def test_empacotamento_reversivel():
+    estrategia = _Coletora(epsilon=0.3)
+    _partidas(estrategia, 1)
+    assert estrategia.estados
+    for estado in estrategia.estados:
+        assert desempacotar_estado(empacotar_estado(estado)) == estado
+    with pytest.raises(ValueError):
+        empacotar_estado((99,) + estrategia.estados[0][1:])
+
+
+def test_tabela_como_dicionario():
+    rng = random.Random(0)
+    tabela = TabelaQCompacta(capacidade=16)
+    referencia = {}
+    for _ in range(2000):
+        chave = (rng.getrandbits(149), (rng.randrange(7), rng.randrange(7)))
+        a, b = chave[1]
+        canonica = (chave[0], (min(a, b), max(a, b)))
+        valor = rng.random()
+        tabela[chave] = valor
+        referencia[canonica] = valor
+    assert len(tabela) == len(referencia)
+    for chave, valor in referencia.items():
+        assert tabela[chave] == valor
+    assert tabela[(0, (0, 0))] == 0.0
+    assert (0, (0, 0)) not in tabela
+
+
+def test_aprendizado_igual_ao_dicionario():
+    comum = _Coletora(epsilon=0.2)
+    compacta = _Coletora(epsilon=0.2, compacta=True)
+    _partidas(comum, 10)
+    _partidas(compacta, 10)
+    assert comum.estados == compacta.estados
+    aprendidos = {k: v for k, v in comum.q.items() if v != 0.0}
+    assert dict(compacta.q.items()) == aprendidos
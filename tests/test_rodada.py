@@ -0,0 +1,76 @@
+import os
+import random
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from core.peca import Peca
+from Jogo.partida import Partida
+from Jogo.rodada import Rodada
+from motor_de_jogo import simular_rodada
+from utilidades.distribuicao import distribuir_jogadores
+
+
+def test_aplicar_e_passar_reproduzem_simular_rodada():
+    for seed in range(30):
+        random.seed(seed)
+        esperado = simular_rodada(distribuir_jogadores(), registro="jogadas")
+        if "erro" in esperado:
+            continue
+        random.seed(seed)
+        rodada = Rodada(distribuir_jogadores(), registro="jogadas")
+        for jogada in esperado["jogadas"]:
+            assert rodada.jogador_atual.nome == jogada["jogador"]
+            if jogada["tipo"] == "passe":
+                rodada.passar()
+            else:
+                rodada.aplicar(Peca(*jogada["peca"]))
+        assert rodada.terminada
+        assert rodada.resultado() == esperado
+
+
+def test_jogadas_invalidas():
+    random.seed(3)
+    rodada = Rodada(distribuir_jogadores())
+    abertura = rodada.abertura
+    assert rodada.jogadas_validas() == [abertura]
+    outra = next(p for p in rodada.jogador_atual.mao if p is not abertura)
+    with pytest.raises(ValueError):
+        rodada.aplicar(outra)
+    with pytest.raises(ValueError):
+        rodada.passar()
+    rodada.passo()
+    assert rodada.tabuleiro.pecas[0] is abertura
+    rodada.jogar_ate_o_fim()
+    with pytest.raises(ValueError):
+        rodada.passo()
+
+
+def test_partida_encadeia_rodadas():
+    random.seed(11)
+    partida = Partida(pontos_para_vencer=6)
+    vencedora = partida.jogar_ate_o_fim()
+    assert partida.venceu()
+    assert partida.duplas[vencedora].pontuacao >= 6
+    total = sum(r["final"]["pontuacao_rodada"] for r in partida.rodadas)
+    assert total == sum(partida.pontuacao_por_jogador.values())
+    for anterior, seguinte in zip(partida.rodadas, partida.rodadas[1:]):
+        vencedor = anterior["final"]["vencedor_rodada"]
+        if vencedor:
+            assert seguinte["inicio_rodada"] == vencedor
+
+
+def test_retrato():
+    random.seed(3)
+    with pytest.raises(ValueError):
+        Rodada(distribuir_jogadores(), registro="nenhum").retrato()
+    rodada = Rodada(distribuir_jogadores(), registro="jogadas")
+    with pytest.raises(ValueError):
+        rodada.retrato()
+    mao = [(p.lado1, p.lado2) for p in rodada.jogador_atual.mao]
+    rodada.passo()
+    # na abertura ``jogadas_disponiveis`` continua sendo a mão inteira
+    assert rodada.retrato()["jogadas_disponiveis"] == mao
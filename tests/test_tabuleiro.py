@@ -0,0 +1,117 @@
+import os
+import random
+import sys
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from core.peca import Peca
+from core.tabuleiro import Tabuleiro
+from utilidades.distribuicao import distribuir_jogadores
+
+
+def _recontar(tabuleiro):
+    jogados = [0] * 7
+    for p in tabuleiro.pecas:
+        jogados[p.lado1] += 1
+        if p.lado2 != p.lado1:
+            jogados[p.lado2] += 1
+    restantes = [7 - c for c in jogados]
+    fechados = sum(1 << v for v, r in enumerate(restantes) if r == 0)
+    soma = sum(p.soma for p in tabuleiro.pecas)
+    return jogados, restantes, fechados, soma
+
+
+def _verificar(tabuleiro):
+    jogados, restantes, fechados, soma = _recontar(tabuleiro)
+    assert tabuleiro.contagem_por_valor() == jogados
+    assert tabuleiro.restantes_por_valor() == restantes
+    assert tabuleiro.mascara_fechados == fechados
+    assert tabuleiro.soma_pips == soma
+
+
+def test_contadores_consistentes():
+    for seed in range(50):
+        random.seed(seed)
+        jogadores = distribuir_jogadores()
+        tabuleiro = Tabuleiro()
+        passes = atual = 0
+        while passes < 4:
+            j = jogadores[atual % 4]
+            jogadas = j.jogadas_validas(tabuleiro.obter_pontas())
+            if jogadas:
+                p = random.choice(jogadas)
+                j.remover_peca(p)
+                tabuleiro.jogar(p)
+                passes = 0
+                _verificar(tabuleiro)
+                if not j.mao:
+                    break
+            else:
+                passes += 1
+            atual += 1
+
+
+def test_copia_independente():
+    tabuleiro = Tabuleiro()
+    tabuleiro.jogar(Peca(6, 6))
+    copia = tabuleiro.copiar()
+    copia.jogar(Peca(6, 1))
+    _verificar(copia)
+    _verificar(tabuleiro)
+    assert len(tabuleiro.pecas) == 1
+    assert tabuleiro.restantes_por_valor()[6] == 6
+    assert copia.restantes_por_valor()[6] == 5
+
+
+def test_jogar_e_desfazer_restaura_estado():
+    for seed in range(50):
+        random.seed(seed)
+        jogadores = distribuir_jogadores()
+        tabuleiro = Tabuleiro()
+        estados = []
+        pilha = []
+        passes = atual = 0
+        while passes < 4:
+            j = jogadores[atual % 4]
+            pontas = tabuleiro.obter_pontas()
+            jogadas = j.jogadas_validas(pontas)
+            estados.append((
+                [list(x.mao) for x in jogadores],
+                list(tabuleiro.pecas),
+                pontas,
+                tabuleiro.passes_consecutivos,
+                j.valores_comprovadamente_ausentes(),
+            ))
+            if jogadas:
+                p = random.choice(jogadas)
+                posicao = j.remover_peca(p)
+                lado = tabuleiro.jogar(p)
+                pilha.append((j, "jogada", (p, posicao, lado, tabuleiro.resetar_passes())))
+                passes = 0
+                if not j.mao:
+                    break
+            else:
+                novos = j.registrar_passe(pontas) if None not in pontas else set()
+                pilha.append((j, "passe", (novos, tabuleiro.registrar_passe())))
+                passes += 1
+            atual += 1
+
+        while pilha:
+            j, tipo, token = pilha.pop()
+            if tipo == "jogada":
+                p, posicao, lado, passes_antes = token
+                tabuleiro.desfazer(lado)
+                j.devolver_peca(p, posicao)
+            else:
+                novos, passes_antes = token
+                j.desfazer_passe(novos)
+            tabuleiro.restaurar_passes(passes_antes)
+            _verificar(tabuleiro)
+            maos, pecas, pontas, passes_consec, ausentes = estados.pop()
+            assert [list(x.mao) for x in jogadores] == maos
+            assert list(tabuleiro.pecas) == pecas
+            assert tabuleiro.obter_pontas() == pontas
+            assert tabuleiro.passes_consecutivos == passes_consec
+            assert j.valores_comprovadamente_ausentes() == ausentes
+        assert tabuleiro.esta_vazio()
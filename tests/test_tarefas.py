@@ -0,0 +1,65 @@
+import os
+import sys
+import time
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from utilidades.tarefas import CANCELADA, CONCLUIDA, ERRO, FilaCheia, GerenciadorTarefas
+
+
+def test_resultado_e_erro():
+    with GerenciadorTarefas(processos=1) as tarefas:
+        ok = tarefas.submeter(pow, 2, 10)
+        falha = tarefas.submeter(int, "x")
+        assert tarefas.resultado(ok, timeout=30) == 1024
+        assert tarefas.estado(ok)["status"] == CONCLUIDA
+        with pytest.raises(ValueError):
+            tarefas.resultado(falha, timeout=30)
+        assert tarefas.estado(falha)["status"] == ERRO
+        with pytest.raises(KeyError):
+            tarefas.estado("inexistente")
+
+
+def test_cancelamento_e_limite():
+    with GerenciadorTarefas(processos=1, limite_pendentes=4) as tarefas:
+        ids = [tarefas.submeter(time.sleep, 0.5) for _ in range(4)]
+        with pytest.raises(FilaCheia):
+            tarefas.submeter(time.sleep, 0)
+        assert tarefas.cancelar(ids[-1])
+        assert tarefas.estado(ids[-1])["status"] == CANCELADA
+        # A vaga liberada pelo cancelamento volta a aceitar tarefas
+        extra = tarefas.submeter(pow, 3, 2)
+        assert tarefas.resultado(extra, timeout=30) == 9
+
+
+def test_limite_concluidas():
+    with GerenciadorTarefas(processos=1, limite_concluidas=2) as tarefas:
+        ids = [tarefas.submeter(pow, 2, k) for k in range(4)]
+        for id_tarefa in ids:
+            tarefas.resultado(id_tarefa, timeout=30)
+        time.sleep(0.1)
+        with pytest.raises(KeyError):
+            tarefas.estado(ids[0])
+        assert tarefas.estado(ids[-1])["status"] == CONCLUIDA
+
+
+def test_ao_concluir_roda_no_processo_principal():
+    vistos = []
+
+    def concluir(valor):
+        vistos.append((os.getpid(), valor))
+        return valor + 1
+
+    with GerenciadorTarefas(processos=1) as tarefas:
+        ok = tarefas.submeter(pow, 2, 10, ao_concluir=concluir)
+        assert tarefas.resultado(ok, timeout=30) == 1025
+        assert tarefas.estado(ok)["status"] == CONCLUIDA
+        assert vistos == [(os.getpid(), 1024)]
+
+        falha = tarefas.submeter(pow, 2, 1, ao_concluir=lambda valor: 1 // 0)
+        with pytest.raises(ZeroDivisionError):
+            tarefas.resultado(falha, timeout=30)
+        assert tarefas.estado(falha)["status"] == ERRO
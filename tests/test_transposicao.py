@@ -0,0 +1,74 @@
+import os
+import random
+import sys
+
+import pytest
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+from core.jogador import MCTSJogador
+from core.tabuleiro import Tabuleiro
+from mcts_engine import escolher_peca_uct
+from transposicao import TabelaTransposicao, hash_jogada, hash_posicao
+from utilidades.distribuicao import distribuir_jogadores
+
+
+def test_hash_incremental_igual_ao_completo():
+    rng = random.Random(4)
+    for _ in range(20):
+        jogadores = distribuir_jogadores(rng=rng)
+        tabuleiro = Tabuleiro()
+        vez = passes = 0
+        h = hash_posicao(jogadores, tabuleiro, vez)
+        while passes < 4 and all(j.mao for j in jogadores):
+            pontas = tabuleiro.obter_pontas()
+            jogadas = jogadores[vez].jogadas_validas(pontas)
+            peca = rng.choice(jogadas) if jogadas else None
+            h = hash_jogada(h, vez, 4, peca, pontas, passes)
+            if peca is None:
+                passes += 1
+            else:
+                jogadores[vez].remover_peca(peca)
+                tabuleiro.jogar(peca)
+                passes = 0
+            vez = (vez + 1) % 4
+            assert h == hash_posicao(jogadores, tabuleiro, vez, passes)
+
+
+@pytest.mark.parametrize(
+    "politica, sai",
+    [("visitas", 2), ("sempre", 1), ("geracao", 1)],
+)
+def test_politicas_de_substituicao(politica, sai):
+    # capacidade 2: um único balde com duas entradas
+    tabela = TabelaTransposicao(2, politica)
+    for h in (1 << 40, 2 << 40):
+        tabela.inserir(h)
+    tabela.atualizar(1 << 40, 1.0)
+    tabela.nova_geracao()
+    tabela.buscar(2 << 40)
+    tabela.inserir(3 << 40)
+    assert tabela.buscar(sai << 40) < 0
+    assert tabela.buscar(3 << 40) >= 0
+    assert len(tabela) == 2 and tabela.substituicoes == 1
+
+
+def test_uct_com_tabela():
+    random.seed(2)
+    jogadores = distribuir_jogadores()
+    tabuleiro = Tabuleiro()
+    tabela = TabelaTransposicao(1 << 10)
+    memoria = tabela.memoria()
+    peca = escolher_peca_uct(
+        jogadores[0], jogadores, tabuleiro, 30, tabela=tabela, rng=random.Random(0)
+    )
+    assert peca in jogadores[0].mao
+    estatisticas = tabela.estatisticas()
+    assert 0 < estatisticas["entradas"] <= tabela.capacidade
+    assert 0 < estatisticas["taxa_acerto"] < 1
+    assert estatisticas["memoria"] == memoria
+
+    with pytest.raises(ValueError):
+        MCTSJogador("J1", [], transposicao=1024)
+    assert MCTSJogador("J1", [], modo="uct", transposicao=1024).arvore is None
@@ -0,0 +1,40 @@
+import os
+import sys
+
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(__file__)))
+
+import rl_engine
+from rl_engine import RLDominoStrategy
+from treino_rl import Aprendiz, treinar
+
+
+def test_aprendiz_mescla_e_distribui():
+    soma = Aprendiz(RLDominoStrategy())
+    soma.atualizacoes(0)
+    soma.atualizacoes(1)
+    soma.mesclar([(("a",), 0.5, 2, 0.5)])
+    soma.mesclar([(("a",), 0.25, 1, 0.25), (("b",), -1.0, 1, -1.0)])
+    assert soma.q[("a",)] == 0.75
+    assert dict(soma.atualizacoes(0)) == {("a",): 0.75, ("b",): -1.0}
+    assert soma.atualizacoes(0) == []
+    soma.dispensar(1)
+    assert soma._historico == []
+
+    media = Aprendiz(RLDominoStrategy(), "media")
+    media.mesclar([(("a",), 0.5, 3, 0.5)])
+    media.mesclar([(("a",), 1.0, 1, 1.0)])
+    assert media.q[("a",)] == 0.625
+
+
+def test_treino_paralelo_grava_tabela(tmp_path):
+    arquivo = str(tmp_path / "q.pkl")
+    rl_engine.descartar_tabela(arquivo)
+    estatisticas = treinar(2, 6, intervalo=2, arquivo=arquivo, pontos_para_vencer=2, semente=0)
+    assert estatisticas["partidas"] == 6
+    assert estatisticas["sincronizacoes"] == 3
+    assert estatisticas["partidas_por_segundo"] > 0
+
+    rl_engine.descartar_tabela(arquivo)
+    assert len(RLDominoStrategy(persistence_file=arquivo).q) == estatisticas["entradas"]
+    rl_engine.descartar_tabela(arquivo)
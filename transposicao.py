@@ -0,0 +1,228 @@
+"""transposicao.py - Hash de Zobrist e tabela de transposição para a busca
+
+Ordens diferentes de jogadas chegam muitas vezes à mesma posição: mesmas
+pontas, mesmas peças em cada mão, mesmo jogador da vez e mesmo número de
+passes seguidos. O hash de Zobrist de uma posição é o XOR de um número
+aleatório de 64 bits por peça em cada mão, por valor de cada ponta, pelo
+jogador da vez e pelos passes. Uma jogada muda poucos termos, então o hash
+do filho sai do hash do pai com alguns XOR (:func:`hash_jogada`), sem jogar
+a peça. As peças da mesa e as que estão fora do jogo ficam implícitas: numa
+mesma busca elas são o complemento das mãos.
+
+``TabelaTransposicao`` guarda visitas e vitórias por hash em arrays de
+tamanho fixo, com baldes de duas entradas e política de substituição
+configurável.
+"""
+
+from __future__ import annotations
+
+import random
+from array import array
+from typing import Optional, Sequence
+
+from core.jogador import Jogador
+from core.peca import Peca
+from core.tabuleiro import Tabuleiro
+
+MAX_JOGADORES = 4
+_SEM_PONTA = 7
+
+_rng = random.Random(0x5EED_D0_1A0)
+Z_PECA = [[_rng.getrandbits(64) for _ in range(28)] for _ in range(MAX_JOGADORES)]
+"""``Z_PECA[cadeira][peca.indice]``: peça na mão da cadeira."""
+Z_PONTA = [[_rng.getrandbits(64) for _ in range(8)] for _ in range(2)]
+"""``Z_PONTA[lado][valor]``: valor da ponta esquerda (0) ou direita (1); 7 = mesa vazia."""
+Z_VEZ = [_rng.getrandbits(64) for _ in range(MAX_JOGADORES)]
+Z_PASSES = [_rng.getrandbits(64) for _ in range(MAX_JOGADORES + 1)]
+del _rng
+
+
+def _ponta(valor: Optional[int]) -> int:
+    return _SEM_PONTA if valor is None else valor
+
+
+def hash_posicao(jogadores: Sequence[Jogador], tabuleiro: Tabuleiro, vez: int, passes: int = 0) -> int:
+    """Hash completo da posição com ``jogadores[vez]`` para jogar."""
+    h = Z_VEZ[vez] ^ Z_PASSES[passes]
+    esquerda, direita = tabuleiro.obter_pontas()
+    h ^= Z_PONTA[0][_ponta(esquerda)] ^ Z_PONTA[1][_ponta(direita)]
+    for cadeira, jogador in enumerate(jogadores):
+        z = Z_PECA[cadeira]
+        for peca in jogador.mao:
+            h ^= z[peca.indice]
+    return h
+
+
+def pontas_apos(pontas: tuple, peca: Peca) -> tuple:
+    """Pontas depois de ``Tabuleiro.jogar(peca)``, sem alterar o tabuleiro."""
+    esquerda, direita = pontas
+    a, b = peca.lado1, peca.lado2
+    if esquerda is None:
+        return a, b
+    if a == esquerda or b == esquerda:
+        return a + b - esquerda, direita
+    return esquerda, a + b - direita
+
+
+def hash_jogada(h: int, vez: int, n: int, peca: Optional[Peca], pontas: tuple, passes: int) -> int:
+    """Hash da posição após ``jogadores[vez]`` jogar ``peca`` (``None`` = passe).
+
+    ``h``, ``pontas`` e ``passes`` descrevem a posição atual.
+    """
+    h ^= Z_VEZ[vez] ^ Z_VEZ[(vez + 1) % n] ^ Z_PASSES[passes]
+    if peca is None:
+        return h ^ Z_PASSES[passes + 1]
+    h ^= Z_PECA[vez][peca.indice] ^ Z_PASSES[0]
+    novas = pontas_apos(pontas, peca)
+    if novas[0] != pontas[0]:
+        h ^= Z_PONTA[0][_ponta(pontas[0])] ^ Z_PONTA[0][novas[0]]
+    if novas[1] != pontas[1]:
+        h ^= Z_PONTA[1][_ponta(pontas[1])] ^ Z_PONTA[1][novas[1]]
+    return h
+
+
+# ---------------------------------------------------------------------------
+# Tabela de transposição
+# ---------------------------------------------------------------------------
+POLITICAS = ("visitas", "geracao", "sempre")
+"""Quem sai quando o balde está cheio.
+
+- ``visitas``: a entrada com menos visitas (preserva as bem estimadas);
+- ``geracao``: a de busca mais antiga (:meth:`TabelaTransposicao.nova_geracao`),
+  e entre as da mesma busca a com menos visitas;
+- ``sempre``: a inserida há mais tempo.
+"""
+
+_VIAS = 2
+
+
+class TabelaTransposicao:
+    """Visitas e vitórias por posição em ``capacidade`` entradas fixas.
+
+    O hash escolhe um balde de duas entradas; uma posição nova ocupa uma
+    entrada livre do balde ou substitui uma segundo ``politica``. A memória
+    não cresce depois da criação (:meth:`memoria`). ``consultas`` e
+    ``acertos`` contam as buscas de :meth:`buscar`.
+    """
+
+    def __init__(self, capacidade: int = 1 << 16, politica: str = "visitas"):
+        if politica not in POLITICAS:
+            raise ValueError(f"Política de substituição inválida: {politica!r}")
+        if capacidade < _VIAS:
+            raise ValueError("capacidade deve ser pelo menos 2")
+        bits = max(0, (capacidade // _VIAS - 1).bit_length())
+        self.politica = politica
+        self._por_geracao = politica == "geracao"
+        self.capacidade = _VIAS << bits
+        self._mascara = (1 << bits) - 1
+        self._chaves = array("Q", [0]) * self.capacidade
+        self.visitas = array("L", [0]) * self.capacidade
+        self.vitorias = array("d", [0.0]) * self.capacidade
+        # inserção (``sempre``) ou geração do último acesso (``geracao``)
+        self._marcas = array("Q", [0]) * self.capacidade
+        self._relogio = 0
+        self.geracao = 0
+        self.consultas = 0
+        self.acertos = 0
+        self.substituicoes = 0
+        self._n = 0
+
+    @staticmethod
+    def _chave(h: int) -> int:
+        # zero marca entrada livre
+        return h or 1
+
+    def _balde(self, h: int) -> int:
+        return ((h >> 16) & self._mascara) * _VIAS
+
+    def _posicao(self, h: int) -> int:
+        # ``_chave`` e ``_balde`` expandidos: é o caminho mais quente da busca
+        chave = h or 1
+        i = ((h >> 16) & self._mascara) * _VIAS
+        chaves = self._chaves
+        if chaves[i] == chave:
+            return i
+        if chaves[i + 1] == chave:
+            return i + 1
+        return -1
+
+    def buscar(self, h: int) -> int:
+        """Índice da entrada de ``h`` nos arrays ``visitas``/``vitorias``, ou ``-1``."""
+        self.consultas += 1
+        j = self._posicao(h)
+        if j >= 0:
+            self.acertos += 1
+            if self._por_geracao:
+                self._marcas[j] = self.geracao
+        return j
+
+    def inserir(self, h: int) -> int:
+        """Entrada para ``h`` (a existente ou uma nova, zerada)."""
+        j = self._posicao(h)
+        if j >= 0:
+            return j
+        i = self._balde(h)
+        livres = [k for k in range(i, i + _VIAS) if not self._chaves[k]]
+        if livres:
+            j = livres[0]
+            self._n += 1
+        else:
+            j = min(range(i, i + _VIAS), key=self._prioridade)
+            self.substituicoes += 1
+        self._chaves[j] = self._chave(h)
+        self.visitas[j] = 0
+        self.vitorias[j] = 0.0
+        if self.politica == "sempre":
+            self._relogio += 1
+            self._marcas[j] = self._relogio
+        else:
+            self._marcas[j] = self.geracao
+        return j
+
+    def _prioridade(self, j: int):
+        if self.politica == "visitas":
+            return self.visitas[j]
+        if self.politica == "geracao":
+            return self._marcas[j], self.visitas[j]
+        return self._marcas[j]
+
+    def atualizar(self, h: int, recompensa: float) -> None:
+        """Soma uma visita e ``recompensa``; ignora posições já substituídas."""
+        j = self._posicao(h)
+        if j >= 0:
+            self.visitas[j] += 1
+            self.vitorias[j] += recompensa
+
+    def visitas_de(self, h: int) -> int:
+        j = self._posicao(h)
+        return self.visitas[j] if j >= 0 else 0
+
+    def nova_geracao(self) -> None:
+        """Marca o início de uma nova busca (usado pela política ``geracao``)."""
+        self.geracao += 1
+
+    def limpar(self) -> None:
+        self.__init__(self.capacidade, self.politica)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def taxa_acerto(self) -> float:
+        return self.acertos / self.consultas if self.consultas else 0.0
+
+    def memoria(self) -> int:
+        """Bytes ocupados pelos arrays da tabela."""
+        return sum(
+            a.itemsize * len(a) for a in (self._chaves, self.visitas, self.vitorias, self._marcas)
+        )
+
+    def estatisticas(self) -> dict:
+        return {
+            "entradas": self._n,
+            "capacidade": self.capacidade,
+            "consultas": self.consultas,
+            "acertos": self.acertos,
+            "taxa_acerto": self.taxa_acerto(),
+            "substituicoes": self.substituicoes,
+            "memoria": self.memoria(),
+        }
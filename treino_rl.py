@@ -0,0 +1,285 @@
+"""treino_rl.py - treino de ``RLDominoStrategy`` por autojogo em paralelo
+
+``atores`` processos jogam partidas com os quatro assentos controlados pela
+mesma tabela Q local. A cada ``intervalo`` partidas cada ator envia ao
+aprendiz (o processo principal) as alterações que fez desde a última
+sincronização e recebe de volta os valores atualizados por todos os atores.
+O aprendiz é dono da tabela global e a persiste em ``arquivo`` com
+checkpoints incrementais (ver :mod:`rl_persistencia`)::
+
+    python treino_rl.py --atores 4 --partidas 2000 --intervalo 25
+
+As sincronizações são assíncronas (cada ator segue jogando assim que recebe
+a resposta), então a ordem das mesclagens depende do escalonamento e o
+resultado não é reproduzível mesmo com ``semente``.
+"""
+
+from __future__ import annotations
+
+import argparse
+import multiprocessing as mp
+import queue
+import random
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from motor_de_jogo import simular_partida
+from rl_engine import ARQUIVO_PADRAO, RLDominoStrategy
+
+JOGADORES = ("J1", "J2", "J3", "J4")
+MESCLAS = ("delta", "media")
+
+# (chave, variação desde a sincronização, nº de atualizações, valor local)
+ItemDelta = Tuple[tuple, float, int, float]
+
+
+class _EstrategiaAtor(RLDominoStrategy):
+    """Estratégia de um assento do ator; todos os assentos dividem ``q``.
+
+    Antes de cada atualização guarda o valor de base da chave (o da última
+    sincronização) e conta as atualizações, para montar o delta enviado ao
+    aprendiz.
+    """
+
+    def __init__(self, q, base: dict, visitas: dict, **opcoes):
+        super().__init__(**opcoes)
+        self.q = q
+        self.base = base
+        self.visitas = visitas
+
+    def _atualizar(self, chave, alvo):
+        if chave not in self.base:
+            self.base[chave] = self.q.get(chave, 0.0)
+        self.visitas[chave] = self.visitas.get(chave, 0) + 1
+        super()._atualizar(chave, alvo)
+
+
+def _ator(indice, tabela, opcoes, pontos_para_vencer, semente, entrada, saida) -> None:
+    q = defaultdict(float, tabela)
+    del tabela
+    base: dict = {}
+    visitas: dict = {}
+    estrategias = {j: _EstrategiaAtor(q, base, visitas, **opcoes) for j in JOGADORES}
+    rng = random.Random(None if semente is None else f"{semente}:{indice}")
+    while True:
+        ordem = entrada.get()
+        if ordem is None:
+            return
+        n_partidas, atualizacoes = ordem
+        q.update(atualizacoes)
+        for _ in range(n_partidas):
+            simular_partida(
+                pontos_para_vencer=pontos_para_vencer,
+                estrategias=estrategias,
+                registro="nenhum",
+                sink=None,
+                semente=rng.getrandbits(32),
+            )
+        delta = [(k, q[k] - b, visitas[k], q[k]) for k, b in base.items()]
+        base.clear()
+        visitas.clear()
+        saida.put((indice, n_partidas, delta))
+
+
+class Aprendiz:
+    """Tabela Q global que mescla os deltas dos atores.
+
+    ``mescla="delta"`` soma as variações de cada ator (como se as
+    atualizações tivessem sido feitas em sequência na mesma tabela);
+    ``mescla="media"`` faz a média dos valores dos atores ponderada pelo
+    número de atualizações de cada chave ao longo do treino.
+    """
+
+    def __init__(self, estrategia: RLDominoStrategy, mescla: str = "delta"):
+        if mescla not in MESCLAS:
+            raise ValueError(f"Mescla inválida: {mescla!r}")
+        self.estrategia = estrategia
+        self.mescla = mescla
+        self.visitas: Dict[tuple, int] = defaultdict(int)
+        self.versao = 0
+        # (versão, chaves alteradas) ainda não enviadas a algum ator
+        self._historico: List[Tuple[int, List[tuple]]] = []
+        self._vistas: Dict[int, int] = {}
+
+    @property
+    def q(self):
+        return self.estrategia.q
+
+    def mesclar(self, itens: List[ItemDelta]) -> None:
+        q = self.q
+        alteradas = self.estrategia._alteradas
+        for chave, delta, n, valor in itens:
+            if self.mescla == "delta":
+                q[chave] += delta
+            else:
+                total = self.visitas[chave] + n
+                q[chave] += (valor - q[chave]) * n / total
+                self.visitas[chave] = total
+            alteradas.add(chave)
+        self.versao += 1
+        self._historico.append((self.versao, [chave for chave, *_ in itens]))
+
+    def atualizacoes(self, ator: int) -> List[Tuple[tuple, float]]:
+        """Valores das chaves alteradas desde a última consulta de ``ator``."""
+        desde = self._vistas.get(ator, 0)
+        chaves = set()
+        for versao, alteradas in self._historico:
+            if versao > desde:
+                chaves.update(alteradas)
+        self._vistas[ator] = self.versao
+        self._podar()
+        return [(chave, self.q[chave]) for chave in chaves]
+
+    def dispensar(self, ator: int) -> None:
+        """``ator`` não receberá mais atualizações."""
+        self._vistas.pop(ator, None)
+        self._podar()
+
+    def _podar(self) -> None:
+        # descarta as versões que todos os atores ativos já receberam
+        minimo = min(self._vistas.values(), default=self.versao)
+        self._historico = [h for h in self._historico if h[0] > minimo]
+
+
+def treinar(
+    atores: int = 2,
+    partidas: int = 100,
+    *,
+    intervalo: int = 10,
+    arquivo: Optional[str] = ARQUIVO_PADRAO,
+    alpha: float = 0.1,
+    epsilon: float = 0.1,
+    lambda_td: float = 1.0,
+    replay: int = 0,
+    pontos_para_vencer: int = 6,
+    mescla: str = "delta",
+    checkpoint_a_cada: int = 1000,
+    semente: Optional[int] = None,
+    progresso: bool = False,
+) -> dict:
+    """Treina por ``partidas`` partidas e retorna estatísticas do treino.
+
+    ``intervalo`` é o número de partidas de cada ator entre sincronizações e
+    ``checkpoint_a_cada`` o de partidas entre gravações de ``arquivo`` (sem
+    ``arquivo`` nada é gravado). ``lambda_td`` e ``replay`` são repassados à
+    estratégia de cada assento dos atores.
+    """
+    if atores < 1 or intervalo < 1:
+        raise ValueError("atores e intervalo devem ser positivos")
+    estrategia = RLDominoStrategy(
+        alpha=alpha, epsilon=epsilon, persistence_file=arquivo, lambda_td=lambda_td
+    )
+    aprendiz = Aprendiz(estrategia, mescla)
+    tabela = dict(estrategia.q)
+    opcoes = {"alpha": alpha, "epsilon": epsilon, "lambda_td": lambda_td, "replay": replay}
+
+    saida = mp.Queue()
+    entradas = [mp.Queue() for _ in range(atores)]
+    processos = [
+        mp.Process(
+            target=_ator,
+            args=(i, tabela, opcoes, pontos_para_vencer, semente, entradas[i], saida),
+            daemon=True,
+        )
+        for i in range(atores)
+    ]
+    del tabela
+    inicio = time.perf_counter()
+    for p in processos:
+        p.start()
+
+    a_distribuir = partidas
+    for i, entrada in enumerate(entradas):
+        n = min(intervalo, a_distribuir)
+        a_distribuir -= n
+        entrada.put((n, aprendiz.atualizacoes(i)) if n else None)
+    ativos = sum(1 for i in range(atores) if i * intervalo < partidas)
+
+    concluidas = sincronizacoes = 0
+    proximo_checkpoint = checkpoint_a_cada
+    ultimo_relato = inicio
+    try:
+        while ativos:
+            try:
+                indice, n, delta = saida.get(timeout=1.0)
+            except queue.Empty:
+                if any(p.exitcode not in (None, 0) for p in processos):
+                    raise RuntimeError("Um ator terminou com erro")
+                continue
+            aprendiz.mesclar(delta)
+            concluidas += n
+            sincronizacoes += 1
+            n = min(intervalo, a_distribuir)
+            a_distribuir -= n
+            if n:
+                entradas[indice].put((n, aprendiz.atualizacoes(indice)))
+            else:
+                entradas[indice].put(None)
+                aprendiz.dispensar(indice)
+                ativos -= 1
+            if arquivo and concluidas >= proximo_checkpoint:
+                estrategia.save()
+                proximo_checkpoint += checkpoint_a_cada
+            if progresso and time.perf_counter() - ultimo_relato >= 1.0:
+                ultimo_relato = time.perf_counter()
+                decorrido = ultimo_relato - inicio
+                print(f"{concluidas}/{partidas} partidas, {concluidas / decorrido:.1f} partidas/s")
+    finally:
+        for p in processos:
+            p.join(timeout=5)
+            if p.is_alive():
+                p.terminate()
+
+    segundos = time.perf_counter() - inicio
+    if arquivo:
+        estrategia.save()
+    return {
+        "partidas": concluidas,
+        "segundos": segundos,
+        "partidas_por_segundo": concluidas / segundos if segundos else 0.0,
+        "sincronizacoes": sincronizacoes,
+        "entradas": len(estrategia.q),
+    }
+
+
+def main(argv=None) -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--atores", type=int, default=mp.cpu_count())
+    parser.add_argument("--partidas", type=int, default=1000)
+    parser.add_argument("--intervalo", type=int, default=10)
+    parser.add_argument("--arquivo", default=ARQUIVO_PADRAO)
+    parser.add_argument("--alpha", type=float, default=0.1)
+    parser.add_argument("--epsilon", type=float, default=0.1)
+    parser.add_argument("--lambda-td", type=float, default=1.0)
+    parser.add_argument("--replay", type=int, default=0)
+    parser.add_argument("--pontos", type=int, default=6)
+    parser.add_argument("--mescla", choices=MESCLAS, default="delta")
+    parser.add_argument("--checkpoint", type=int, default=1000)
+    parser.add_argument("--semente", type=int)
+    args = parser.parse_args(argv)
+
+    estatisticas = treinar(
+        args.atores,
+        args.partidas,
+        intervalo=args.intervalo,
+        arquivo=args.arquivo,
+        alpha=args.alpha,
+        epsilon=args.epsilon,
+        lambda_td=args.lambda_td,
+        replay=args.replay,
+        pontos_para_vencer=args.pontos,
+        mescla=args.mescla,
+        checkpoint_a_cada=args.checkpoint,
+        semente=args.semente,
+        progresso=True,
+    )
+    print(
+        f"{estatisticas['partidas']} partidas em {estatisticas['segundos']:.1f} s "
+        f"({estatisticas['partidas_por_segundo']:.1f} partidas/s), "
+        f"{estatisticas['entradas']} entradas na tabela"
+    )
+
+
+if __name__ == "__main__":
+    main()
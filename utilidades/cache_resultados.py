@@ -0,0 +1,135 @@
+"""Cache LRU de resultados de simulação, com camada opcional em disco.
+
+Partidas com ``semente`` são reproduzíveis, então o resultado de uma mesma
+combinação (estratégias por assento, semente, pontos para vencer) pode ser
+reaproveitado. A camada em memória guarda as ``capacidade`` entradas usadas
+mais recentemente; com ``pasta`` cada entrada também é gravada em JSON, o
+que permite compartilhá-la entre processos e reinícios do servidor.
+"""
+
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+CAPACIDADE_PADRAO = 64
+CAPACIDADE_DISCO_PADRAO = 1024
+
+
+def chave_simulacao(estrategias: Dict[str, str], semente: int, pontos_para_vencer: int) -> str:
+    """Chave canônica de uma simulação (independe da ordem de ``estrategias``)."""
+    return json.dumps(
+        [sorted(estrategias.items()), semente, pontos_para_vencer],
+        separators=(",", ":"),
+    )
+
+
+class CacheResultados:
+    """LRU limitado por número de entradas, seguro entre threads.
+
+    ``capacidade_disco`` limita os arquivos em ``pasta``; ao passar do
+    limite os menos recentes (por data de modificação) são apagados.
+    """
+
+    def __init__(
+        self,
+        capacidade: int = CAPACIDADE_PADRAO,
+        pasta: Optional[str] = None,
+        *,
+        capacidade_disco: int = CAPACIDADE_DISCO_PADRAO,
+    ):
+        if capacidade < 1:
+            raise ValueError("capacidade deve ser positiva")
+        self.capacidade = capacidade
+        self.pasta = pasta
+        self.capacidade_disco = capacidade_disco
+        self._memoria: "OrderedDict[str, Any]" = OrderedDict()
+        self._trava = threading.Lock()
+        self.acertos = 0
+        self.faltas = 0
+        if pasta:
+            os.makedirs(pasta, exist_ok=True)
+
+    def __len__(self) -> int:
+        return len(self._memoria)
+
+    def _arquivo(self, chave: str) -> str:
+        return os.path.join(self.pasta, hashlib.sha1(chave.encode()).hexdigest() + ".json")
+
+    def obter(self, chave: str) -> Optional[Any]:
+        """Valor de ``chave`` ou ``None``; acertos em disco sobem para a memória."""
+        with self._trava:
+            if chave in self._memoria:
+                self._memoria.move_to_end(chave)
+                self.acertos += 1
+                return self._memoria[chave]
+        valor = self._ler_disco(chave)
+        with self._trava:
+            if valor is None:
+                self.faltas += 1
+                return None
+            self.acertos += 1
+            self._guardar_memoria(chave, valor)
+        return valor
+
+    def guardar(self, chave: str, valor: Any) -> None:
+        with self._trava:
+            self._guardar_memoria(chave, valor)
+        if self.pasta:
+            self._gravar_disco(chave, valor)
+
+    def _guardar_memoria(self, chave: str, valor: Any) -> None:
+        self._memoria[chave] = valor
+        self._memoria.move_to_end(chave)
+        while len(self._memoria) > self.capacidade:
+            self._memoria.popitem(last=False)
+
+    # ------------------------------------------------------------------
+    # Disco
+    # ------------------------------------------------------------------
+    def _ler_disco(self, chave: str) -> Optional[Any]:
+        if not self.pasta:
+            return None
+        caminho = self._arquivo(chave)
+        try:
+            with open(caminho) as f:
+                guardado_chave, valor = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if guardado_chave != chave:
+            return None
+        os.utime(caminho)  # marca como usado recentemente
+        return valor
+
+    def _gravar_disco(self, chave: str, valor: Any) -> None:
+        caminho = self._arquivo(chave)
+        temporario = f"{caminho}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporario, "w") as f:
+            json.dump([chave, valor], f)
+        os.replace(temporario, caminho)
+        self._podar_disco()
+
+    def _podar_disco(self) -> None:
+        arquivos = []
+        for nome in os.listdir(self.pasta):
+            if not nome.endswith(".json"):
+                continue
+            caminho = os.path.join(self.pasta, nome)
+            try:
+                arquivos.append((os.path.getmtime(caminho), caminho))
+            except OSError:
+                continue
+        excesso = len(arquivos) - self.capacidade_disco
+        if excesso <= 0:
+            return
+        for _, caminho in sorted(arquivos)[:excesso]:
+            try:
+                os.remove(caminho)
+            except OSError:
+                pass
+
+    def limpar(self) -> None:
+        with self._trava:
+            self._memoria.clear()
@@ -1,5 +1,6 @@
+import functools
 import random
-from core.peca import Peca
+from core.peca import Peca, PECAS
 from typing import Any, Dict, Optional, Sequence
 from core.jogador import Jogador
 
@@ -9,18 +10,50 @@ except ImportError:  # Segurança caso subclasses sejam movidas
     MCTSJogador = CLIJogador = GAJogador = None
 
 
-def _criar_jogador(nome: str, mao: Sequence[Peca], estrategia: Optional[Any]) -> Jogador:
-    """Instancia um ``Jogador`` ou subclasse de acordo com ``estrategia``."""
+def _classe_jogador(estrategia: Optional[Any]) -> Optional[type]:
+    """Subclasse de ``Jogador`` de ``estrategia`` (ou de um ``functools.partial`` dela)."""
+    if isinstance(estrategia, functools.partial):
+        estrategia = estrategia.func
     if isinstance(estrategia, type) and issubclass(estrategia, Jogador):
+        return estrategia
+    return None
+
+
+def _criar_jogador(nome: str, mao: Sequence[Peca], estrategia: Optional[Any]) -> Jogador:
+    """Instancia um ``Jogador`` ou subclasse de acordo com ``estrategia``.
+
+    ``functools.partial(Subclasse, **opcoes)`` cria a subclasse com essas
+    opções, o que permite configurar cada cadeira separadamente.
+    """
+    if _classe_jogador(estrategia) is not None:
         return estrategia(nome, mao)
     return Jogador(nome, mao, estrategia)
 
 
-def distribuir_jogadores(estrategias: Optional[Dict[str, Any]] = None) -> list[Jogador]:
-    """Distribui as peças e cria jogadores com as estratégias informadas."""
+def nome_estrategia(estrategia: Optional[Any]) -> str:
+    """Nome legível de ``estrategia`` para registro em histórico."""
+    if estrategia is None:
+        return Jogador.__name__
+    if isinstance(estrategia, functools.partial):
+        return nome_estrategia(estrategia.func)
+    if isinstance(estrategia, type) or hasattr(estrategia, "__qualname__"):
+        return estrategia.__qualname__
+    return type(estrategia).__name__
+
+
+def distribuir_jogadores(
+    estrategias: Optional[Dict[str, Any]] = None,
+    rng: Optional[random.Random] = None,
+) -> list[Jogador]:
+    """Distribui as peças e cria jogadores com as estratégias informadas.
+
+    Com ``rng`` o sorteio usa esse gerador, que também é atribuído a
+    ``jogador.rng`` para as estratégias aleatórias; sem ele usa o módulo
+    ``random``.
+    """
     estrategias = estrategias or {}
-    todas_pecas = [Peca(i, j) for i in range(7) for j in range(i, 7)]
-    random.shuffle(todas_pecas)
+    todas_pecas = list(PECAS)
+    (rng or random).shuffle(todas_pecas)
 
     faixas = {
         "J1": (0, 6),
@@ -31,7 +64,9 @@ def distribuir_jogadores(estrategias: Optional[Dict[str, Any]] = None) -> list[J
 
     jogadores = []
     for nome, (i, j) in faixas.items():
-        mao = sorted(todas_pecas[i:j], key=lambda p: (p.lado1, p.lado2))
-        jogadores.append(_criar_jogador(nome, mao, estrategias.get(nome)))
+        mao = sorted(todas_pecas[i:j], key=lambda p: p.indice)
+        jogador = _criar_jogador(nome, mao, estrategias.get(nome))
+        jogador.rng = rng
+        jogadores.append(jogador)
 
     return jogadores
@@ -0,0 +1,184 @@
+"""Gravação do histórico de partidas em CSV com buffer em memória."""
+
+import csv
+import glob
+import multiprocessing
+import os
+import threading
+from multiprocessing import util
+from typing import Dict, List, Optional
+
+CABECALHOS: Dict[str, List[str]] = {
+    "partidas": ["id_partida", "vencedor_partida", "pontuacao_J1", "pontuacao_J2", "pontuacao_J3", "pontuacao_J4"],
+    "rodadas": ["id_partida", "id_rodada", "inicio_rodada", "tipo_batida", "motivo_fim", "vencedor_rodada", "pontuacao_rodada", "pontuacao_J1", "pontuacao_J2", "pontuacao_J3", "pontuacao_J4"],
+    "jogadas": ["id_partida", "id_rodada", "ordem_jogada", "jogador", "tipo", "peca_x", "peca_y", "lado"],
+}
+
+PASTA_PADRAO = "historico_csv"
+LIMITE_PADRAO = 10_000
+
+
+class WriterBuffer:
+    """Objeto compatível com ``csv.writer`` que repassa as linhas a ``sink.escrever``.
+
+    Serve a qualquer destino com ``escrever(tabela, linha)``, como
+    :class:`HistoricoSink` e ``HistoricoSQLite``.
+    """
+
+    def __init__(self, sink, tabela: str):
+        self._sink = sink
+        self._tabela = tabela
+
+    def writerow(self, linha) -> None:
+        self._sink.escrever(self._tabela, linha)
+
+    def writerows(self, linhas) -> None:
+        for linha in linhas:
+            self._sink.escrever(self._tabela, linha)
+
+
+class HistoricoSink:
+    """Destino único para as linhas de ``partidas``/``rodadas``/``jogadas``.
+
+    As linhas ficam em memória e são gravadas em lote quando ``limite`` linhas
+    se acumulam ou em ``flush``/``fechar``. Cada gravação abre o arquivo uma
+    única vez em modo ``append`` e o cabeçalho só é escrito quando o arquivo
+    é criado. Com ``shard`` os arquivos recebem o sufixo ``.<shard>.csv``,
+    permitindo que cada processo escreva no seu próprio arquivo; depois basta
+    chamar :func:`mesclar_shards`. Com ``por_partida`` cada :meth:`registrar`
+    termina com um ``flush``, de modo que toda partida terminada já está em
+    disco. Para gravar no processo principal partidas jogadas em outro, o
+    processo filho usa um sink que nunca grava, entrega as linhas com
+    :meth:`retirar` e o principal as repassa a :meth:`anexar`.
+    """
+
+    def __init__(
+        self,
+        pasta: str = PASTA_PADRAO,
+        *,
+        shard: Optional[str] = None,
+        limite: int = LIMITE_PADRAO,
+        por_partida: bool = False,
+    ):
+        self.pasta = pasta
+        self.shard = shard
+        self.limite = limite
+        self.por_partida = por_partida
+        self._buffers: Dict[str, List[list]] = {t: [] for t in CABECALHOS}
+        self._pendentes = 0
+        self._trava = threading.RLock()
+        self.writer_partidas = WriterBuffer(self, "partidas")
+        self.writer_rodadas = WriterBuffer(self, "rodadas")
+        self.writer_jogadas = WriterBuffer(self, "jogadas")
+
+    def caminho(self, tabela: str) -> str:
+        sufixo = f".{self.shard}.csv" if self.shard else ".csv"
+        return os.path.join(self.pasta, tabela + sufixo)
+
+    def writers(self):
+        """Retorna os três writers na ordem esperada por ``salvar_resultado_em_csv``."""
+        return self.writer_partidas, self.writer_rodadas, self.writer_jogadas
+
+    def registrar(self, id_partida: str, resultado: dict) -> None:
+        """Acumula as linhas de um resultado de ``simular_partida``."""
+        from motor_de_jogo import salvar_resultado_em_csv
+
+        with self._trava:
+            salvar_resultado_em_csv(id_partida, resultado, *self.writers())
+            if self.por_partida:
+                self.flush()
+
+    def retirar(self) -> Dict[str, List[list]]:
+        """Devolve as linhas ainda em memória, por tabela, e esvazia o buffer sem gravar."""
+        with self._trava:
+            linhas = {tabela: buffer.copy() for tabela, buffer in self._buffers.items()}
+            for buffer in self._buffers.values():
+                buffer.clear()
+            self._pendentes = 0
+        return linhas
+
+    def anexar(self, linhas: Dict[str, List[list]]) -> None:
+        """Acumula linhas obtidas com :meth:`retirar` de outro sink."""
+        with self._trava:
+            for tabela, buffer in linhas.items():
+                for linha in buffer:
+                    self.escrever(tabela, linha)
+            if self.por_partida:
+                self.flush()
+
+    def escrever(self, tabela: str, linha) -> None:
+        with self._trava:
+            self._buffers[tabela].append(list(linha))
+            self._pendentes += 1
+            if self._pendentes >= self.limite:
+                self.flush()
+
+    def flush(self) -> None:
+        with self._trava:
+            if not self._pendentes:
+                return
+            os.makedirs(self.pasta, exist_ok=True)
+            for tabela, linhas in self._buffers.items():
+                if not linhas:
+                    continue
+                caminho = self.caminho(tabela)
+                novo = not os.path.exists(caminho) or os.path.getsize(caminho) == 0
+                with open(caminho, mode="a", newline="") as f:
+                    writer = csv.writer(f)
+                    if novo:
+                        writer.writerow(CABECALHOS[tabela])
+                    writer.writerows(linhas)
+                linhas.clear()
+            self._pendentes = 0
+
+    def fechar(self) -> None:
+        self.flush()
+
+    def __enter__(self) -> "HistoricoSink":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.fechar()
+
+
+def mesclar_shards(pasta: str = PASTA_PADRAO) -> None:
+    """Anexa os arquivos ``<tabela>.<shard>.csv`` ao arquivo principal e os remove."""
+    for tabela, cabecalho in CABECALHOS.items():
+        shards = sorted(glob.glob(os.path.join(pasta, f"{tabela}.*.csv")))
+        if not shards:
+            continue
+        destino = os.path.join(pasta, f"{tabela}.csv")
+        novo = not os.path.exists(destino) or os.path.getsize(destino) == 0
+        with open(destino, mode="a", newline="") as saida:
+            if novo:
+                csv.writer(saida).writerow(cabecalho)
+            for caminho in shards:
+                with open(caminho, newline="") as entrada:
+                    entrada.readline()  # cabeçalho do shard
+                    for bloco in iter(lambda: entrada.read(1 << 20), ""):
+                        saida.write(bloco)
+                os.remove(caminho)
+
+
+_sink_padrao: Optional[HistoricoSink] = None
+_pid_sink_padrao: Optional[int] = None
+
+
+def sink_padrao() -> HistoricoSink:
+    """Sink compartilhado pelo processo atual.
+
+    O processo principal grava nos arquivos principais ao fim de cada
+    partida, para que um servidor de longa duração não perca partidas já
+    jogadas se for interrompido. Processos filhos (p.ex. workers de
+    ``ProcessPoolExecutor``) recebem um sink próprio com ``shard`` derivado
+    do PID, a ser unido com :func:`mesclar_shards`, cujo buffer é
+    descarregado em lote e ao final do processo.
+    """
+    global _sink_padrao, _pid_sink_padrao
+    pid = os.getpid()
+    if _sink_padrao is None or _pid_sink_padrao != pid:
+        filho = multiprocessing.parent_process() is not None
+        _sink_padrao = HistoricoSink(shard=f"w{pid}" if filho else None, por_partida=not filho)
+        _pid_sink_padrao = pid
+        util.Finalize(_sink_padrao, _sink_padrao.fechar, exitpriority=10)
+    return _sink_padrao
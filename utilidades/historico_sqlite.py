@@ -0,0 +1,247 @@
+"""Armazenamento indexado do histórico de partidas em SQLite.
+
+Alternativa ao CSV de :mod:`utilidades.historico` para análises sobre muitas
+partidas. As tabelas ``partidas``/``rodadas``/``jogadas`` têm as mesmas
+colunas dos arquivos CSV; ``estrategias`` guarda a estratégia de cada assento
+de cada partida.
+"""
+
+import csv
+import os
+import sqlite3
+from typing import Dict, List, Optional
+
+from utilidades.historico import CABECALHOS, PASTA_PADRAO, LIMITE_PADRAO, WriterBuffer
+
+CAMINHO_PADRAO = "historico.sqlite3"
+
+DUPLAS = {"Dupla_1": ("J1", "J3"), "Dupla_2": ("J2", "J4")}
+
+_JOGADAS = """CREATE TABLE IF NOT EXISTS jogadas (
+    id_partida TEXT,
+    id_rodada INTEGER,
+    ordem_jogada INTEGER,
+    jogador TEXT,
+    tipo TEXT,
+    peca_x INTEGER,
+    peca_y INTEGER,
+    lado TEXT,
+    PRIMARY KEY (id_partida, id_rodada, ordem_jogada)
+)"""
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS partidas (
+    id_partida TEXT PRIMARY KEY,
+    vencedor_partida TEXT,
+    pontuacao_J1 INTEGER,
+    pontuacao_J2 INTEGER,
+    pontuacao_J3 INTEGER,
+    pontuacao_J4 INTEGER
+);
+CREATE TABLE IF NOT EXISTS rodadas (
+    id_partida TEXT,
+    id_rodada INTEGER,
+    inicio_rodada TEXT,
+    tipo_batida TEXT,
+    motivo_fim TEXT,
+    vencedor_rodada TEXT,
+    pontuacao_rodada INTEGER,
+    pontuacao_J1 INTEGER,
+    pontuacao_J2 INTEGER,
+    pontuacao_J3 INTEGER,
+    pontuacao_J4 INTEGER,
+    PRIMARY KEY (id_partida, id_rodada)
+);
+{jogadas};
+CREATE TABLE IF NOT EXISTS estrategias (
+    id_partida TEXT,
+    jogador TEXT,
+    estrategia TEXT,
+    PRIMARY KEY (id_partida, jogador)
+);
+CREATE INDEX IF NOT EXISTS idx_partidas_vencedor ON partidas (vencedor_partida);
+CREATE INDEX IF NOT EXISTS idx_rodadas_tipo ON rodadas (tipo_batida);
+CREATE INDEX IF NOT EXISTS idx_rodadas_vencedor ON rodadas (vencedor_rodada);
+CREATE INDEX IF NOT EXISTS idx_estrategias ON estrategias (jogador, estrategia);
+""".format(jogadas=_JOGADAS)
+
+_TABELAS = dict(CABECALHOS, estrategias=["id_partida", "jogador", "estrategia"])
+
+
+def _migrar_jogadas(con: sqlite3.Connection) -> None:
+    """Recria ``jogadas`` com chave primária em bancos de versões anteriores.
+
+    Linhas duplicadas por importações repetidas são descartadas.
+    """
+    if any(coluna[5] for coluna in con.execute("PRAGMA table_info(jogadas)")):
+        return
+    colunas = ", ".join(CABECALHOS["jogadas"])
+    with con:
+        con.execute("ALTER TABLE jogadas RENAME TO jogadas_antigas")
+        con.execute(_JOGADAS)
+        con.execute(
+            f"INSERT OR REPLACE INTO jogadas ({colunas}) SELECT {colunas} FROM jogadas_antigas"
+        )
+        con.execute("DROP TABLE jogadas_antigas")
+
+
+def _vazio_para_none(linha) -> list:
+    return [None if v == "" else v for v in linha]
+
+
+class HistoricoSQLite:
+    """Grava resultados de ``simular_partida`` em um banco SQLite.
+
+    Pode ser passado como ``sink`` para ``simular_partida``. As linhas são
+    acumuladas em memória e inseridas com ``executemany`` em uma única
+    transação a cada ``limite`` linhas ou em ``flush``/``fechar``. O banco
+    opera em modo WAL, permitindo leituras durante a gravação.
+    """
+
+    def __init__(self, caminho: str = CAMINHO_PADRAO, *, limite: int = LIMITE_PADRAO):
+        self.caminho = caminho
+        self.limite = limite
+        self._con = sqlite3.connect(caminho, timeout=30)
+        self._con.execute("PRAGMA journal_mode=WAL")
+        self._con.execute("PRAGMA synchronous=NORMAL")
+        self._con.executescript(_ESQUEMA)
+        _migrar_jogadas(self._con)
+        self._buffers: Dict[str, List[list]] = {t: [] for t in _TABELAS}
+        self._pendentes = 0
+        self.writer_partidas = WriterBuffer(self, "partidas")
+        self.writer_rodadas = WriterBuffer(self, "rodadas")
+        self.writer_jogadas = WriterBuffer(self, "jogadas")
+
+    # ------------------------------------------------------------------
+    # Gravação
+    # ------------------------------------------------------------------
+    def writers(self):
+        """Retorna os três writers na ordem esperada por ``salvar_resultado_em_csv``."""
+        return self.writer_partidas, self.writer_rodadas, self.writer_jogadas
+
+    def registrar(self, id_partida: str, resultado: dict) -> None:
+        """Acumula as linhas de um resultado de ``simular_partida``."""
+        from motor_de_jogo import salvar_resultado_em_csv
+
+        salvar_resultado_em_csv(id_partida, resultado, *self.writers())
+        for jogador, estrategia in resultado.get("estrategias", {}).items():
+            self.escrever("estrategias", [id_partida, jogador, estrategia])
+
+    def escrever(self, tabela: str, linha) -> None:
+        self._buffers[tabela].append(_vazio_para_none(linha))
+        self._pendentes += 1
+        if self._pendentes >= self.limite:
+            self.flush()
+
+    def flush(self) -> None:
+        if not self._pendentes:
+            return
+        with self._con:
+            for tabela, linhas in self._buffers.items():
+                if not linhas:
+                    continue
+                colunas = _TABELAS[tabela]
+                sql = "INSERT OR REPLACE INTO {} ({}) VALUES ({})".format(
+                    tabela, ", ".join(colunas), ", ".join("?" * len(colunas))
+                )
+                self._con.executemany(sql, linhas)
+                linhas.clear()
+        self._pendentes = 0
+
+    def fechar(self) -> None:
+        self.flush()
+        self._con.close()
+
+    def __enter__(self) -> "HistoricoSQLite":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.fechar()
+
+    # ------------------------------------------------------------------
+    # Consultas
+    # ------------------------------------------------------------------
+    def consultar(self, sql: str, parametros=()) -> list:
+        self.flush()
+        return self._con.execute(sql, parametros).fetchall()
+
+    @staticmethod
+    def _filtro_estrategias(estrategias: Optional[Dict[str, str]]) -> tuple[str, list]:
+        """Cláusula ``WHERE`` sobre ``p.id_partida`` para ``{jogador: estrategia}``."""
+        if not estrategias:
+            return "1", []
+        partes = []
+        parametros: list = []
+        for jogador, estrategia in estrategias.items():
+            partes.append(
+                "p.id_partida IN (SELECT id_partida FROM estrategias"
+                " WHERE jogador = ? AND estrategia = ?)"
+            )
+            parametros += [jogador, estrategia]
+        return " AND ".join(partes), parametros
+
+    def taxa_vitoria(
+        self, dupla: str = "Dupla_1", estrategias: Optional[Dict[str, str]] = None
+    ) -> tuple[int, int]:
+        """``(vitórias, partidas)`` de ``dupla`` nas partidas que casam com ``estrategias``."""
+        where, parametros = self._filtro_estrategias(estrategias)
+        vitorias, total = self.consultar(
+            f"SELECT COALESCE(SUM(p.vencedor_partida = ?), 0), COUNT(*)"
+            f" FROM partidas p WHERE {where}",
+            [dupla, *parametros],
+        )[0]
+        return vitorias, total
+
+    def vitorias_por_tipo_batida(
+        self, dupla: str = "Dupla_1", estrategias: Optional[Dict[str, str]] = None
+    ) -> Dict[str, tuple[int, int]]:
+        """``{tipo_batida: (rodadas vencidas por dupla, rodadas)}``."""
+        where, parametros = self._filtro_estrategias(estrategias)
+        jogadores = DUPLAS[dupla]
+        linhas = self.consultar(
+            "SELECT r.tipo_batida, SUM(r.vencedor_rodada IN (?, ?)), COUNT(*)"
+            " FROM rodadas r JOIN partidas p ON p.id_partida = r.id_partida"
+            f" WHERE {where} GROUP BY r.tipo_batida",
+            [*jogadores, *parametros],
+        )
+        return {tipo: (vitorias, total) for tipo, vitorias, total in linhas}
+
+    def desempenho_por_estrategia(self, jogador: str = "J1") -> Dict[str, tuple[int, int]]:
+        """``{estrategia: (vitórias da dupla de jogador, partidas)}``."""
+        dupla = next(nome for nome, js in DUPLAS.items() if jogador in js)
+        linhas = self.consultar(
+            "SELECT e.estrategia, SUM(p.vencedor_partida = ?), COUNT(*)"
+            " FROM estrategias e JOIN partidas p ON p.id_partida = e.id_partida"
+            " WHERE e.jogador = ? GROUP BY e.estrategia",
+            [dupla, jogador],
+        )
+        return {estrategia: (vitorias, total) for estrategia, vitorias, total in linhas}
+
+
+def importar_csv(
+    pasta: str = PASTA_PADRAO,
+    caminho: str = CAMINHO_PADRAO,
+    *,
+    limite: int = LIMITE_PADRAO,
+) -> int:
+    """Importa o histórico CSV de ``pasta`` para o banco em ``caminho``.
+
+    Linhas de cabeçalho repetidas (gravadas a cada partida por versões
+    antigas do simulador) são ignoradas. Todas as tabelas têm chave
+    primária, então importar de novo a mesma pasta (ou um histórico que se
+    sobrepõe) substitui as linhas em vez de duplicá-las. Retorna o número
+    de linhas lidas.
+    """
+    total = 0
+    with HistoricoSQLite(caminho, limite=limite) as banco:
+        for tabela, cabecalho in CABECALHOS.items():
+            arquivo = os.path.join(pasta, f"{tabela}.csv")
+            if not os.path.exists(arquivo):
+                continue
+            with open(arquivo, newline="") as f:
+                for linha in csv.reader(f):
+                    if not linha or linha == cabecalho:
+                        continue
+                    banco.escrever(tabela, linha)
+                    total += 1
+    return total
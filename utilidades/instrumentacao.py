@@ -0,0 +1,216 @@
+"""Medição opcional da latência de cada decisão dos jogadores.
+
+Desligada por padrão: o decorador :func:`instrumentar` apenas repassa a
+chamada. Com ``ativar()`` (ou a variável de ambiente
+``DOMINO_INSTRUMENTAR=1``) cada decisão é registrada em um histograma
+logarítmico agrupado por estratégia, tamanho da mão e número de jogadas
+válidas.
+
+Processos filhos gravam suas medições em ``<pasta>/w<pid>.json`` ao terminar;
+:func:`coletar` junta essas medições às do processo atual.
+"""
+
+import functools
+import glob
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing import util
+from typing import Dict, Optional, Tuple
+
+VARIAVEL_ATIVO = "DOMINO_INSTRUMENTAR"
+VARIAVEL_PASTA = "DOMINO_INSTRUMENTACAO_PASTA"
+PASTA_PADRAO = "instrumentacao"
+
+_ativo = os.environ.get(VARIAVEL_ATIVO) == "1"
+
+# (estrategia, tam_mao, n_jogadas) -> [n, total_ns, max_ns, {faixa: n}]
+_dados: Dict[Tuple[str, int, int], list] = {}
+_pid_dados: Optional[int] = None
+
+
+def ativar(pasta: str = PASTA_PADRAO) -> None:
+    """Liga a medição neste processo e nos processos filhos criados depois."""
+    global _ativo
+    _ativo = True
+    os.environ[VARIAVEL_ATIVO] = "1"
+    os.environ[VARIAVEL_PASTA] = pasta
+
+
+def desativar() -> None:
+    global _ativo
+    _ativo = False
+    os.environ.pop(VARIAVEL_ATIVO, None)
+
+
+def ativo() -> bool:
+    return _ativo
+
+
+def limpar() -> None:
+    _dados.clear()
+
+
+def faixa(ns: int) -> int:
+    """Faixa do histograma: ``0`` até ~1 µs, depois dobra a cada faixa."""
+    return (ns >> 10).bit_length()
+
+
+def limite_faixa(indice: int) -> int:
+    """Maior latência (ns) contida na faixa ``indice``."""
+    return (1 << (indice + 10)) - 1
+
+
+def registrar(estrategia: str, tam_mao: int, n_jogadas: int, ns: int) -> None:
+    if _pid_dados != os.getpid():
+        _novo_processo()
+    chave = (estrategia, tam_mao, n_jogadas)
+    entrada = _dados.get(chave)
+    if entrada is None:
+        entrada = _dados[chave] = [0, 0, 0, {}]
+    entrada[0] += 1
+    entrada[1] += ns
+    if ns > entrada[2]:
+        entrada[2] = ns
+    hist = entrada[3]
+    f = faixa(ns)
+    hist[f] = hist.get(f, 0) + 1
+
+
+def _rotulo(jogador) -> str:
+    estrategia = getattr(jogador, "estrategia", None)
+    if estrategia is None:
+        return type(jogador).__name__
+    return getattr(estrategia, "__qualname__", type(estrategia).__name__)
+
+
+def instrumentar(metodo):
+    """Decora ``escolher_peca(self, tabuleiro, jogadores, ...)`` com medição."""
+
+    @functools.wraps(metodo)
+    def _escolher_peca(jogador, tabuleiro, *args, **kwargs):
+        if not _ativo:
+            return metodo(jogador, tabuleiro, *args, **kwargs)
+        n_jogadas = len(jogador.jogadas_validas(tabuleiro.obter_pontas()))
+        tam_mao = len(jogador.mao)
+        inicio = time.perf_counter_ns()
+        try:
+            return metodo(jogador, tabuleiro, *args, **kwargs)
+        finally:
+            registrar(_rotulo(jogador), tam_mao, n_jogadas, time.perf_counter_ns() - inicio)
+
+    return _escolher_peca
+
+
+# ---------------------------------------------------------------------------
+# Agregação entre processos
+# ---------------------------------------------------------------------------
+def exportar() -> list:
+    """Medições do processo em formato serializável (JSON)."""
+    return [
+        [est, mao, jog, n, total, maximo, {str(k): v for k, v in hist.items()}]
+        for (est, mao, jog), (n, total, maximo, hist) in _dados.items()
+    ]
+
+
+def mesclar(medicoes: list, destino: Optional[dict] = None) -> dict:
+    destino = {} if destino is None else destino
+    for est, mao, jog, n, total, maximo, hist in medicoes:
+        entrada = destino.setdefault((est, mao, jog), [0, 0, 0, {}])
+        entrada[0] += n
+        entrada[1] += total
+        entrada[2] = max(entrada[2], maximo)
+        for k, v in hist.items():
+            entrada[3][int(k)] = entrada[3].get(int(k), 0) + v
+    return destino
+
+
+def _gravar_worker(pasta: str) -> None:
+    if not _dados:
+        return
+    os.makedirs(pasta, exist_ok=True)
+    with open(os.path.join(pasta, f"w{os.getpid()}.json"), "w") as f:
+        json.dump(exportar(), f)
+
+
+def _novo_processo() -> None:
+    """Descarta medições herdadas via ``fork`` e, em processos filhos, agenda
+    a gravação das medições ao final do processo."""
+    global _pid_dados
+    if _pid_dados is not None:
+        _dados.clear()
+    _pid_dados = os.getpid()
+    if multiprocessing.parent_process() is None:
+        return
+    pasta = os.environ.get(VARIAVEL_PASTA, PASTA_PADRAO)
+    util.Finalize(None, _gravar_worker, args=(pasta,), exitpriority=10)
+
+
+def coletar(pasta: Optional[str] = None) -> dict:
+    """Junta as medições deste processo às gravadas pelos filhos em ``pasta``.
+
+    Os arquivos dos filhos são removidos após a leitura.
+    """
+    pasta = pasta or os.environ.get(VARIAVEL_PASTA, PASTA_PADRAO)
+    total = mesclar(exportar())
+    for caminho in glob.glob(os.path.join(pasta, "w*.json")):
+        with open(caminho) as f:
+            mesclar(json.load(f), total)
+        os.remove(caminho)
+    return total
+
+
+# ---------------------------------------------------------------------------
+# Relatório
+# ---------------------------------------------------------------------------
+def _percentil(hist: Dict[int, int], n: int, p: float) -> int:
+    alvo = p * n
+    acumulado = 0
+    for indice in sorted(hist):
+        acumulado += hist[indice]
+        if acumulado >= alvo:
+            return limite_faixa(indice)
+    return 0
+
+
+def _agrupar(dados: dict, chave) -> dict:
+    grupos: dict = {}
+    for k, (n, total, maximo, hist) in dados.items():
+        g = grupos.setdefault(chave(k), [0, 0, 0, {}])
+        g[0] += n
+        g[1] += total
+        g[2] = max(g[2], maximo)
+        for f, c in hist.items():
+            g[3][f] = g[3].get(f, 0) + c
+    return grupos
+
+
+def resumo(dados: Optional[dict] = None) -> str:
+    """Tabela de latência por estratégia e por número de jogadas válidas.
+
+    Percentis são aproximados pelo limite superior da faixa do histograma
+    (limitado ao máximo observado).
+    """
+    dados = mesclar(exportar()) if dados is None else dados
+    if not dados:
+        return "Nenhuma decisão registrada."
+
+    def _linha(rotulo, n, total, maximo, hist):
+        return (
+            f"{rotulo:<34} {n:>9} {total / n / 1e6:>10.3f}"
+            f" {min(_percentil(hist, n, 0.5), maximo) / 1e6:>10.3f}"
+            f" {min(_percentil(hist, n, 0.95), maximo) / 1e6:>10.3f} {maximo / 1e6:>10.3f}"
+        )
+
+    cabecalho = f"{'':<34} {'decisões':>9} {'média ms':>10} {'p50 ms':>10} {'p95 ms':>10} {'máx ms':>10}"
+    linhas = ["Latência por estratégia", cabecalho]
+    for est, g in sorted(_agrupar(dados, lambda k: k[0]).items()):
+        linhas.append(_linha(est, *g))
+    linhas += ["", "Por estratégia e nº de jogadas válidas", cabecalho]
+    for (est, jog), g in sorted(_agrupar(dados, lambda k: (k[0], k[2])).items()):
+        linhas.append(_linha(f"{est} [{jog} jogadas]", *g))
+    linhas += ["", "Por estratégia e tamanho da mão", cabecalho]
+    for (est, mao), g in sorted(_agrupar(dados, lambda k: (k[0], k[1])).items()):
+        linhas.append(_linha(f"{est} [mão {mao}]", *g))
+    return "\n".join(linhas)
@@ -0,0 +1,186 @@
+"""Fila de tarefas em segundo plano sobre um ``ProcessPoolExecutor``.
+
+Usada pelo visualizador para que cada simulação não prenda uma thread do
+Flask: ``submeter`` devolve um id imediatamente e o resultado é consultado
+depois com ``estado``/``resultado``.
+"""
+
+import os
+import threading
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+PROCESSOS_PADRAO = int(os.environ.get("DOMINO_TAREFAS_PROCESSOS", "2"))
+LIMITE_PENDENTES_PADRAO = int(os.environ.get("DOMINO_TAREFAS_LIMITE", "16"))
+LIMITE_CONCLUIDAS_PADRAO = 256
+
+NA_FILA = "na_fila"
+EXECUTANDO = "executando"
+CONCLUIDA = "concluida"
+CANCELADA = "cancelada"
+ERRO = "erro"
+
+
+class FilaCheia(RuntimeError):
+    """Há ``limite_pendentes`` tarefas ainda não concluídas."""
+
+
+class _Encadeada(Future):
+    """Tarefa cujo resultado é ``ao_concluir(origem.result())``.
+
+    ``ao_concluir`` roda no processo que submeteu a tarefa, na thread que
+    conclui ``origem``. Cancelar e ``running`` consultam ``origem``.
+    """
+
+    def __init__(self, origem: Future, ao_concluir: Callable[[Any], Any]):
+        super().__init__()
+        self._origem = origem
+        self._ao_concluir = ao_concluir
+        origem.add_done_callback(self._origem_terminou)
+
+    def _origem_terminou(self, origem: Future) -> None:
+        if origem.cancelled():
+            Future.cancel(self)
+            return
+        erro = origem.exception()
+        if erro is not None:
+            self.set_exception(erro)
+            return
+        try:
+            self.set_result(self._ao_concluir(origem.result()))
+        except Exception as erro:
+            self.set_exception(erro)
+
+    def cancel(self) -> bool:
+        return self._origem.cancel()
+
+    def running(self) -> bool:
+        return not self.done() and (self._origem.running() or self._origem.done())
+
+
+class GerenciadorTarefas:
+    """Executa funções em um pool de processos limitado.
+
+    ``processos`` controla a concorrência e ``limite_pendentes`` o número de
+    tarefas aceitas e ainda não terminadas (na fila ou executando); acima
+    dele ``submeter`` levanta :class:`FilaCheia`. Das tarefas terminadas
+    são mantidas apenas as ``limite_concluidas`` mais recentes.
+    """
+
+    def __init__(
+        self,
+        processos: int = PROCESSOS_PADRAO,
+        limite_pendentes: int = LIMITE_PENDENTES_PADRAO,
+        limite_concluidas: int = LIMITE_CONCLUIDAS_PADRAO,
+    ):
+        if processos < 1 or limite_pendentes < 1:
+            raise ValueError("processos e limite_pendentes devem ser positivos")
+        self.processos = processos
+        self.limite_pendentes = limite_pendentes
+        self.limite_concluidas = limite_concluidas
+        self._pool: Optional[ProcessPoolExecutor] = None
+        self._tarefas: "OrderedDict[str, Future]" = OrderedDict()
+        self._concluidas: "OrderedDict[str, None]" = OrderedDict()
+        self._trava = threading.Lock()
+
+    def _executor(self) -> ProcessPoolExecutor:
+        if self._pool is None:
+            self._pool = ProcessPoolExecutor(max_workers=self.processos)
+        return self._pool
+
+    def pendentes(self) -> int:
+        with self._trava:
+            return sum(1 for f in self._tarefas.values() if not f.done())
+
+    def submeter(
+        self,
+        funcao: Callable,
+        *args,
+        ao_concluir: Optional[Callable[[Any], Any]] = None,
+        **kwargs,
+    ) -> str:
+        """Agenda ``funcao(*args, **kwargs)`` e retorna o id da tarefa.
+
+        ``ao_concluir`` recebe, neste processo, o valor devolvido por
+        ``funcao``; o que ele retornar passa a ser o resultado da tarefa.
+        Serve para efeitos que precisam acontecer no processo principal
+        (gravar histórico, preencher caches).
+        """
+        with self._trava:
+            if sum(1 for f in self._tarefas.values() if not f.done()) >= self.limite_pendentes:
+                raise FilaCheia("Fila de tarefas cheia")
+            id_tarefa = uuid.uuid4().hex
+            futuro = self._executor().submit(funcao, *args, **kwargs)
+            if ao_concluir is not None:
+                futuro = _Encadeada(futuro, ao_concluir)
+            self._tarefas[id_tarefa] = futuro
+        futuro.add_done_callback(lambda _f, id_tarefa=id_tarefa: self._terminou(id_tarefa))
+        return id_tarefa
+
+    def concluida(self, resultado: Any) -> str:
+        """Registra uma tarefa já concluída com ``resultado`` (p.ex. vinda de um cache)."""
+        futuro: Future = Future()
+        futuro.set_result(resultado)
+        id_tarefa = uuid.uuid4().hex
+        with self._trava:
+            self._tarefas[id_tarefa] = futuro
+        self._terminou(id_tarefa)
+        return id_tarefa
+
+    def _terminou(self, id_tarefa: str) -> None:
+        with self._trava:
+            self._concluidas[id_tarefa] = None
+            while len(self._concluidas) > self.limite_concluidas:
+                antiga, _ = self._concluidas.popitem(last=False)
+                self._tarefas.pop(antiga, None)
+
+    def _futuro(self, id_tarefa: str) -> Future:
+        with self._trava:
+            futuro = self._tarefas.get(id_tarefa)
+        if futuro is None:
+            raise KeyError(id_tarefa)
+        return futuro
+
+    def estado(self, id_tarefa: str) -> Dict[str, Any]:
+        """``{"id", "status"}`` e, em caso de falha, ``"erro"``.
+
+        Levanta ``KeyError`` para ids desconhecidos ou já descartados.
+        """
+        futuro = self._futuro(id_tarefa)
+        if futuro.cancelled():
+            status = CANCELADA
+        elif futuro.done():
+            status = ERRO if futuro.exception() is not None else CONCLUIDA
+        elif futuro.running():
+            status = EXECUTANDO
+        else:
+            status = NA_FILA
+        estado = {"id": id_tarefa, "status": status}
+        if status == ERRO:
+            estado["erro"] = repr(futuro.exception())
+        return estado
+
+    def resultado(self, id_tarefa: str, timeout: Optional[float] = None) -> Any:
+        """Resultado da tarefa; espera até ``timeout`` segundos (``None`` = sem limite).
+
+        Repassa a exceção da tarefa, ``CancelledError`` ou ``TimeoutError``.
+        """
+        return self._futuro(id_tarefa).result(timeout)
+
+    def cancelar(self, id_tarefa: str) -> bool:
+        """Cancela uma tarefa que ainda não começou. Retorna se conseguiu."""
+        return self._futuro(id_tarefa).cancel()
+
+    def encerrar(self, esperar: bool = True) -> None:
+        with self._trava:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=esperar, cancel_futures=True)
+
+    def __enter__(self) -> "GerenciadorTarefas":
+        return self
+
+    def __exit__(self, *_exc) -> None:
+        self.encerrar()